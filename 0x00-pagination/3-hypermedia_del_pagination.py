@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 """Simple pagination sample.
 """
-import csv
-from typing import List, Tuple, Dict, Any
+from typing import Any, Dict, List, Optional, Tuple
+
+pagination_server = __import__('pagination_server')
+HypermediaServer = pagination_server.HypermediaServer
+Snapshot = pagination_server.Snapshot
+IndexedDataset = __import__('keyset_index').IndexedDataset
 
 
 def index_range(page: int, page_size: int) -> Tuple[int, int]:
@@ -20,78 +24,61 @@ def index_range(page: int, page_size: int) -> Tuple[int, int]:
     return start, end
 
 
-class Server:
+class Server(HypermediaServer):
     """Server class to paginate a database of popular baby names.
+
+    Rows can be deleted and inserted without moving the indexes of the
+    others, under the server lock, and every page, iterator and export
+    follows these changes until the next reload. The rest is shared with
+    the other samples through HypermediaServer.
     """
-    DATA_FILE = "Popular_Baby_Names.csv"
 
-    def __init__(self):
-        """Initializes a new Server instance.
-        """
-        self.__dataset = None
+    def indexed_dataset(self) -> IndexedDataset:
+        """Dataset of the current snapshot addressed by stable ids
 
-    def dataset(self) -> List[List]:
-        """Cached dataset
-        
         Returns:
-            List[List]: The dataset loaded from the CSV file.
+            IndexedDataset: The rows of dataset, whose ids are their indexes
+            when loaded, that survive deletions and insertions until the
+            next reload.
         """
-        if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]  # Skip the header row
+        return self.snapshot().indexed_dataset
 
-        return self.__dataset
+    def delete(self, index: int) -> bool:
+        """Deletes the row of an index in O(log n), without moving the
+        indexes of the other rows.
 
-    def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
-        """Retrieves a page of the dataset.
-        
         Args:
-            page (int, optional): The page number. Defaults to 1.
-            page_size (int, optional): The number of items per page. Defaults to 10.
-        
+            index (int): The index of the row.
+
         Returns:
-            List[List]: The page of the dataset.
+            bool: False if there was no row at that index.
         """
-        assert isinstance(page, int) and page > 0, "page must be an integer greater than 0"
-        assert isinstance(page_size, int) and page_size > 0, "page_size must be an integer greater than 0"
-        
-        start, end = index_range(page, page_size)
-        dataset = self.dataset()
-        
-        if start >= len(dataset):
-            return []
+        with self._lock:
+            return self.indexed_dataset().delete(index)
 
-        return dataset[start:end]
+    def insert(self, row: List[str]) -> int:
+        """Adds a row after all the others in amortized O(log n).
 
-    def get_hyper(self, page: int = 1, page_size: int = 10) -> Dict[str, Any]:
-        """Retrieves a hypermedia page of the dataset.
-        
         Args:
-            page (int, optional): The page number. Defaults to 1.
-            page_size (int, optional): The number of items per page. Defaults to 10.
-        
+            row (List[str]): The values of the row.
+
         Returns:
-            Dict[str, Any]: A dictionary containing the pagination data.
+            int: The index of the new row.
         """
-        data = self.get_page(page, page_size)
-        total_items = len(self.dataset())
-        total_pages = math.ceil(total_items / page_size)
-        
-        hypermedia_data = {
-            "page_size": len(data),
-            "page": page,
-            "data": data,
-            "next_page": page + 1 if page < total_pages else None,
-            "prev_page": page - 1 if page > 1 else None,
-            "total_pages": total_pages
-        }
-        
-        return hypermedia_data
+        with self._lock:
+            return self.indexed_dataset().insert(row)
+
+    def _indexed(self, snapshot: Snapshot) -> Optional[IndexedDataset]:
+        """Returns the deletions and insertions of a snapshot.
+        """
+        return snapshot.indexed_dataset
 
     def get_hyper_index(self, index: int = None, page_size: int = 10) -> Dict[str, Any]:
         """Retrieves a hypermedia page of the dataset based on a start index.
+
+        Indexes are stable ids: deleted rows are skipped, so the page holds
+        page_size live rows while there are enough, and following
+        next_index never skips or repeats a row.
         
         Args:
             index (int, optional): The start index. Defaults to None.
@@ -100,20 +87,17 @@ class Server:
         Returns:
             Dict[str, Any]: A dictionary containing the pagination data.
         """
-        dataset = self.dataset()
-        total_items = len(dataset)
+        indexed = self.indexed_dataset()
 
         if index is None:
             index = 0
 
-        assert isinstance(index, int) and 0 <= index < total_items, "index must be a valid range"
+        assert isinstance(index, int) and 0 <= index < indexed.end, \
+            "index must be a valid range"
         assert isinstance(page_size, int) and page_size > 0, "page_size must be an integer greater than 0"
 
-        next_index = index + page_size
-        if next_index >= total_items:
-            next_index = None
-
-        data = dataset[index:index + page_size]
+        with self._lock:
+            data, next_index = indexed.page(index, page_size)
 
         hyper_index_data = {
             "index": index,
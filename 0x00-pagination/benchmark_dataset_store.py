@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Dataset store memory benchmark.
+
+Loads a CSV file as the list of rows csv.reader returns, as a
+ColumnarStore and as an MmapCsv, first building its row index then
+reusing the saved one. Reports the memory each one allocates according
+to tracemalloc, which does not count the pages of the map, and the time
+it takes before the first page can be served.
+
+Usage: ./benchmark_dataset_store.py [path]
+"""
+import csv
+import os
+import sys
+import time
+import tracemalloc
+
+ColumnarStore = __import__('columnar_store').ColumnarStore
+MmapCsv = __import__('mmap_csv').MmapCsv
+
+
+def load_rows(path):
+    """Loads the rows of a CSV file without its header.
+    """
+    with open(path, newline="") as f:
+        return [row for row in csv.reader(f)][1:]
+
+
+def measure(load, path):
+    """Returns the bytes allocated by a loader and its duration.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    dataset = load(path)
+    dataset[:10]
+    elapsed = time.perf_counter() - start
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return len(dataset), allocated, elapsed
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "Popular_Baby_Names.csv"
+    print("{:>14} {:>10} {:>12} {:>10} {:>8}".format(
+        "store", "rows", "bytes", "bytes/row", "load s"))
+    index = path + ".idx"
+    if os.path.exists(index):
+        os.remove(index)
+    for name, load in (("list of rows", load_rows),
+                       ("columnar", ColumnarStore.from_csv),
+                       ("mmap, build", MmapCsv.from_csv),
+                       ("mmap, reuse", MmapCsv.from_csv)):
+        rows, allocated, elapsed = measure(load, path)
+        print("{:>14} {:>10} {:>12} {:>10.1f} {:>8.3f}".format(
+            name, rows, allocated, allocated / rows, elapsed))
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Parallel CSV loading benchmark.
+
+Loads a CSV file into a ColumnarStore with ColumnarStore.from_csv, then
+with read_csv in 1, 2, 4 and 8 processes, checks that every load holds
+the same rows and reports the time each one takes and its speedup over
+from_csv. The speedup is bounded by the number of CPUs of the machine.
+
+Usage: ./benchmark_parallel_csv.py [path]
+"""
+import os
+import sys
+import time
+
+ColumnarStore = __import__('columnar_store').ColumnarStore
+read_csv = __import__('parallel_csv').read_csv
+
+WORKERS = (1, 2, 4, 8)
+
+
+def measure(load):
+    """Returns the store a loader builds and its duration.
+    """
+    start = time.perf_counter()
+    store = load()
+    return store, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "Popular_Baby_Names.csv"
+    print("{} MB, {} CPUs".format(os.path.getsize(path) >> 20,
+                                  os.cpu_count()))
+    print("{:>12} {:>10} {:>8} {:>8}".format(
+        "loader", "rows", "load s", "speedup"))
+    reference, baseline = measure(lambda: ColumnarStore.from_csv(path))
+    print("{:>12} {:>10} {:>8.3f} {:>8.2f}".format(
+        "from_csv", len(reference), baseline, 1))
+    for workers in WORKERS:
+        store, elapsed = measure(lambda: read_csv(path, workers))
+        assert store.header == reference.header and \
+            len(store) == len(reference) and \
+            store[::997] == reference[::997], "rows differ"
+        print("{:>12} {:>10} {:>8.3f} {:>8.2f}".format(
+            "{} workers".format(workers), len(store), elapsed,
+            baseline / elapsed))
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Columnar dataset store.
+
+ColumnarStore holds a CSV dataset column by column instead of as a list
+of rows of strings. Columns whose values are all plain integers, such as
+Year of Birth, Count and Rank, are kept in an array('i'). Other columns,
+such as Gender, Ethnicity and Child's First Name, are dictionary encoded:
+an array of codes indexing the list of their distinct values. Rows are
+only built for the indexes that are read, as the same lists of strings
+csv.reader returns, so a store can replace the list of rows.
+"""
+import csv
+from array import array
+from collections.abc import Sequence
+from typing import Iterable, List, Union
+
+
+class IntColumn:
+    """Column of integers stored in an array('i').
+    """
+    def __init__(self) -> None:
+        """Creates an empty column.
+        """
+        self.data = array('i')
+
+    def append(self, value: str) -> bool:
+        """Appends a value if it is an integer written in canonical form.
+
+        Args:
+            value (str): The value read from the CSV file.
+
+        Returns:
+            bool: False if the value cannot be stored in this column.
+        """
+        try:
+            number = int(value)
+            if str(number) != value:
+                return False
+            self.data.append(number)
+        except (ValueError, OverflowError):
+            return False
+        return True
+
+    def __getitem__(self, index: int) -> str:
+        """Returns a value as it was read.
+        """
+        return str(self.data[index])
+
+    def __len__(self) -> int:
+        """Returns the number of values.
+        """
+        return len(self.data)
+
+
+class DictColumn:
+    """Dictionary encoded column of strings.
+    """
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        """Creates a column holding the given values.
+        """
+        self.values: List[str] = []
+        self.codes_of = {}
+        self.codes = array('i')
+        for value in values:
+            self.append(value)
+
+    def append(self, value: str) -> bool:
+        """Appends a value, adding it to the dictionary if it is new.
+
+        Args:
+            value (str): The value read from the CSV file.
+
+        Returns:
+            bool: Always True.
+        """
+        code = self.codes_of.get(value)
+        if code is None:
+            code = self.codes_of[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+        return True
+
+    def extend(self, column: Union["IntColumn", "DictColumn"]) -> None:
+        """Appends the values of another column, translating the codes of
+        a dictionary encoded one to the codes of this column.
+
+        Args:
+            column (Union[IntColumn, DictColumn]): The column to append.
+        """
+        if not isinstance(column, DictColumn):
+            for value in column.data:
+                self.append(str(value))
+            return
+        codes_of = self.codes_of
+        translation = []
+        for value in column.values:
+            code = codes_of.get(value)
+            if code is None:
+                code = codes_of[value] = len(self.values)
+                self.values.append(value)
+            translation.append(code)
+        if translation == list(range(len(translation))):
+            self.codes.extend(column.codes)
+        else:
+            self.codes.extend(array('i', map(translation.__getitem__,
+                                             column.codes)))
+
+    def __getitem__(self, index: int) -> str:
+        """Returns a value.
+        """
+        return self.values[self.codes[index]]
+
+    def __len__(self) -> int:
+        """Returns the number of values.
+        """
+        return len(self.codes)
+
+
+class ColumnarStore(Sequence):
+    """Read-only sequence of CSV rows stored by column.
+    """
+
+    def __init__(self, header: List[str]) -> None:
+        """Creates an empty store.
+
+        Args:
+            header (List[str]): The names of the columns.
+        """
+        self.header = header
+        self.columns: List[Union[IntColumn, DictColumn]] = [
+            IntColumn() for _ in header]
+        self.size = 0
+
+    @classmethod
+    def from_rows(cls, header: List[str],
+                  rows: Iterable[List[str]]) -> "ColumnarStore":
+        """Builds a store from rows of strings, one row at a time.
+
+        Args:
+            header (List[str]): The names of the columns.
+            rows (Iterable[List[str]]): The rows.
+
+        Returns:
+            ColumnarStore: The store.
+        """
+        store = cls(header)
+        for row in rows:
+            store.append(row)
+        return store
+
+    @classmethod
+    def from_csv(cls, path: str) -> "ColumnarStore":
+        """Loads a CSV file whose first row is the header.
+
+        Args:
+            path (str): The path of the CSV file.
+
+        Returns:
+            ColumnarStore: The store.
+        """
+        with open(path, newline="") as f:
+            reader = csv.reader(f)
+            return cls.from_rows(next(reader, []), reader)
+
+    def append(self, row: List[str]) -> None:
+        """Appends a row, turning an integer column into a dictionary
+        encoded one when a value is not an integer.
+
+        Args:
+            row (List[str]): The values of the row, one per column.
+        """
+        if len(row) != len(self.columns):
+            raise ValueError("row {} has {} values, expected {}".format(
+                self.size, len(row), len(self.columns)))
+        for position, value in enumerate(row):
+            column = self.columns[position]
+            if not column.append(value):
+                column = self.columns[position] = DictColumn(column)
+                column.append(value)
+        self.size += 1
+
+    def extend(self, store: "ColumnarStore") -> None:
+        """Appends the rows of another store with the same header, column
+        by column.
+
+        Args:
+            store (ColumnarStore): The store to append.
+        """
+        if store.header != self.header:
+            raise ValueError("header {} does not match {}".format(
+                store.header, self.header))
+        for position, column in enumerate(store.columns):
+            mine = self.columns[position]
+            if isinstance(mine, IntColumn) and isinstance(column, IntColumn):
+                mine.data.extend(column.data)
+                continue
+            if isinstance(mine, IntColumn):
+                mine = self.columns[position] = DictColumn(mine)
+            mine.extend(column)
+        self.size += store.size
+
+    def column(self, name: str) -> Union[IntColumn, DictColumn]:
+        """Returns a column by name.
+
+        Args:
+            name (str): The name of the column in the header.
+
+        Returns:
+            Union[IntColumn, DictColumn]: The column.
+        """
+        return self.columns[self.header.index(name)]
+
+    def row(self, index: int) -> List[str]:
+        """Builds one row.
+
+        Args:
+            index (int): The index of the row, negative from the end.
+
+        Returns:
+            List[str]: The values of the row.
+        """
+        return [column[index] for column in self.columns]
+
+    def __getitem__(self, index):
+        """Builds one row, or the list of rows of a slice.
+        """
+        if isinstance(index, slice):
+            return [self.row(position)
+                    for position in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("row index out of range")
+        return self.row(index)
+
+    def __len__(self) -> int:
+        """Returns the number of rows.
+        """
+        return self.size
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Signed, opaque pagination cursors.
+
+A cursor is the URL-safe base64 of a compact JSON payload followed by a
+truncated HMAC-SHA256 of it, so clients can pass it back but not forge or
+edit it. The payload also holds the time the cursor was issued at, so
+that old cursors can be refused.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import time
+from typing import Any, Dict, Optional
+
+DIGEST_SIZE = 16
+
+
+def _encode64(data: bytes) -> str:
+    """Encodes bytes in URL-safe base64 without padding.
+    """
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _decode64(text: str) -> bytes:
+    """Decodes URL-safe base64 without padding.
+    """
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(data: bytes, secret: bytes) -> bytes:
+    """Returns the truncated HMAC of data.
+    """
+    return hmac.new(secret, data, hashlib.sha256).digest()[:DIGEST_SIZE]
+
+
+def encode_cursor(payload: Dict[str, Any], secret: bytes) -> str:
+    """Builds a signed cursor.
+
+    Args:
+        payload (Dict[str, Any]): The JSON serializable state of the cursor.
+        secret (bytes): The signing key.
+
+    Returns:
+        str: The cursor, whose payload also holds the current time, in
+        seconds since the epoch, as "issued".
+    """
+    payload = dict(payload, issued=int(time.time()))
+    data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return "{}.{}".format(_encode64(data), _encode64(_sign(data, secret)))
+
+
+def decode_cursor(cursor: str, secret: bytes,
+                  max_age: Optional[float] = None) -> Dict[str, Any]:
+    """Checks the signature and the age of a cursor and returns its
+    payload.
+
+    Args:
+        cursor (str): The cursor built by encode_cursor.
+        secret (bytes): The signing key.
+        max_age (Optional[float], optional): The number of seconds a
+            cursor is valid for after it was issued. Defaults to None for
+            no limit.
+
+    Returns:
+        Dict[str, Any]: The payload.
+
+    Raises:
+        ValueError: If the cursor is malformed, its signature is wrong or
+            it expired.
+    """
+    try:
+        data, signature = (_decode64(part) for part in cursor.split("."))
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError("invalid cursor") from None
+    if not hmac.compare_digest(signature, _sign(data, secret)):
+        raise ValueError("invalid cursor")
+    payload = json.loads(data.decode("utf-8"))
+    if max_age is not None and time.time() - payload["issued"] > max_age:
+        raise ValueError("expired cursor")
+    return payload
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Hot reloading of a value loaded from a file.
+
+Reloader loads a value from a file, then polls the device, inode, size
+and modification time of the file from a daemon thread. When they change
+and then stay the same for one more poll, so that a file still being
+written is not read, the value is loaded again in that thread and
+replaces the previous one with a single assignment. Readers read the
+value attribute once and keep using what they got, so they never wait
+for a reload and never see a half-built value.
+
+A failed reload keeps the previous value and is retried on the next
+change of the file. Files are best replaced with a rename, as a file
+rewritten in place may change under a memory map of the previous value.
+"""
+import os
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+
+class Reloader:
+    """Value loaded from a file and reloaded when the file changes.
+    """
+
+    def __init__(self, path: str, load: Callable[[], Any],
+                 interval: float = 1.0) -> None:
+        """Loads the value a first time.
+
+        Args:
+            path (str): The path of the file to watch.
+            load (Callable[[], Any]): The function loading the value.
+            interval (float, optional): The number of seconds between two
+                polls. Defaults to 1.0.
+        """
+        self.path = path
+        self.load = load
+        self.interval = interval
+        self.signature = self.pending = self._stat()
+        self.value = load()
+        self.reloads = 0
+        self.error: Optional[BaseException] = None
+        self.stopping = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def _stat(self) -> Optional[Tuple[int, int, int, int]]:
+        """Returns what identifies the version of the file, or None if it
+        is missing.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def poll(self) -> bool:
+        """Reloads the value if the file changed and has settled.
+
+        Returns:
+            bool: True if a new value was swapped in.
+        """
+        current = self._stat()
+        if current is None or current == self.signature or \
+                current != self.pending:
+            self.pending = current
+            return False
+        self.signature = current
+        try:
+            value = self.load()
+        except Exception as error:
+            self.error = error
+            return False
+        self.value = value
+        self.error = None
+        self.reloads += 1
+        return True
+
+    def _run(self) -> None:
+        """Polls the file until stop is called.
+        """
+        while not self.stopping.wait(self.interval):
+            self.poll()
+
+    def start(self) -> "Reloader":
+        """Starts polling the file in a daemon thread.
+
+        Returns:
+            Reloader: The reloader itself.
+        """
+        if self.thread is None:
+            self.stopping.clear()
+            self.thread = threading.Thread(
+                target=self._run, name="reload {}".format(self.path),
+                daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops polling the file and waits for a reload in progress.
+        """
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Cursor pagination shared by the hypermedia servers.
+
+Cursors hold the position of a row in the order of the pages: its sort
+key then its index. Pages are found from it by bisection in a QueryIndex,
+in O(log n + page_size) however deep they are, and rows added to the
+dataset since do not shift them.
+
+Given the IndexedDataset of the snapshot, pages also follow its deletions
+and insertions: deleted rows are skipped, reading further until the page
+is full, and the inserted rows matching the filters are merged in at
+their position, ids of inserted rows coming after those of the indexed
+ones. seek_rows and count_rows also serve the offset pages of a modified
+dataset.
+
+A cursor only serves the filters and sort it was issued for, and can be
+given a maximum age.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+QueryIndex = __import__('query_index').QueryIndex
+IndexedDataset = __import__('keyset_index').IndexedDataset
+encode_cursor = __import__('cursor_token').encode_cursor
+decode_cursor = __import__('cursor_token').decode_cursor
+
+
+def _position(index: QueryIndex, indexed: Optional[IndexedDataset],
+              row_id: int, sort: Optional[str]) -> List[Any]:
+    """Returns the position of an indexed or inserted row.
+    """
+    if row_id < index.size:
+        return index.position(row_id, sort)
+    return index.position_of(indexed.row(row_id), row_id, sort)
+
+
+def _pairs(filters: Optional[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """Returns filters as sorted pairs of a column and a value.
+    """
+    return sorted((name, str(value))
+                  for name, value in (filters or {}).items())
+
+
+def _same_query(state: Dict[str, Any], filters: Optional[Dict[str, Any]],
+                sort: Optional[str]) -> bool:
+    """Tells whether the filters and sort given with a cursor, if any, are
+    those it was issued for.
+    """
+    return (filters is None or _pairs(filters) == _pairs(state["filters"])) \
+        and (sort is None or sort == state["sort"])
+
+
+def seek_rows(index: QueryIndex, indexed: Optional[IndexedDataset],
+              position: Optional[List[Any]], count: int,
+              filters: Optional[Dict[str, Any]] = None,
+              sort: Optional[str] = None, before: bool = False) -> List[int]:
+    """Returns the live rows following, or preceding, a position, in the
+    order of the pages.
+
+    Args:
+        index (QueryIndex): The indexes of the dataset.
+        indexed (Optional[IndexedDataset]): The deletions and insertions
+            of the dataset, None for a read-only dataset.
+        position (Optional[List[Any]]): A position returned by
+            QueryIndex.position, or None to start from the first row.
+        count (int): The maximum number of rows.
+        filters (Optional[Dict[str, Any]], optional): The value wanted
+            for each filtered column. Defaults to None.
+        sort (Optional[str], optional): The sort. Defaults to file order.
+        before (bool, optional): Whether to return the rows preceding the
+            position instead. Defaults to False.
+
+    Returns:
+        List[int]: The ids of the rows, in the order of sort.
+    """
+    if indexed is None:
+        return index.seek(position, count, filters, sort, before)
+
+    found: List[int] = []
+    edge = position
+    while len(found) < count:
+        wanted = count - len(found)
+        rows = index.seek(edge, wanted, filters, sort, before)
+        live = [row_id for row_id in rows if row_id in indexed.index]
+        found.extend(live[::-1] if before else live)
+        if len(rows) < wanted:
+            break
+        edge = index.position(rows[0] if before else rows[-1], sort)
+    if before:
+        found.reverse()
+
+    descending = sort is not None and sort.startswith("-")
+    # Rows following a position in the order of the pages
+    later = before == descending
+    inserted = []
+    for row_id, row in indexed.inserted.items():
+        if index.matches(row, filters):
+            current = index.position_of(row, row_id, sort)
+            if position is None or current != position and \
+                    (current > position) == later:
+                inserted.append((current, row_id))
+    if not inserted:
+        return found
+
+    merged = [(index.position(row_id, sort), row_id) for row_id in found]
+    merged = sorted(merged + inserted, reverse=descending)
+    merged = merged[-count:] if before else merged[:count]
+    return [row_id for _, row_id in merged]
+
+
+def count_rows(index: QueryIndex, indexed: Optional[IndexedDataset],
+               filters: Optional[Dict[str, Any]] = None) -> int:
+    """Returns the number of live rows matching filters, in
+    O(deletions + insertions) on top of QueryIndex.count.
+
+    Args:
+        index (QueryIndex): The indexes of the dataset.
+        indexed (Optional[IndexedDataset]): The deletions and insertions
+            of the dataset, None for a read-only dataset.
+        filters (Optional[Dict[str, Any]], optional): The value wanted for
+            each filtered column. Defaults to None.
+
+    Returns:
+        int: The number of rows.
+    """
+    if indexed is None:
+        return index.count(filters)
+    if not filters:
+        return len(indexed)
+    dataset = indexed.dataset
+    deleted = sum(index.matches(dataset[row_id], filters)
+                  for row_id in indexed.deleted)
+    inserted = sum(index.matches(row, filters)
+                   for row in indexed.inserted.values())
+    return index.count(filters) - deleted + inserted
+
+
+def get_hyper_cursor(index: QueryIndex, dataset: Sequence[List[str]],
+                     secret: bytes, cursor: str = None, page_size: int = 10,
+                     filters: Dict[str, Any] = None, sort: str = None,
+                     indexed: IndexedDataset = None,
+                     max_age: float = None) -> Dict[str, Any]:
+    """Retrieves a hypermedia page of a dataset following a cursor.
+
+    Args:
+        index (QueryIndex): The indexes of the dataset.
+        dataset (Sequence[List[str]]): The rows.
+        secret (bytes): The key signing the cursors.
+        cursor (str, optional): The next_cursor or prev_cursor of a page,
+            which also holds its filters and sort. Defaults to None for
+            the first page.
+        page_size (int, optional): The number of items per page.
+            Defaults to 10.
+        filters (Dict[str, Any], optional): The value wanted for some of
+            the filter columns, which must be those of the cursor if any.
+            Defaults to None, or to those of the cursor.
+        sort (str, optional): One of the sort columns, prefixed with "-"
+            for a descending sort, which must be that of the cursor if
+            any. Defaults to file order, or to that of the cursor.
+        indexed (IndexedDataset, optional): The deletions and insertions
+            of the dataset. Defaults to None for a read-only dataset.
+        max_age (float, optional): The number of seconds cursors are valid
+            for. Defaults to None for no limit.
+
+    Returns:
+        Dict[str, Any]: A dictionary containing the pagination data.
+
+    Raises:
+        ValueError: If the cursor is invalid, expired, or was issued for
+            other filters or another sort.
+    """
+    assert isinstance(page_size, int) and page_size > 0, \
+        "page_size must be an integer greater than 0"
+
+    position, before = None, False
+    if cursor is not None:
+        state = decode_cursor(cursor, secret, max_age)
+        if not _same_query(state, filters, sort):
+            raise ValueError("cursor does not match the filters or sort")
+        filters, sort = state["filters"], state["sort"]
+        position, before = state["position"], state["before"]
+
+    rows = seek_rows(index, indexed, position, page_size + 1, filters,
+                     sort, before)
+    # The extra row tells whether there is a page further on
+    further = len(rows) > page_size
+    rows = rows[-page_size:] if before else rows[:page_size]
+    if rows:
+        first = _position(index, indexed, rows[0], sort)
+        last = _position(index, indexed, rows[-1], sort)
+    else:
+        first = last = position
+
+    cursors = {}
+    for side, edge in ((False, last), (True, first)):
+        if side == before:
+            found = further
+        else:
+            found = edge is not None and \
+                bool(seek_rows(index, indexed, edge, 1, filters, sort,
+                               side))
+        cursors[side] = encode_cursor(
+            {"filters": filters, "sort": sort,
+             "position": edge, "before": side},
+            secret) if found else None
+
+    if indexed is None:
+        data = [dataset[row] for row in rows]
+    else:
+        data = [indexed.row(row) for row in rows]
+
+    return {
+        "page_size": len(data),
+        "data": data,
+        "next_cursor": cursors[False],
+        "prev_cursor": cursors[True]
+    }
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Deletion-resilient keyset index.
+
+Every row keeps a stable id: its position in the dataset when it was
+loaded, or the next free id for rows inserted later. LiveIndex tracks
+which ids are live in a bytearray and counts them in a Fenwick tree, so
+deleting, restoring, ranking and selecting ids take O(log n). A page
+ranks its key, then selects the live ids of the following ranks, so it
+costs O(page_size log n) however many deleted ids it skips, always holds
+page_size live rows when there are enough, and clients never skip or
+repeat rows across deletions.
+"""
+from array import array
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+
+class LiveIndex:
+    """Fenwick tree over the live flags of stable ids.
+    """
+
+    def __init__(self, size: int = 0) -> None:
+        """Creates an index where the ids 0 to size - 1 are live.
+
+        Args:
+            size (int, optional): The number of ids. Defaults to 0.
+        """
+        self.live = bytearray(b'\x01') * size
+        self.count = size
+        self.end = size
+        self._build(max(size, 1))
+
+    def _build(self, capacity: int) -> None:
+        """Rebuilds the tree for a number of ids in O(capacity).
+        """
+        self.live.extend(bytes(capacity - len(self.live)))
+        tree = array('i', [0]) * (capacity + 1)
+        for position in range(1, capacity + 1):
+            tree[position] += self.live[position - 1]
+            parent = position + (position & -position)
+            if parent <= capacity:
+                tree[parent] += tree[position]
+        self.tree = tree
+        self.capacity = capacity
+
+    def _add(self, row_id: int, delta: int) -> None:
+        """Adds delta to the count of an id.
+        """
+        position = row_id + 1
+        while position <= self.capacity:
+            self.tree[position] += delta
+            position += position & -position
+
+    def __len__(self) -> int:
+        """Returns the number of live ids.
+        """
+        return self.count
+
+    def __contains__(self, row_id: int) -> bool:
+        """Tells whether an id is live.
+        """
+        return 0 <= row_id < self.end and self.live[row_id] == 1
+
+    def rank(self, row_id: int) -> int:
+        """Returns the number of live ids before an id.
+
+        Args:
+            row_id (int): The id.
+
+        Returns:
+            int: The number of live ids lower than row_id.
+        """
+        total = 0
+        position = min(row_id, self.capacity)
+        while position > 0:
+            total += self.tree[position]
+            position -= position & -position
+        return total
+
+    def select(self, rank: int) -> Optional[int]:
+        """Returns the live id that has rank live ids before it.
+
+        Args:
+            rank (int): The number of live ids before the wanted one.
+
+        Returns:
+            Optional[int]: The id, or None if there are not enough live ids.
+        """
+        if not 0 <= rank < self.count:
+            return None
+        position = 0
+        step = 1 << self.capacity.bit_length()
+        while step:
+            following = position + step
+            if following <= self.capacity and self.tree[following] <= rank:
+                position = following
+                rank -= self.tree[following]
+            step >>= 1
+        return position
+
+    def next_live(self, row_id: int) -> Optional[int]:
+        """Returns the first live id at or after an id, or None.
+        """
+        return self.select(self.rank(row_id))
+
+    def delete(self, row_id: int) -> bool:
+        """Marks an id as deleted.
+
+        Returns:
+            bool: False if the id was not live.
+        """
+        if row_id not in self:
+            return False
+        self.live[row_id] = 0
+        self._add(row_id, -1)
+        self.count -= 1
+        return True
+
+    def restore(self, row_id: int) -> bool:
+        """Marks a deleted id as live again.
+
+        Returns:
+            bool: False if the id is live or was never used.
+        """
+        if not 0 <= row_id < self.end or self.live[row_id]:
+            return False
+        self.live[row_id] = 1
+        self._add(row_id, 1)
+        self.count += 1
+        return True
+
+    def append(self) -> int:
+        """Adds a live id after all the others, doubling the capacity of
+        the tree when it is full.
+
+        Returns:
+            int: The new id.
+        """
+        if self.end == self.capacity:
+            self._build(2 * self.capacity)
+        row_id = self.end
+        self.end += 1
+        self.live[row_id] = 1
+        self._add(row_id, 1)
+        self.count += 1
+        return row_id
+
+    def page(self, row_id: int,
+             page_size: int) -> Tuple[List[int], Optional[int]]:
+        """Returns the first page_size live ids at or after an id.
+
+        Args:
+            row_id (int): The key the page starts at.
+            page_size (int): The number of ids wanted.
+
+        Returns:
+            Tuple[List[int], Optional[int]]: The ids, and the first live id
+            after them, or None if there is none.
+        """
+        first = self.rank(row_id)
+        last = min(first + page_size, self.count)
+        ids = [self.select(rank) for rank in range(first, last)]
+        return ids, self.select(last)
+
+
+class IndexedDataset:
+    """Rows of a read-only dataset addressed by stable id.
+
+    version counts the deletions and insertions, for the caches of pages.
+    """
+
+    def __init__(self, dataset: Sequence[List[str]]) -> None:
+        """Indexes every row of a dataset, ids being their positions.
+
+        Args:
+            dataset (Sequence[List[str]]): The rows.
+        """
+        self.dataset = dataset
+        self.index = LiveIndex(len(dataset))
+        self.inserted: Dict[int, List[str]] = {}
+        self.deleted: Set[int] = set()
+        self.version = 0
+
+    def __len__(self) -> int:
+        """Returns the number of live rows.
+        """
+        return len(self.index)
+
+    @property
+    def modified(self) -> bool:
+        """Tells whether rows were deleted or inserted.
+        """
+        return bool(self.inserted or self.deleted)
+
+    @property
+    def end(self) -> int:
+        """Returns the id after the last one ever used.
+        """
+        return self.index.end
+
+    def row(self, row_id: int) -> List[str]:
+        """Returns the row of a live id.
+        """
+        if row_id not in self.index:
+            raise KeyError(row_id)
+        if row_id in self.inserted:
+            return self.inserted[row_id]
+        return self.dataset[row_id]
+
+    def delete(self, row_id: int) -> bool:
+        """Deletes the row of an id in O(log n).
+
+        Returns:
+            bool: False if the id was not live.
+        """
+        if not self.index.delete(row_id):
+            return False
+        if self.inserted.pop(row_id, None) is None:
+            self.deleted.add(row_id)
+        self.version += 1
+        return True
+
+    def insert(self, row: List[str]) -> int:
+        """Adds a row after all the others in amortized O(log n).
+
+        Returns:
+            int: The id of the row.
+        """
+        row_id = self.index.append()
+        self.inserted[row_id] = row
+        self.version += 1
+        return row_id
+
+    def rows(self, start: int, end: int) -> List[List[str]]:
+        """Returns the live rows from rank start to rank end, as a slice
+        of the live rows would, in O((end - start) log n).
+
+        Args:
+            start (int): The number of live rows before the first one.
+            end (int): The number of live rows before the one after the
+                last one.
+
+        Returns:
+            List[List[str]]: The rows.
+        """
+        end = min(end, len(self.index))
+        return [self.row(self.index.select(rank))
+                for rank in range(max(start, 0), end)]
+
+    def page(self, row_id: int,
+             page_size: int) -> Tuple[List[List[str]], Optional[int]]:
+        """Returns the first page_size live rows at or after an id.
+
+        Args:
+            row_id (int): The key the page starts at.
+            page_size (int): The number of rows wanted.
+
+        Returns:
+            Tuple[List[List[str]], Optional[int]]: The rows, and the id the
+            next page starts at, or None if there are no more rows.
+        """
+        ids, next_id = self.index.page(row_id, page_size)
+        return [self.row(position) for position in ids], next_id
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Memory-mapped CSV dataset.
+
+MmapCsv maps a CSV file in memory and keeps the byte offset at which each
+row starts, so reading a slice of rows seeks straight to it and only
+parses those rows. The offsets are saved next to the CSV file, in
+`<path>.idx`, with the size and modification time of the CSV file, and
+are read back with a zero-copy map of the index file. The index is
+rebuilt when the CSV file changed since it was written.
+
+Rows end at newlines that are not inside a quoted field, so quoted fields
+with embedded newlines are handled like csv.reader does.
+"""
+import csv
+import io
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Sequence
+from typing import List, Optional, Tuple
+
+MAGIC = b'PIDX'
+VERSION = 1
+HEADER = struct.Struct('<4sIQQQ')
+
+
+def scan_rows(data, start: int, end: int,
+              limit: Optional[int] = None) -> Tuple[array, int]:
+    """Finds the offsets at which the rows of a CSV buffer start.
+
+    Args:
+        data: The bytes, or the map, of the CSV file.
+        start (int): The offset of the first row.
+        end (int): The offset after the last row.
+        limit (Optional[int], optional): The number of rows after which
+            to stop. Defaults to None for every row.
+
+    Returns:
+        Tuple[array, int]: The array('Q') of the row starts followed by the
+        end offset, and the offset of the end of the first row.
+    """
+    offsets = array('Q', [start])
+    position = start
+    while position < end and (limit is None or len(offsets) <= limit):
+        newline = data.find(b'\n', position, end)
+        if newline < 0:
+            newline = end - 1
+        # An odd number of quotes means the newline is inside a field
+        while data[offsets[-1]:newline].count(b'"') % 2 and \
+                newline < end - 1:
+            found = data.find(b'\n', newline + 1, end)
+            newline = found if found >= 0 else end - 1
+        position = newline + 1
+        offsets.append(position)
+    return offsets, offsets[1] if len(offsets) > 1 else end
+
+
+class MmapCsv(Sequence):
+    """Read-only sequence of the rows of a memory-mapped CSV file.
+    """
+
+    def __init__(self, path: str, index_path: str = None) -> None:
+        """Maps a CSV file whose first row is the header.
+
+        Args:
+            path (str): The path of the CSV file.
+            index_path (str, optional): The path of the index file.
+                Defaults to the CSV path followed by .idx.
+        """
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) \
+                if stat.st_size else b""
+        self.offsets = self._load_index(stat)
+        if self.offsets is None:
+            header_end = scan_rows(self.map, 0, len(self.map), 1)[1]
+            self.offsets = scan_rows(self.map, header_end,
+                                     len(self.map))[0]
+            self._save_index(stat)
+        self.size = len(self.offsets) - 1
+        header = self._parse(0, self.offsets[0])
+        self.header = header[0] if header else []
+
+    @classmethod
+    def from_csv(cls, path: str) -> "MmapCsv":
+        """Maps a CSV file, like ColumnarStore.from_csv loads one.
+
+        Args:
+            path (str): The path of the CSV file.
+
+        Returns:
+            MmapCsv: The mapped dataset.
+        """
+        return cls(path)
+
+    def _load_index(self, stat):
+        """Returns the offsets of a valid index file, or None.
+        """
+        try:
+            with open(self.index_path, "rb") as f:
+                index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(index) < HEADER.size:
+            return None
+        magic, version, size, mtime, count = HEADER.unpack_from(index)
+        if (magic, version, size, mtime) != \
+                (MAGIC, VERSION, stat.st_size, stat.st_mtime_ns) or \
+                len(index) != HEADER.size + 8 * (count + 1):
+            return None
+        self.index_map = index
+        return memoryview(index)[HEADER.size:].cast('Q')
+
+    def _save_index(self, stat) -> None:
+        """Writes the offsets to the index file, atomically.
+
+        A read-only directory only means the index is rebuilt next time.
+        """
+        temporary = "{}.{}.tmp".format(self.index_path, os.getpid())
+        try:
+            with open(temporary, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, stat.st_size,
+                                    stat.st_mtime_ns,
+                                    len(self.offsets) - 1))
+                self.offsets.tofile(f)
+            os.replace(temporary, self.index_path)
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    def _parse(self, start: int, end: int) -> List[List[str]]:
+        """Parses the rows between two byte offsets.
+        """
+        text = self.map[start:end].decode("utf-8")
+        return list(csv.reader(io.StringIO(text, newline="")))
+
+    def __getitem__(self, index):
+        """Parses one row, or the rows of a slice.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.size)
+            if step != 1:
+                return [self[position]
+                        for position in range(start, stop, step)]
+            if start >= stop:
+                return []
+            return self._parse(self.offsets[start], self.offsets[stop])
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("row index out of range")
+        return self._parse(self.offsets[index], self.offsets[index + 1])[0]
+
+    def __len__(self) -> int:
+        """Returns the number of rows.
+        """
+        return self.size
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""Pagination server shared by the pagination samples.
+
+A Snapshot holds the dataset loaded from a version of DATA_FILE and the
+indexes built over it on first use. PaginationServer loads snapshots
+through a Reloader and serves pages, rows and exports of the current one;
+HypermediaServer adds hypermedia pages and signed cursors. The servers of
+1-simple_pagination, 2-hypermedia_pagination and
+3-hypermedia_del_pagination are subclasses of these.
+"""
+import math
+import os
+import sys
+from itertools import count
+from threading import Lock, RLock
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence
+
+ColumnarStore = __import__('columnar_store').ColumnarStore
+write_rows = __import__('row_export').write_rows
+QueryIndex = __import__('query_index').QueryIndex
+Reloader = __import__('hot_reload').Reloader
+IndexedDataset = __import__('keyset_index').IndexedDataset
+get_hyper_cursor = __import__('hyper_cursor').get_hyper_cursor
+seek_rows = __import__('hyper_cursor').seek_rows
+count_rows = __import__('hyper_cursor').count_rows
+index_range = __import__('0-simple_helper_function').index_range
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             os.pardir, "0x01-caching"))
+cached = __import__('memoize').cached
+
+PAGE_CACHE_SIZE = 256
+_versions = count()
+
+
+class Snapshot:
+    """Dataset loaded from a version of DATA_FILE, and its indexes, built
+    once on first use. version tells snapshots apart.
+    """
+
+    def __init__(self, dataset: Sequence[List[str]], filters: Sequence[str],
+                 sorts: Sequence[str], chunk_size: int) -> None:
+        """Wraps a dataset whose indexes are not built yet.
+
+        Args:
+            dataset (Sequence[List[str]]): The rows.
+            filters (Sequence[str]): The columns pages can be filtered on.
+            sorts (Sequence[str]): The columns pages can be sorted by.
+            chunk_size (int): The number of rows read at a time.
+        """
+        self.dataset = dataset
+        self.filters = filters
+        self.sorts = sorts
+        self.chunk_size = chunk_size
+        self.version = next(_versions)
+        self.__query_index = None
+        self.__indexed_dataset = None
+        self.__lock = Lock()
+
+    @property
+    def query_index(self) -> QueryIndex:
+        """Posting lists and sorted permutations of dataset
+
+        Returns:
+            QueryIndex: The indexes of the filters and sorts columns.
+        """
+        if self.__query_index is None:
+            self.__build_query_index()
+        return self.__query_index
+
+    def __build_query_index(self) -> None:
+        """Builds the query index, once.
+        """
+        with self.__lock:
+            if self.__query_index is None:
+                self.__query_index = QueryIndex(
+                    self.dataset, self.filters, self.sorts, self.chunk_size)
+
+    @property
+    def indexed_dataset(self) -> IndexedDataset:
+        """Rows of dataset addressed by stable ids
+
+        Returns:
+            IndexedDataset: The rows, whose ids are their indexes when
+            loaded, that survive deletions and insertions.
+        """
+        if self.__indexed_dataset is None:
+            self.__build_indexed_dataset()
+        return self.__indexed_dataset
+
+    def __build_indexed_dataset(self) -> None:
+        """Builds the stable id index, once.
+        """
+        with self.__lock:
+            if self.__indexed_dataset is None:
+                self.__indexed_dataset = IndexedDataset(self.dataset)
+
+    def warm(self, previous: "Snapshot") -> None:
+        """Builds the indexes that a previous snapshot had built.
+
+        Args:
+            previous (Snapshot): The snapshot this one replaces.
+        """
+        if previous.__query_index is not None:
+            self.__build_query_index()
+        if previous.__indexed_dataset is not None:
+            self.__build_indexed_dataset()
+
+
+def _dataset_key(server: "PaginationServer") -> int:
+    """Returns the cache key of PaginationServer.dataset: the version of
+    the current snapshot.
+    """
+    return server.snapshot().version
+
+
+def _page_key(server: "PaginationServer", page: int = 1,
+              page_size: int = 10, filters: Dict[str, Any] = None,
+              sort: str = None, snapshot: Snapshot = None) -> tuple:
+    """Returns the cache key of PaginationServer.get_page: its arguments
+    and the versions of the snapshot and of its deletions and insertions.
+    """
+    snapshot = snapshot or server.snapshot()
+    indexed = server._indexed(snapshot)
+    return (snapshot.version, None if indexed is None else indexed.version,
+            page, page_size, tuple(sorted((filters or {}).items())), sort)
+
+
+class PaginationServer:
+    """Server paginating a database of popular baby names.
+
+    STORE loads DATA_FILE: ColumnarStore keeps it in memory by column,
+    ParallelStore too but parses it in several processes, and MmapCsv
+    maps it and only parses the rows of the requested pages.
+    Pages can be filtered on the FILTERS columns and sorted by the SORTS
+    columns. Setting WATCH_INTERVAL to a number of seconds polls DATA_FILE
+    from a daemon thread, and reloads it in the background when it
+    changes; close stops it.
+
+    Each server caches its dataset and its PAGE_CACHE_SIZE last pages,
+    keyed on the version of the snapshot and of its changes, so that a
+    reload, a deletion or an insertion is never served stale.
+
+    Subclasses whose rows change return the IndexedDataset of a snapshot
+    from _indexed: pages, rows and exports then skip its deleted rows and
+    include its inserted ones, reading it under the server lock.
+    """
+    DATA_FILE = "Popular_Baby_Names.csv"
+    STORE = ColumnarStore
+    CHUNK_SIZE = 1000
+    FILTERS = ("Year of Birth", "Gender", "Ethnicity")
+    SORTS = ("Count", "Rank")
+    WATCH_INTERVAL = None
+
+    def __init__(self):
+        """Initializes a new Server instance.
+        """
+        self.__reloader = None
+        self._lock = RLock()
+
+    def load(self) -> Snapshot:
+        """Loads DATA_FILE with STORE
+
+        The indexes are built on first use, except on a reload, where the
+        indexes of the current snapshot are built in the reloading thread
+        before the new snapshot replaces it.
+
+        Returns:
+            Snapshot: The rows of the CSV file without the header, built
+            only when they are read, and their indexes.
+        """
+        snapshot = Snapshot(self.STORE.from_csv(self.DATA_FILE),
+                            self.FILTERS, self.SORTS, self.CHUNK_SIZE)
+        if self.__reloader is not None:
+            snapshot.warm(self.__reloader.value)
+        return snapshot
+
+    def reloader(self) -> Reloader:
+        """Reloader of DATA_FILE, created on first use, polling it from a
+        daemon thread unless WATCH_INTERVAL is None
+
+        Returns:
+            Reloader: The reloader, whose value is the current Snapshot.
+        """
+        if self.__reloader is None:
+            with self._lock:
+                if self.__reloader is None:
+                    reloader = Reloader(self.DATA_FILE, self.load,
+                                        self.WATCH_INTERVAL)
+                    if self.WATCH_INTERVAL is not None:
+                        reloader.start()
+                    self.__reloader = reloader
+        return self.__reloader
+
+    def close(self) -> None:
+        """Stops polling DATA_FILE, if it was.
+        """
+        if self.__reloader is not None:
+            self.__reloader.stop()
+
+    def snapshot(self) -> Snapshot:
+        """Current dataset and indexes, replaced as a whole once a reload
+        is complete. Requests read it once, so that all they return comes
+        from the same version of DATA_FILE, and never wait for a reload.
+
+        Returns:
+            Snapshot: The current snapshot.
+        """
+        return self.reloader().value
+
+    @cached(capacity=1, key=_dataset_key)
+    def dataset(self) -> Sequence[List[str]]:
+        """Dataset of the current snapshot
+
+        Returns:
+            Sequence[List[str]]: The rows of the CSV file without the
+            header, built only when they are read.
+        """
+        return self.snapshot().dataset
+
+    def query_index(self) -> QueryIndex:
+        """Posting lists and sorted permutations of the current snapshot
+
+        Returns:
+            QueryIndex: The indexes of the FILTERS and SORTS columns.
+        """
+        return self.snapshot().query_index
+
+    def _indexed(self, snapshot: Snapshot) -> Optional[IndexedDataset]:
+        """Returns the deletions and insertions pages of a snapshot follow,
+        None for a read-only dataset.
+        """
+        return None
+
+    @cached(capacity=PAGE_CACHE_SIZE, key=_page_key)
+    def get_page(self, page: int = 1, page_size: int = 10,
+                 filters: Dict[str, Any] = None, sort: str = None,
+                 snapshot: Snapshot = None) -> List[List]:
+        """Retrieves a page of the dataset.
+
+        Filtered or sorted pages are read from query_index, in
+        O(page_size) whatever the page, or in O(page * page_size) once
+        rows were deleted or inserted.
+
+        Args:
+            page (int, optional): The page number. Defaults to 1.
+            page_size (int, optional): The number of items per page.
+                Defaults to 10.
+            filters (Dict[str, Any], optional): The value wanted for some
+                of the FILTERS columns, e.g. {"Gender": "FEMALE"}.
+                Defaults to None.
+            sort (str, optional): One of the SORTS columns, prefixed with
+                "-" for a descending sort. Defaults to file order.
+            snapshot (Snapshot, optional): The snapshot to read. Defaults
+                to the current one.
+
+        Returns:
+            List[List]: The page of the dataset.
+        """
+        assert isinstance(page, int) and page > 0, \
+            "page must be an integer greater than 0"
+        assert isinstance(page_size, int) and page_size > 0, \
+            "page_size must be an integer greater than 0"
+
+        start, end = index_range(page, page_size)
+        snapshot = snapshot or self.snapshot()
+        dataset = snapshot.dataset
+        indexed = self._indexed(snapshot)
+
+        if indexed is not None and indexed.modified:
+            with self._lock:
+                if not filters and sort is None:
+                    return indexed.rows(start, end)
+                rows = seek_rows(snapshot.query_index, indexed, None, end,
+                                 filters, sort)
+                return [indexed.row(row) for row in rows[start:]]
+
+        if filters or sort is not None:
+            rows = snapshot.query_index.page(start, end, filters, sort)
+            return [dataset[row] for row in rows]
+
+        if start >= len(dataset):
+            return []
+
+        return dataset[start:end]
+
+    def iter_rows(self, start_index: int = 0) -> Iterator[List[str]]:
+        """Yields the rows of the dataset from a start index, reading
+        them from the store a chunk at a time.
+
+        Args:
+            start_index (int, optional): The index of the first row, or
+                its stable id when rows change. Defaults to 0.
+
+        Yields:
+            List[str]: The rows, in file order.
+        """
+        assert isinstance(start_index, int) and start_index >= 0, \
+            "start_index must be a non-negative integer"
+
+        snapshot = self.snapshot()
+        indexed = self._indexed(snapshot)
+        if indexed is not None:
+            row_id = start_index
+            while row_id is not None:
+                with self._lock:
+                    rows, row_id = indexed.page(row_id, self.CHUNK_SIZE)
+                yield from rows
+            return
+
+        dataset = snapshot.dataset
+        for start in range(start_index, len(dataset), self.CHUNK_SIZE):
+            yield from dataset[start:start + self.CHUNK_SIZE]
+
+    def iter_pages(self, page_size: int = 10) -> Iterator[List[List]]:
+        """Yields every page of the dataset, in order.
+
+        Args:
+            page_size (int, optional): The number of items per page.
+                Defaults to 10.
+
+        Yields:
+            List[List]: The pages, the last one possibly shorter.
+        """
+        assert isinstance(page_size, int) and page_size > 0, \
+            "page_size must be an integer greater than 0"
+
+        if self._indexed(self.snapshot()) is not None:
+            page = []
+            for row in self.iter_rows():
+                page.append(row)
+                if len(page) == page_size:
+                    yield page
+                    page = []
+            if page:
+                yield page
+            return
+
+        dataset = self.dataset()
+        for start in range(0, len(dataset), page_size):
+            yield dataset[start:start + page_size]
+
+    def export(self, file: IO[str], fmt: str = "ndjson",
+               start_index: int = 0) -> int:
+        """Streams the dataset to a file-like object in constant memory.
+
+        Args:
+            file (IO[str]): The text file to write to.
+            fmt (str, optional): "ndjson" or "csv". Defaults to "ndjson".
+            start_index (int, optional): The index of the first row.
+                Defaults to 0.
+
+        Returns:
+            int: The number of rows written.
+        """
+        return write_rows(file, self.dataset().header,
+                          self.iter_rows(start_index), fmt)
+
+
+class HypermediaServer(PaginationServer):
+    """PaginationServer returning hypermedia pages.
+
+    Cursors are signed with CURSOR_SECRET, read from the
+    PAGINATION_CURSOR_SECRET environment variable so that every worker
+    accepts them, else random and valid in this process only. They
+    expire CURSOR_MAX_AGE seconds after they were issued, never if it is
+    None.
+    """
+    CURSOR_SECRET = os.environ.get("PAGINATION_CURSOR_SECRET",
+                                   "").encode() or os.urandom(32)
+    CURSOR_MAX_AGE = 24 * 60 * 60
+
+    def get_hyper(self, page: int = 1, page_size: int = 10,
+                  filters: Dict[str, Any] = None,
+                  sort: str = None) -> Dict[str, Any]:
+        """Retrieves a hypermedia page of the dataset.
+
+        Args:
+            page (int, optional): The page number. Defaults to 1.
+            page_size (int, optional): The number of items per page.
+                Defaults to 10.
+            filters (Dict[str, Any], optional): The value wanted for some
+                of the FILTERS columns. Defaults to None.
+            sort (str, optional): One of the SORTS columns, prefixed with
+                "-" for a descending sort. Defaults to file order.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the pagination data.
+        """
+        snapshot = self.snapshot()
+        data = self.get_page(page, page_size, filters, sort, snapshot)
+        indexed = self._indexed(snapshot)
+        if indexed is not None and indexed.modified:
+            with self._lock:
+                total_items = count_rows(snapshot.query_index, indexed,
+                                         filters)
+        elif filters:
+            total_items = snapshot.query_index.count(filters)
+        else:
+            total_items = len(snapshot.dataset)
+        total_pages = math.ceil(total_items / page_size)
+
+        hypermedia_data = {
+            "page_size": len(data),
+            "page": page,
+            "data": data,
+            "next_page": page + 1 if page < total_pages else None,
+            "prev_page": page - 1 if page > 1 else None,
+            "total_pages": total_pages
+        }
+
+        return hypermedia_data
+
+    def get_hyper_cursor(self, cursor: str = None, page_size: int = 10,
+                         filters: Dict[str, Any] = None,
+                         sort: str = None) -> Dict[str, Any]:
+        """Retrieves a hypermedia page of the dataset following a cursor.
+
+        Cursors hold the position of a row in the order of the pages: its
+        sort key then its index. Pages are found from it by bisection, in
+        O(log n + page_size) however deep they are, and rows added to the
+        dataset since do not shift them.
+
+        Args:
+            cursor (str, optional): The next_cursor or prev_cursor of a
+                page, which also holds its filters and sort. Defaults to
+                None for the first page.
+            page_size (int, optional): The number of items per page.
+                Defaults to 10.
+            filters (Dict[str, Any], optional): The value wanted for some
+                of the FILTERS columns, which must be those of the cursor
+                if any. Defaults to None, or to those of the cursor.
+            sort (str, optional): One of the SORTS columns, prefixed with
+                "-" for a descending sort, which must be that of the cursor
+                if any. Defaults to file order, or to that of the cursor.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the pagination data.
+
+        Raises:
+            ValueError: If the cursor is invalid, expired, or was issued
+                for other filters or another sort.
+        """
+        snapshot = self.snapshot()
+        indexed = self._indexed(snapshot)
+        if indexed is None:
+            return get_hyper_cursor(snapshot.query_index, snapshot.dataset,
+                                    self.CURSOR_SECRET, cursor, page_size,
+                                    filters, sort,
+                                    max_age=self.CURSOR_MAX_AGE)
+        with self._lock:
+            return get_hyper_cursor(snapshot.query_index, snapshot.dataset,
+                                    self.CURSOR_SECRET, cursor, page_size,
+                                    filters, sort, indexed,
+                                    self.CURSOR_MAX_AGE)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Parallel CSV loading.
+
+read_csv cuts a CSV file into chunks that each start at the beginning
+of a row, at most CHUNK_SIZE bytes long, and four per worker for smaller
+files so that all the workers stay busy. It parses them in a
+ProcessPoolExecutor, every worker building a ColumnarStore of its rows,
+and appends these stores in file order to the one it returns.
+
+A newline ends a row unless it is inside a quoted field. Chunks are found
+in two passes: the workers first count the quotes of each stretch of
+chunk_size bytes, the parity of the quotes before the end of a stretch
+telling whether it falls inside a quoted field, then each cut moves
+forward to the first newline outside quotes. Like mmap_csv, this expects
+quotes to only enclose fields and be doubled inside them, as csv.writer
+writes them.
+"""
+import csv
+import io
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Optional, Type
+
+ColumnarStore = __import__('columnar_store').ColumnarStore
+
+CHUNK_SIZE = 32 << 20
+MIN_CHUNK_SIZE = 64 << 10
+
+
+def _read(path: str, start: int, end: int) -> bytes:
+    """Reads the bytes between two offsets of a file.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start)
+
+
+def count_quotes(path: str, start: int, end: int) -> int:
+    """Counts the quotes between two offsets of a file.
+
+    Args:
+        path (str): The path of the file.
+        start (int): The first offset.
+        end (int): The offset after the last byte.
+
+    Returns:
+        int: The number of quotes.
+    """
+    return _read(path, start, end).count(b'"')
+
+
+def row_end(data, position: int, end: int, quoted: bool) -> int:
+    """Finds the end of the row an offset is in.
+
+    Args:
+        data: The bytes, or the map, of the CSV file.
+        position (int): The offset.
+        end (int): The offset of the end of the data.
+        quoted (bool): Whether the offset is inside a quoted field.
+
+    Returns:
+        int: The offset after the first newline at or after position that
+        is not inside a quoted field, or end.
+    """
+    while position < end:
+        newline = data.find(b'\n', position, end)
+        if newline < 0:
+            break
+        if data[position:newline].count(b'"') % 2:
+            quoted = not quoted
+        if not quoted:
+            return newline + 1
+        position = newline + 1
+    return end
+
+
+def parse_chunk(path: str, start: int, end: int, header: List[str],
+                store: Type[ColumnarStore]) -> ColumnarStore:
+    """Parses the rows between two offsets of a CSV file.
+
+    Args:
+        path (str): The path of the CSV file.
+        start (int): The offset of the first row.
+        end (int): The offset after the last row.
+        header (List[str]): The names of the columns.
+        store (Type[ColumnarStore]): The class of the store to build.
+
+    Returns:
+        ColumnarStore: The rows.
+    """
+    text = _read(path, start, end).decode("utf-8")
+    return store.from_rows(header,
+                           csv.reader(io.StringIO(text, newline="")))
+
+
+def read_csv(path: str, workers: Optional[int] = None,
+             chunk_size: Optional[int] = None,
+             store: Type[ColumnarStore] = ColumnarStore) -> ColumnarStore:
+    """Loads a CSV file whose first row is the header in several
+    processes.
+
+    Args:
+        path (str): The path of the CSV file.
+        workers (Optional[int], optional): The number of processes.
+            Defaults to the number of CPUs.
+        chunk_size (Optional[int], optional): The approximate number of
+            bytes parsed by a process at a time. Defaults to a quarter of
+            the share of each worker, between 64 KiB and 32 MiB.
+        store (Type[ColumnarStore], optional): The class of the store.
+            Defaults to ColumnarStore.
+
+    Returns:
+        ColumnarStore: The store, holding the same rows as
+        store.from_csv(path) would.
+    """
+    workers = workers or os.cpu_count() or 1
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) \
+            if size else b""
+    try:
+        header_end = row_end(data, 0, size, False)
+        header = next(csv.reader(io.StringIO(
+            data[:header_end].decode("utf-8"), newline="")), [])
+        if chunk_size is None:
+            chunk_size = max(min(CHUNK_SIZE, size // (4 * workers)),
+                             MIN_CHUNK_SIZE)
+        stretches = list(range(header_end, size, chunk_size)) + [size]
+        with ProcessPoolExecutor(workers) as executor:
+            cuts = [header_end]
+            quotes = 0
+            counts = executor.map(count_quotes, repeat(path),
+                                  stretches[:-2], stretches[1:-1])
+            for start, count in zip(stretches[1:-1], counts):
+                quotes += count
+                cut = row_end(data, start, size, quotes % 2 == 1)
+                if cut > cuts[-1]:
+                    cuts.append(cut)
+            if cuts[-1] < size:
+                cuts.append(size)
+            result = store(header)
+            for part in executor.map(parse_chunk, repeat(path), cuts[:-1],
+                                     cuts[1:], repeat(header),
+                                     repeat(store)):
+                result.extend(part)
+        return result
+    finally:
+        if size:
+            data.close()
+
+
+class ParallelStore(ColumnarStore):
+    """ColumnarStore loaded by read_csv, for Server.STORE on large files.
+    """
+    WORKERS: Optional[int] = None
+
+    @classmethod
+    def from_csv(cls, path: str) -> "ParallelStore":
+        """Loads a CSV file in WORKERS processes.
+
+        Args:
+            path (str): The path of the CSV file.
+
+        Returns:
+            ParallelStore: The store.
+        """
+        return read_csv(path, cls.WORKERS, store=cls)
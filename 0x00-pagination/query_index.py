@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Secondary indexes for filtered and sorted pagination.
+
+QueryIndex reads a dataset once and builds, for every sort column, the
+permutation of the row indexes sorted by that column, and for every
+filter column and value, the posting list of the rows holding that value
+in each order: file order and every sort order. A page of rows filtered
+on one column and sorted on another is then a slice of a prebuilt list,
+read from the end for a descending sort, so it costs O(page_size) however
+deep the page is.
+
+Rows are ordered by their sort key then their index, so each row has a
+unique position in every order, and seek finds the rows following a
+position by bisection, for keyset pagination.
+
+Filtering on several columns starts from the shortest posting list and
+checks the other columns; the result is kept, so only the first request
+for a combination costs more than O(page_size). A row belongs to a single
+combination of values of each set of filter columns, so these lists hold
+at most one index per row, set of filter columns and order.
+"""
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+Filters = Tuple[Tuple[str, str], ...]
+
+
+class QueryIndex:
+    """Posting lists and presorted permutations of a dataset.
+    """
+
+    def __init__(self, dataset: Sequence[List[str]],
+                 filters: Sequence[str] = (), sorts: Sequence[str] = (),
+                 chunk_size: int = 1000) -> None:
+        """Builds the indexes of a dataset in one pass over its rows.
+
+        Args:
+            dataset (Sequence[List[str]]): The rows, with a header
+                attribute naming the columns.
+            filters (Sequence[str], optional): The columns pages can be
+                filtered on. Defaults to ().
+            sorts (Sequence[str], optional): The columns pages can be
+                sorted by. Defaults to ().
+            chunk_size (int, optional): The number of rows read at a time.
+                Defaults to 1000.
+        """
+        header = list(dataset.header)
+        self.size = len(dataset)
+        self.filters = tuple(filters)
+        self.sorts = tuple(sorts)
+        self.columns = wanted = {name: header.index(name)
+                                 for name in self.filters + self.sorts}
+        values: Dict[str, List[str]] = {name: [] for name in wanted}
+        for start in range(0, self.size, chunk_size):
+            for row in dataset[start:start + chunk_size]:
+                for name, position in wanted.items():
+                    values[name].append(row[position])
+
+        self.orders: Dict[Optional[str], Sequence[int]] = {
+            None: range(self.size)}
+        self.keys: Dict[str, List[Any]] = {}
+        for name in self.sorts:
+            keys = self.keys[name] = self._sort_keys(values[name])
+            self.orders[name] = array('i', sorted(
+                range(self.size), key=keys.__getitem__))
+
+        # Codes of the value of each row, for filtering on several columns
+        self.codes: Dict[str, array] = {}
+        self.codes_of: Dict[str, Dict[str, int]] = {}
+        self.postings: Dict[Tuple[Filters, Optional[str]], array] = {}
+        for name in self.filters:
+            codes_of = self.codes_of[name] = {}
+            codes = self.codes[name] = array('i', [0]) * self.size
+            for row_id, value in enumerate(values[name]):
+                codes[row_id] = codes_of.setdefault(value, len(codes_of))
+            for sort, order in self.orders.items():
+                buckets = [array('i') for _ in codes_of]
+                for row_id in order:
+                    buckets[codes[row_id]].append(row_id)
+                for value, code in codes_of.items():
+                    self.postings[((name, value),), sort] = buckets[code]
+
+    @staticmethod
+    def _sort_keys(values: List[str]) -> List[Any]:
+        """Returns the sort keys of the rows: their values as integers when
+        all the values of the column are.
+        """
+        try:
+            return [int(value) for value in values]
+        except ValueError:
+            return values
+
+    def _normalize(self, filters: Optional[Dict[str, Any]]) -> Filters:
+        """Checks filters and returns them as a sorted tuple of pairs.
+        """
+        filters = filters or {}
+        for name in filters:
+            assert name in self.filters, \
+                "filters must be on {}".format(", ".join(self.filters))
+        return tuple(sorted((name, str(value))
+                            for name, value in filters.items()))
+
+    def _parse_sort(self, sort: Optional[str]) -> Tuple[Optional[str], bool]:
+        """Splits a sort into its column and whether it is descending.
+        """
+        if sort is None:
+            return None, False
+        descending = sort.startswith("-")
+        column = sort[1:] if descending else sort
+        assert column in self.sorts, "sort must be one of {}".format(
+            ", ".join(self.sorts + tuple("-" + name for name in self.sorts)))
+        return column, descending
+
+    def _select(self, filters: Filters,
+                column: Optional[str]) -> Sequence[int]:
+        """Returns the rows matching filters in the ascending order of a
+        column, computing and keeping those of several filters.
+        """
+        if not filters:
+            return self.orders[column]
+        found = self.postings.get((filters, column))
+        if found is not None:
+            return found
+        if len(filters) == 1:
+            # A value that no row holds
+            return array('i')
+        lists = [self._select((pair,), column) for pair in filters]
+        shortest = min(range(len(lists)), key=lambda i: len(lists[i]))
+        checks = []
+        for position, (name, value) in enumerate(filters):
+            if position != shortest:
+                code = self.codes_of[name].get(value, -1)
+                checks.append((self.codes[name], code))
+        found = array('i', [
+            row_id for row_id in lists[shortest]
+            if all(codes[row_id] == code for codes, code in checks)])
+        self.postings[filters, column] = found
+        return found
+
+    def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Returns the number of rows matching filters.
+
+        Args:
+            filters (Optional[Dict[str, Any]], optional): The value wanted
+                for each filtered column. Defaults to None.
+
+        Returns:
+            int: The number of rows.
+        """
+        return len(self._select(self._normalize(filters), None))
+
+    def page(self, start: int, end: int,
+             filters: Optional[Dict[str, Any]] = None,
+             sort: Optional[str] = None) -> List[int]:
+        """Returns the indexes of the rows of a page in O(end - start).
+
+        Args:
+            start (int): The position of the first row of the page.
+            end (int): The position after the last row of the page.
+            filters (Optional[Dict[str, Any]], optional): The value wanted
+                for each filtered column. Defaults to None.
+            sort (Optional[str], optional): The column to sort by, prefixed
+                with "-" for a descending sort. Defaults to file order.
+
+        Returns:
+            List[int]: The indexes of the rows in the dataset.
+        """
+        column, descending = self._parse_sort(sort)
+        ids = self._select(self._normalize(filters), column)
+        if not descending:
+            return list(ids[start:end])
+        total = len(ids)
+        start, end = max(total - end, 0), max(total - start, 0)
+        return list(ids[start:end])[::-1]
+
+    def position(self, row_id: int, sort: Optional[str] = None) -> List[Any]:
+        """Returns the position of a row in the order of a sort.
+
+        Args:
+            row_id (int): The index of the row in the dataset.
+            sort (Optional[str], optional): The sort. Defaults to file
+                order.
+
+        Returns:
+            List[Any]: The sort key of the row, if any, then its index.
+        """
+        column = self._parse_sort(sort)[0]
+        if column is None:
+            return [row_id]
+        return [self.keys[column][row_id], row_id]
+
+    def position_of(self, row: List[str], row_id: int,
+                    sort: Optional[str] = None) -> List[Any]:
+        """Returns the position that a row missing from the index, such as
+        one inserted since, would have in the order of a sort.
+
+        Args:
+            row (List[str]): The values of the row.
+            row_id (int): The id of the row, at least the size of the
+                indexed dataset.
+            sort (Optional[str], optional): The sort. Defaults to file
+                order.
+
+        Returns:
+            List[Any]: The sort key of the row, if any, then its id.
+        """
+        column = self._parse_sort(sort)[0]
+        if column is None:
+            return [row_id]
+        value = row[self.columns[column]]
+        keys = self.keys[column]
+        if not keys:
+            return [self._sort_keys([value])[0], row_id]
+        if isinstance(keys[0], str):
+            return [value, row_id]
+        return [int(value), row_id]
+
+    def matches(self, row: List[str],
+                filters: Optional[Dict[str, Any]] = None) -> bool:
+        """Tells whether a row that is not indexed matches filters.
+
+        Args:
+            row (List[str]): The values of the row.
+            filters (Optional[Dict[str, Any]], optional): The value wanted
+                for each filtered column. Defaults to None.
+
+        Returns:
+            bool: True if the row holds every wanted value.
+        """
+        return all(row[self.columns[name]] == value
+                   for name, value in self._normalize(filters))
+
+    def _bisect(self, ids: Sequence[int], position: List[Any],
+                column: Optional[str], strict: bool) -> int:
+        """Returns the index of the first of ids, in the ascending order of
+        column, whose position is above position, or equal to it unless
+        strict.
+        """
+        keys = self.keys.get(column)
+        low, high = 0, len(ids)
+        while low < high:
+            middle = (low + high) // 2
+            row_id = ids[middle]
+            current = [row_id] if keys is None else [keys[row_id], row_id]
+            if current < position or (strict and current == position):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def seek(self, position: Optional[List[Any]], count: int,
+             filters: Optional[Dict[str, Any]] = None,
+             sort: Optional[str] = None, before: bool = False) -> List[int]:
+        """Returns the rows following a position in O(log n + count).
+
+        Args:
+            position (Optional[List[Any]]): A position returned by
+                position, which need not be the one of a matching row, or
+                None to start from the first row.
+            count (int): The maximum number of rows.
+            filters (Optional[Dict[str, Any]], optional): The value wanted
+                for each filtered column. Defaults to None.
+            sort (Optional[str], optional): The column to sort by, prefixed
+                with "-" for a descending sort. Defaults to file order.
+            before (bool, optional): Whether to return the rows preceding
+                the position instead, or the last ones when it is None.
+                Defaults to False.
+
+        Returns:
+            List[int]: The indexes of the rows in the dataset, in the
+            order of sort.
+        """
+        column, descending = self._parse_sort(sort)
+        ids = self._select(self._normalize(filters), column)
+        # The rows following a position in a descending order precede it
+        # in the ascending order of ids
+        if before != descending:
+            end = len(ids) if position is None else \
+                self._bisect(ids, position, column, False)
+            found = list(ids[max(end - count, 0):end])
+        else:
+            start = 0 if position is None else \
+                self._bisect(ids, position, column, True)
+            found = list(ids[start:start + count])
+        return found[::-1] if descending else found
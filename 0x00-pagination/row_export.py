@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Streaming export of dataset rows.
+"""
+import csv
+import json
+from typing import IO, Iterable, List
+
+FORMATS = ("ndjson", "csv")
+
+
+def write_rows(file: IO[str], header: List[str],
+               rows: Iterable[List[str]], fmt: str = "ndjson") -> int:
+    """Writes rows to a text file one at a time, in constant memory.
+
+    Args:
+        file (IO[str]): The file-like object to write to.
+        header (List[str]): The names of the columns.
+        rows (Iterable[List[str]]): The rows, consumed lazily.
+        fmt (str, optional): "ndjson" for one JSON object per line keyed
+            by the header, or "csv" for the header then the rows.
+            Defaults to "ndjson".
+
+    Returns:
+        int: The number of rows written.
+    """
+    assert fmt in FORMATS, "fmt must be one of {}".format(", ".join(FORMATS))
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(file)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            file.write(json.dumps(dict(zip(header, row))))
+            file.write("\n")
+            count += 1
+    return count
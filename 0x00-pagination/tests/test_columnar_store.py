@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+""" Columnar store tests
+"""
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+columnar_store = __import__('columnar_store')
+ColumnarStore = columnar_store.ColumnarStore
+
+HEADER = ["Year of Birth", "Gender", "Child's First Name", "Count"]
+
+
+class TestColumnarStore(unittest.TestCase):
+    """ Rows come back exactly as csv.reader read them """
+
+    def setUp(self):
+        """ Mix canonical integers with values that only look like some """
+        self.rows = [["2016", "FEMALE", "Olivia", "172"],
+                     ["2016", "MALE", "Liam", "-3"],
+                     ["2017", "FEMALE", "Emma", "007"],
+                     ["2017", "MALE", "Noah", ""],
+                     ["2018", "FEMALE", "Ava", " 5"],
+                     ["2018", "MALE", "Liam", "99999999999"],
+                     ["2019", "FEMALE", "Mia", "1e3"]]
+
+    def test_round_trip(self):
+        """ Every row and slice reads back unchanged """
+        store = ColumnarStore.from_rows(HEADER, self.rows)
+        self.assertEqual(len(store), len(self.rows))
+        self.assertEqual(store[:], self.rows)
+        self.assertEqual(store[2:5], self.rows[2:5])
+        self.assertEqual(store[-1], self.rows[-1])
+        self.assertEqual(list(store), self.rows)
+        self.assertIsInstance(store.column("Year of Birth"),
+                              columnar_store.IntColumn)
+        self.assertIsInstance(store.column("Count"),
+                              columnar_store.DictColumn)
+        with self.assertRaises(IndexError):
+            store[len(self.rows)]
+
+    def test_from_csv(self):
+        """ A CSV file reads back as csv.reader reads it """
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "names.csv")
+            with open(path, "w", newline="") as f:
+                csv.writer(f).writerows([HEADER] + self.rows)
+            store = ColumnarStore.from_csv(path)
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(store.header, HEADER)
+        self.assertEqual(store[:], self.rows)
+
+    def test_extend_in_order(self):
+        """ Stores appended to one another keep their rows in order """
+        for cut in range(len(self.rows) + 1):
+            with self.subTest(cut=cut):
+                store = ColumnarStore.from_rows(HEADER, self.rows[:cut])
+                store.extend(ColumnarStore.from_rows(HEADER,
+                                                     self.rows[cut:]))
+                self.assertEqual(store[:], self.rows)
+
+    def test_mismatched_rows_are_rejected(self):
+        """ Rows and stores of another shape fail """
+        store = ColumnarStore(HEADER)
+        with self.assertRaises(ValueError):
+            store.append(["2016", "FEMALE"])
+        with self.assertRaises(ValueError):
+            store.extend(ColumnarStore(HEADER[:2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
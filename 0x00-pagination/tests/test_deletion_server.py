@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+""" Deletion-resilient server tests
+"""
+import csv
+import gc
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import weakref
+from threading import Thread
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+Server = __import__('3-hypermedia_del_pagination').Server
+
+HEADER = ["Year of Birth", "Gender", "Ethnicity", "Child's First Name",
+          "Count", "Rank"]
+
+
+class TestDeletionServer(unittest.TestCase):
+    """ Every page follows the deletions and insertions """
+
+    def setUp(self):
+        """ Serve a small CSV file """
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, "names.csv")
+        self.rows = [["2016", ("FEMALE", "MALE")[i % 2], "ASIAN",
+                      "name{}".format(i), str(100 - i), str(i + 1)]
+                     for i in range(40)]
+        with open(path, "w", newline="") as f:
+            csv.writer(f).writerows([HEADER] + self.rows)
+        self.server = type("Server", (Server,), {"DATA_FILE": path})()
+
+    def tearDown(self):
+        """ Remove the CSV file """
+        if self.server is not None:
+            self.server.close()
+        shutil.rmtree(self.directory)
+
+    def change(self):
+        """ Delete some rows, insert others and return the live rows """
+        for index in (0, 3, 4, 5, 21):
+            self.assertTrue(self.server.delete(index))
+        self.assertFalse(self.server.delete(3))
+        added = [["2017", "FEMALE", "ASIAN", "new", "55", "9"],
+                 ["2017", "MALE", "ASIAN", "newer", "5", "10"]]
+        for row in added:
+            self.server.insert(row)
+        live = [row for index, row in enumerate(self.rows)
+                if index not in (0, 3, 4, 5, 21)]
+        return live + added
+
+    def test_get_page(self):
+        """ Offset pages hold the live rows """
+        live = self.change()
+        pages = [self.server.get_page(page, 4) for page in range(1, 12)]
+        self.assertEqual(sum(pages, []), live)
+        self.assertEqual(self.server.get_page(20, 4), [])
+
+    def test_filtered_sorted_page(self):
+        """ Filtered and sorted pages hold the live matching rows """
+        live = self.change()
+        expected = sorted((row for row in live if row[1] == "FEMALE"),
+                          key=lambda row: -int(row[4]))
+        found = [self.server.get_page(page, 3, {"Gender": "FEMALE"}, "-Count")
+                 for page in range(1, 10)]
+        self.assertEqual(sum(found, []), expected)
+
+    def test_get_hyper(self):
+        """ Hypermedia pages count the live rows """
+        live = self.change()
+        page = self.server.get_hyper(1, 10)
+        self.assertEqual(page["total_pages"], 4)
+        self.assertEqual(page["data"], live[:10])
+        female = [row for row in live if row[1] == "FEMALE"]
+        page = self.server.get_hyper(1, 5, {"Gender": "FEMALE"})
+        self.assertEqual(page["total_pages"], -(-len(female) // 5))
+
+    def test_iterators_and_export(self):
+        """ Rows, pages and exports skip deleted rows """
+        live = self.change()
+        self.assertEqual(list(self.server.iter_rows()), live)
+        self.assertEqual(sum(self.server.iter_pages(7), []), live)
+        output = io.StringIO()
+        self.assertEqual(self.server.export(output, "csv"), len(live))
+        self.assertEqual(list(csv.reader(io.StringIO(output.getvalue())))[1:],
+                         live)
+
+    def test_cached_pages_follow_changes(self):
+        """ Cached pages are served again until rows change """
+        page = self.server.get_page(1, 4)
+        self.assertIs(self.server.get_page(1, 4), page)
+        self.server.delete(0)
+        self.assertEqual(self.server.get_page(1, 4), self.rows[1:5])
+        self.server.insert(self.rows[0])
+        self.assertEqual(self.server.get_page(10, 4),
+                         self.rows[37:] + [self.rows[0]])
+
+    def test_dropped_server_is_collected(self):
+        """ The page caches do not keep their server alive """
+        self.server.get_page(1, 4)
+        self.server.dataset()
+        reference = weakref.ref(self.server)
+        self.server = None
+        gc.collect()
+        self.assertIsNone(reference())
+
+    def test_concurrent_changes(self):
+        """ Deletions from several threads are all applied """
+        def delete(start):
+            for index in range(start, 40, 4):
+                self.server.delete(index)
+        threads = [Thread(target=delete, args=(start,))
+                   for start in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.server.get_page(1, 10), [])
+        self.assertEqual(self.server.get_hyper_index(0, 10)["data"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+""" Cursor pagination tests
+"""
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+Server = __import__('2-hypermedia_pagination').Server
+cursor_token = __import__('cursor_token')
+
+HEADER = ["Year of Birth", "Gender", "Ethnicity", "Child's First Name",
+          "Count", "Rank"]
+
+
+class TestHyperCursor(unittest.TestCase):
+    """ Cursors walk the pages and refuse to be misused """
+
+    def setUp(self):
+        """ Serve a small CSV file """
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, "names.csv")
+        self.rows = [["2016", ("FEMALE", "MALE")[i % 2], "ASIAN",
+                      "name{}".format(i), str(i % 7), str(i + 1)]
+                     for i in range(30)]
+        with open(path, "w", newline="") as f:
+            csv.writer(f).writerows([HEADER] + self.rows)
+        self.server = type("Server", (Server,), {"DATA_FILE": path})()
+
+    def tearDown(self):
+        """ Remove the CSV file """
+        self.server.close()
+        shutil.rmtree(self.directory)
+
+    def walk(self, filters, sort):
+        """ Return the rows of every page, following next_cursor """
+        page = self.server.get_hyper_cursor(None, 4, filters, sort)
+        rows = page["data"]
+        while page["next_cursor"]:
+            page = self.server.get_hyper_cursor(page["next_cursor"], 4)
+            rows += page["data"]
+        return rows
+
+    def test_pages_follow_the_cursors(self):
+        """ Following the cursors returns every matching row once """
+        female = [row for row in self.rows if row[1] == "FEMALE"]
+        self.assertEqual(self.walk(None, None), self.rows)
+        self.assertEqual(
+            self.walk({"Gender": "FEMALE"}, "-Count"),
+            sorted(female, key=lambda row: (int(row[4]), int(row[5])),
+                   reverse=True))
+
+    def test_prev_cursor_returns_the_previous_page(self):
+        """ prev_cursor goes back to the page before """
+        first = self.server.get_hyper_cursor(None, 4, None, "Count")
+        second = self.server.get_hyper_cursor(first["next_cursor"], 4)
+        back = self.server.get_hyper_cursor(second["prev_cursor"], 4)
+        self.assertEqual(back["data"], first["data"])
+        self.assertIsNone(back["prev_cursor"])
+
+    def test_tampered_cursor_is_rejected(self):
+        """ A cursor whose payload or signature was edited fails """
+        cursor = self.server.get_hyper_cursor(None, 4)["next_cursor"]
+        data, signature = cursor.split(".")
+        forged = cursor_token.encode_cursor(
+            {"filters": None, "sort": None, "position": [20],
+             "before": False}, b"another secret")
+        for bad in (data + "." + signature[::-1],
+                    data[:-2] + "." + signature,
+                    forged.split(".")[0] + "." + signature,
+                    forged, "garbage"):
+            with self.subTest(cursor=bad):
+                with self.assertRaises(ValueError):
+                    self.server.get_hyper_cursor(bad, 4)
+
+    def test_expired_cursor_is_rejected(self):
+        """ A cursor older than CURSOR_MAX_AGE fails """
+        issued = time.time() - self.server.CURSOR_MAX_AGE - 1
+        with mock.patch.object(cursor_token.time, "time",
+                               return_value=issued):
+            cursor = self.server.get_hyper_cursor(None, 4)["next_cursor"]
+        with self.assertRaisesRegex(ValueError, "expired"):
+            self.server.get_hyper_cursor(cursor, 4)
+        self.server.CURSOR_MAX_AGE = None
+        self.assertEqual(self.server.get_hyper_cursor(cursor, 4)["data"],
+                         self.rows[4:8])
+
+    def test_cursor_with_other_query_is_rejected(self):
+        """ A cursor only serves the filters and sort it was issued for """
+        cursor = self.server.get_hyper_cursor(
+            None, 4, {"Gender": "MALE"}, "Count")["next_cursor"]
+        for filters, sort in (({"Gender": "FEMALE"}, None),
+                              ({}, None),
+                              (None, "-Count"),
+                              (None, "Rank")):
+            with self.subTest(filters=filters, sort=sort):
+                with self.assertRaisesRegex(ValueError, "match"):
+                    self.server.get_hyper_cursor(cursor, 4, filters, sort)
+        page = self.server.get_hyper_cursor(cursor, 4, {"Gender": "MALE"},
+                                            "Count")
+        self.assertEqual(page["data"],
+                         self.server.get_hyper_cursor(cursor, 4)["data"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+""" Parallel CSV loading tests
+"""
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+parallel_csv = __import__('parallel_csv')
+
+HEADER = ["Year of Birth", "Gender", "Ethnicity", "Child's First Name",
+          "Count", "Rank"]
+
+
+class TestParallelCsv(unittest.TestCase):
+    """ Chunks never cut a row, even inside a quoted field """
+
+    def setUp(self):
+        """ Write rows whose names hold quotes, commas and newlines """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "names.csv")
+        names = ["plain", "two\nlines", 'say "hi"', "a,b", "\n\n",
+                 '"\nquoted\n"', "crlf\r\ninside", ""]
+        self.rows = [["2016", ("FEMALE", "MALE")[i % 2], "ASIAN",
+                      "{}{}".format(names[i % len(names)], i),
+                      str(i), str(i % 5)]
+                     for i in range(120)]
+        with open(self.path, "w", newline="") as f:
+            csv.writer(f).writerows([HEADER] + self.rows)
+
+    def tearDown(self):
+        """ Remove the CSV file """
+        shutil.rmtree(self.directory)
+
+    def test_chunks_inside_quoted_newlines(self):
+        """ Every chunk size parses the same rows as csv.reader """
+        size = os.path.getsize(self.path)
+        for chunk_size in (1, 2, 5, 13, 64, size // 3, size):
+            with self.subTest(chunk_size=chunk_size):
+                store = parallel_csv.read_csv(self.path, 3, chunk_size)
+                self.assertEqual(store.header, HEADER)
+                self.assertEqual(store[:], self.rows)
+
+    def test_row_end_skips_quoted_newlines(self):
+        """ row_end only stops at a newline outside quotes """
+        data = b'1,"a\nb"\n2,c\n'
+        self.assertEqual(parallel_csv.row_end(data, 0, len(data), False), 8)
+        self.assertEqual(parallel_csv.row_end(data, 4, len(data), True), 8)
+        self.assertEqual(parallel_csv.row_end(data, 9, 10, False), 10)
+
+    def test_parallel_store(self):
+        """ ParallelStore loads the same rows as ColumnarStore """
+        store = parallel_csv.ParallelStore.from_csv(self.path)
+        self.assertIsInstance(store, parallel_csv.ParallelStore)
+        self.assertEqual(
+            store[:], parallel_csv.ColumnarStore.from_csv(self.path)[:])
+
+    def test_empty_files(self):
+        """ A header alone, or nothing, gives an empty store """
+        with open(self.path, "w", newline="") as f:
+            csv.writer(f).writerow(HEADER)
+        store = parallel_csv.read_csv(self.path, 2, 1)
+        self.assertEqual((store.header, len(store)), (HEADER, 0))
+        open(self.path, "w").close()
+        store = parallel_csv.read_csv(self.path, 2)
+        self.assertEqual((store.header, len(store)), ([], 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
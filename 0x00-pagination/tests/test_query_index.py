@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+""" Query index tests
+"""
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+QueryIndex = __import__('query_index').QueryIndex
+ColumnarStore = __import__('columnar_store').ColumnarStore
+
+HEADER = ["Year of Birth", "Gender", "Ethnicity", "Child's First Name",
+          "Count", "Rank"]
+FILTERS = ("Year of Birth", "Gender", "Ethnicity")
+SORTS = ("Count", "Rank")
+
+
+def expected(rows, filters, sort):
+    """ Return the ids of the matching rows sorted by a plain sort """
+    ids = [row_id for row_id, row in enumerate(rows)
+           if all(row[HEADER.index(name)] == value
+                  for name, value in filters.items())]
+    if sort is None:
+        return ids
+    column = HEADER.index(sort.lstrip("-"))
+    return sorted(ids, key=lambda row_id: (int(rows[row_id][column]), row_id),
+                  reverse=sort.startswith("-"))
+
+
+class TestQueryIndex(unittest.TestCase):
+    """ Filtered and sorted pages match a plain filter and sort """
+
+    def setUp(self):
+        """ Index random rows with many ties """
+        generator = random.Random(7)
+        self.rows = [[generator.choice(("2011", "2012", "2013")),
+                      generator.choice(("FEMALE", "MALE")),
+                      generator.choice(("ASIAN", "HISPANIC", "WHITE")),
+                      "name{}".format(i),
+                      str(generator.randint(5, 40)),
+                      str(generator.randint(1, 9))]
+                     for i in range(300)]
+        self.index = QueryIndex(ColumnarStore.from_rows(HEADER, self.rows),
+                                FILTERS, SORTS, chunk_size=64)
+
+    def test_pages_match_a_plain_sort(self):
+        """ Every page of every filter and sort is the plain slice """
+        cases = [{}, {"Gender": "MALE"}, {"Year of Birth": 2012},
+                 {"Gender": "FEMALE", "Ethnicity": "WHITE"},
+                 {"Year of Birth": "2011", "Gender": "MALE",
+                  "Ethnicity": "ASIAN"},
+                 {"Ethnicity": "BLACK"}]
+        for filters in cases:
+            for sort in (None, "Count", "-Count", "Rank", "-Rank"):
+                with self.subTest(filters=filters, sort=sort):
+                    wanted = expected(
+                        self.rows,
+                        {name: str(value) for name, value in filters.items()},
+                        sort)
+                    self.assertEqual(self.index.count(filters), len(wanted))
+                    for start in range(0, len(wanted) + 7, 7):
+                        self.assertEqual(
+                            self.index.page(start, start + 7, filters, sort),
+                            wanted[start:start + 7])
+
+    def test_seek_follows_positions(self):
+        """ Seeking from the position of a row returns the next rows """
+        filters = {"Gender": "FEMALE"}
+        for sort in (None, "Count", "-Count"):
+            with self.subTest(sort=sort):
+                wanted = expected(self.rows, filters, sort)
+                position = self.index.position(wanted[10], sort)
+                self.assertEqual(
+                    self.index.seek(position, 5, filters, sort),
+                    wanted[11:16])
+                self.assertEqual(
+                    self.index.seek(position, 5, filters, sort, True),
+                    wanted[5:10])
+
+    def test_unknown_columns_are_rejected(self):
+        """ Filters and sorts outside the indexed columns fail """
+        with self.assertRaises(AssertionError):
+            self.index.page(0, 10, {"Child's First Name": "name1"})
+        with self.assertRaises(AssertionError):
+            self.index.page(0, 10, None, "-Year of Birth")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,19 +11,54 @@ class BasicCache(BaseCaching):
     Inherited BaseCaching
     """
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """
         Put key and data
+        A basic cache never evicts: with max_bytes, items that would take
+        it over the limit are not cached.
         """
         if key is None or item is None:
             pass
         else:
-            self.cache_data[key] = item
+            size = self._size_of(key, item)
+            if key in self.cache_data:
+                self._drop(key)
+                self.updates += 1
+            else:
+                self.inserts += 1
+            if self.max_bytes is not None and \
+                    self.current_bytes + size > self.max_bytes:
+                return
+            self._store(key, item, size, ttl)
 
     def get(self, key):
         """
         Return value of key
         """
         if key is None or key not in self.cache_data.keys():
+            self.misses += 1
             return None
+        if self.expires and self._expire(key):
+            self.misses += 1
+            return None
+        self.hits += 1
         return self.cache_data.get(key)
+
+    def put_many(self, mapping, ttl=None):
+        """
+        Put several keys and data in one pass
+        """
+        if not self._plain(ttl):
+            return super().put_many(mapping, ttl)
+        data = self.cache_data
+        size = len(data)
+        items = {key: item for key, item in mapping.items()
+                 if key is not None and item is not None}
+        data.update(items)
+        self.inserts += len(data) - size
+        self.updates += len(items) - (len(data) - size)
+
+    def _unlink(self, key):
+        """
+        A basic cache keeps no order
+        """
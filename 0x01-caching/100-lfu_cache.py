@@ -1,5 +1,15 @@
 #!/usr/bin/env python3
 """ LFU Caching module
+
+Keys are grouped in buckets by access frequency. Each bucket is an
+OrderedDict kept in recency order, and the lowest non-empty frequency is
+tracked, so finding and discarding the victim is O(1). Ties between keys
+of the same frequency are broken by discarding the least recently used one.
+
+The lowest frequency is only ever lowered when a key is linked, or moved
+up with a key leaving its bucket. When its bucket empties any other way,
+by an expiry, an update or a restore, it is recomputed from the buckets
+before the next eviction.
 """
 
 from collections import defaultdict, OrderedDict
@@ -9,41 +19,120 @@ from base_caching import BaseCaching
 class LFUCache(BaseCaching):
     """ LFU Caching system """
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """ Initialize the LFU cache """
-        super().__init__()
-        self.frequency = defaultdict(int)
-        self.recency = OrderedDict()
+        super().__init__(*args, **kwargs)
+        self.frequency = {}
+        self.buckets = defaultdict(OrderedDict)
+        self.min_frequency = 0
+
+    def _link(self, key, freq):
+        """ Add a key at the most recent end of a frequency bucket
+        Args:
+            key: the key to add
+            freq: the access frequency of the key
+        """
+        self.frequency[key] = freq
+        self.buckets[freq][key] = None
+        if freq < self.min_frequency:
+            self.min_frequency = freq
+
+    def _unlink(self, key):
+        """ Remove a key from its frequency bucket
+        Args:
+            key: the key to remove
+        """
+        freq = self.frequency.pop(key)
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+
+    def _lowest_frequency(self):
+        """ Return the lowest frequency, recomputing it if its bucket
+        emptied since it was set
+        """
+        if self.min_frequency not in self.buckets:
+            self.min_frequency = min(self.buckets)
+        return self.min_frequency
+
+    def _pop_victim(self):
+        """ Remove the least recently used key of the lowest frequency
+        Returns:
+            The removed key
+        """
+        bucket = self.buckets[self._lowest_frequency()]
+        discard, _ = bucket.popitem(last=False)
+        if not bucket:
+            del self.buckets[self.min_frequency]
+        del self.frequency[discard]
+        return discard
+
+    def _peek_victim(self):
+        """ Return the least recently used key of the lowest frequency """
+        if not self.buckets:
+            return None
+        return next(iter(self.buckets[self._lowest_frequency()]))
+
+    def _snapshot_order(self):
+        """ Return the keys bucket by bucket, from the lowest frequency,
+        each bucket in recency order
+        """
+        for freq in sorted(self.buckets):
+            yield from self.buckets[freq]
 
-    def put(self, key, item):
+    def _snapshot_meta(self, key):
+        """ Return the frequency of a key, None for the keys put again at
+        their frequency
+        """
+        freq = self.frequency[key]
+        return freq if freq != 1 else None
+
+    def _restore_meta(self, key, meta):
+        """ Move a key to the bucket of its saved frequency """
+        self._unlink(key)
+        self._link(key, meta)
+
+    def _restore_state(self, state):
+        """ Recompute the lowest frequency once every key is restored """
+        self.min_frequency = min(self.buckets, default=0)
+
+    def _touch(self, key):
+        """ Move a key from its frequency bucket to the next one
+        Args:
+            key: the key that was just accessed
+        """
+        freq = self.frequency[key]
+        self._unlink(key)
+        if freq == self.min_frequency and freq not in self.buckets:
+            # The key was alone in the lowest bucket
+            self.min_frequency = freq + 1
+        self._link(key, freq + 1)
+
+    def put(self, key, item, ttl=None):
         """ Add an item in the cache
         Args:
             key: the key for the cache item
             item: the value for the cache item
+            ttl: the time-to-live of the item, the cache default if None
         """
         if key is None or item is None:
             return
-        
+
+        size = self._size_of(key, item)
+        freq = 0
         if key in self.cache_data:
-            self.cache_data[key] = item
-            self.frequency[key] += 1
-            self.recency.move_to_end(key)
+            freq = self.frequency[key]
+            self._discard(key)
+            self.updates += 1
         else:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-                lfu_keys = [k for k, v in self.frequency.items() if v == min(self.frequency.values())]
-                if len(lfu_keys) == 1:
-                    discard = lfu_keys[0]
-                else:
-                    discard = next(k for k in self.recency if k in lfu_keys)
-
-                del self.cache_data[discard]
-                del self.frequency[discard]
-                del self.recency[discard]
-                print(f"DISCARD: {discard}")
-
-            self.cache_data[key] = item
-            self.frequency[key] = 1
-            self.recency[key] = None
+            self.inserts += 1
+        if self._too_large(size):
+            return
+
+        self._make_room(size)
+        self._store(key, item, size, ttl)
+        self._link(key, freq + 1)
 
     def get(self, key):
         """ Get an item by key
@@ -53,8 +142,62 @@ class LFUCache(BaseCaching):
             The value of the key if it exists, otherwise None
         """
         if key is None or key not in self.cache_data:
+            self.misses += 1
+            return None
+        if self.expires and self._expire(key):
+            self.misses += 1
             return None
-        
-        self.frequency[key] += 1
-        self.recency.move_to_end(key)
+        self.hits += 1
+
+        self._touch(key)
         return self.cache_data[key]
+
+    def get_many(self, keys):
+        """ Get several items in one pass, same as calling get for each key
+        Return:
+            The list of the values, None for missing keys
+        """
+        if self.expires:
+            return super().get_many(keys)
+        data = self.cache_data
+        touch = self._touch
+        values = []
+        misses = 0
+        for key in keys:
+            if key in data:
+                touch(key)
+                values.append(data[key])
+            else:
+                values.append(None)
+                misses += 1
+        self.hits += len(values) - misses
+        self.misses += misses
+        return values
+
+    def put_many(self, mapping, ttl=None):
+        """ Add several items in one pass, same as calling put for each
+        """
+        if not self._plain(ttl):
+            return super().put_many(mapping, ttl)
+        data = self.cache_data
+        if self._bulk(mapping):
+            data.update(mapping)
+            self.frequency.update(dict.fromkeys(mapping, 1))
+            self.buckets[1].update(dict.fromkeys(mapping).items())
+            self.min_frequency = 1
+            self.inserts += len(mapping)
+            return
+        touch = self._touch
+        for key, item in mapping.items():
+            if key is None or item is None:
+                continue
+            if key in data:
+                self.updates += 1
+                data[key] = item
+                touch(key)
+                continue
+            self.inserts += 1
+            if len(data) >= self.max_items:
+                self._make_room()
+            data[key] = item
+            self._link(key, 1)
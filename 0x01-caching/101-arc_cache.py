@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+""" ARC Caching module
+
+Adaptive Replacement Cache: resident keys are split between T1, seen once
+recently, and T2, seen at least twice. Keys evicted from T1 and T2 are
+remembered without their items in the ghost lists B1 and B2. A miss that
+hits a ghost list moves the target size p of T1, so the cache adapts
+between recency and frequency. A one-time scan only churns T1 and leaves
+the frequently used keys of T2 in place.
+"""
+
+from collections import OrderedDict
+from base_caching import BaseCaching
+
+
+class ARCCache(BaseCaching):
+    """ ARC Caching system """
+
+    def __init__(self, *args, **kwargs):
+        """ Initialize the ARC cache """
+        super().__init__(*args, **kwargs)
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+        self.p = 0
+        self.ghost_of_t2 = False
+
+    def _capacity(self):
+        """ Return the number of keys ARC adapts to
+        The item limit when there is one, else the current number of items
+        """
+        if self.max_items is not None:
+            return self.max_items
+        return max(len(self.cache_data), 1)
+
+    def put(self, key, item, ttl=None):
+        """ Add an item in the cache
+        Args:
+            key: the key for the cache item
+            item: the value for the cache item
+            ttl: the time-to-live of the item, the cache default if None
+        """
+        if key is None or item is None:
+            return
+
+        size = self._size_of(key, item)
+        frequent = False
+        self.ghost_of_t2 = False
+        if key in self.cache_data:
+            self._discard(key)
+            self.updates += 1
+            frequent = True
+        else:
+            self.inserts += 1
+            if key in self.b1:
+                step = max(len(self.b2) // len(self.b1), 1)
+                self.p = min(self.p + step, self._capacity())
+                del self.b1[key]
+                frequent = True
+            elif key in self.b2:
+                step = max(len(self.b1) // len(self.b2), 1)
+                self.p = max(self.p - step, 0)
+                del self.b2[key]
+                frequent = True
+                self.ghost_of_t2 = True
+        if self._too_large(size):
+            return
+
+        self._make_room(size)
+        self._store(key, item, size, ttl)
+        if frequent:
+            self.t2[key] = None
+        else:
+            self.t1[key] = None
+        self._trim_ghosts()
+
+    def get(self, key):
+        """ Get an item by key
+        Args:
+            key: the key to retrieve from the cache
+        Returns:
+            The value of the key if it exists, otherwise None
+        """
+        if key is None or key not in self.cache_data:
+            self.misses += 1
+            return None
+        if self.expires and self._expire(key):
+            self.misses += 1
+            return None
+        self.hits += 1
+
+        if key in self.t1:
+            del self.t1[key]
+            self.t2[key] = None
+        else:
+            self.t2.move_to_end(key)
+        return self.cache_data[key]
+
+    def _trim_ghosts(self):
+        """ Bound T1 + B1 to the capacity and all four lists to twice it """
+        capacity = self._capacity()
+        while self.b1 and len(self.t1) + len(self.b1) > capacity:
+            self.b1.popitem(last=False)
+        while self.b2 and len(self.cache_data) + len(self.b1) + \
+                len(self.b2) > 2 * capacity:
+            self.b2.popitem(last=False)
+
+    def _pop_victim(self):
+        """ Move the least recently used key of T1 or T2 to its ghost list
+        Returns:
+            The evicted key
+        """
+        t1_size = len(self.t1)
+        if self.t1 and (t1_size > self.p or not self.t2 or
+                        (self.ghost_of_t2 and t1_size == self.p)):
+            discard, _ = self.t1.popitem(last=False)
+            self.b1[discard] = None
+        else:
+            discard, _ = self.t2.popitem(last=False)
+            self.b2[discard] = None
+        return discard
+
+    def _snapshot_order(self):
+        """ Return the keys of T1 then the keys of T2, in recency order """
+        yield from self.t1
+        yield from self.t2
+
+    def _snapshot_meta(self, key):
+        """ Return True for the keys of T2 """
+        return True if key in self.t2 else None
+
+    def _restore_meta(self, key, meta):
+        """ Move a key put again from T1 to T2 if it was there """
+        if key in self.t1:
+            del self.t1[key]
+            self.t2[key] = None
+
+    def _snapshot_state(self):
+        """ Return the target size of T1 and the ghost lists """
+        return {"p": self.p, "b1": list(self.b1), "b2": list(self.b2)}
+
+    def _restore_state(self, state):
+        """ Restore the target size of T1 and the ghost lists """
+        self.p = state["p"]
+        self.b1 = OrderedDict.fromkeys(state["b1"])
+        self.b2 = OrderedDict.fromkeys(state["b2"])
+
+    def _unlink(self, key):
+        """ Remove a key from T1 or T2 without remembering it """
+        if key in self.t1:
+            del self.t1[key]
+        else:
+            del self.t2[key]
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+""" Compact LRU Caching module
+
+CompactLRUCache is an LRUCache whose cache_data is a CompactOrderedDict
+instead of an OrderedDict. Entries live in preallocated parallel arrays
+indexed by slot: keys, items, hashes, and the prev/next slot links of the
+recency list. Keys are found through an open addressing index table of
+slot numbers, so no Python object is allocated per entry. This costs about
+40 bytes per entry where an OrderedDict costs about 90, at the price of
+slower operations since probing runs in Python.
+"""
+
+from array import array
+from collections.abc import MutableMapping
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+_NIL = -1
+_GOLDEN = 0x9E3779B97F4A7C15
+_WORD = 0xFFFFFFFFFFFFFFFF
+
+
+class CompactOrderedDict(MutableMapping):
+    """ Insertion ordered mapping stored in parallel arrays
+    Supports the subset of the OrderedDict API used by the caches:
+    move_to_end and iteration from the oldest to the newest key.
+    """
+
+    def __init__(self, capacity=8):
+        """ Initialize the mapping
+        Args:
+            capacity: the number of preallocated slots, the arrays grow
+                when more keys are added
+        """
+        self._allocate(max(capacity, 1))
+
+    def _allocate(self, capacity):
+        """ Create empty arrays for a number of slots """
+        size = 2
+        bits = 1
+        while size < 2 * capacity:
+            size *= 2
+            bits += 1
+        self._mask = size - 1
+        self._shift = 64 - bits
+        self._table = array('i', [_NIL]) * size
+        self._keys = [None] * capacity
+        self._items = [None] * capacity
+        self._hashes = array('q', [0]) * capacity
+        self._prev = array('i', [_NIL]) * capacity
+        self._next = array('i', range(1, capacity + 1))
+        self._next[capacity - 1] = _NIL
+        self._free = 0
+        self._head = _NIL
+        self._tail = _NIL
+        self._count = 0
+
+    def _grow(self):
+        """ Double the number of slots, keeping the order """
+        entries = list(self.items())
+        self._allocate(2 * len(self._keys))
+        for key, item in entries:
+            self[key] = item
+
+    def _home(self, hashed):
+        """ Return the table position where a hash starts probing
+        Fibonacci hashing spreads consecutive hashes, such as the ones of
+        consecutive int keys, so that probe clusters stay short.
+        """
+        return ((hashed * _GOLDEN) & _WORD) >> self._shift
+
+    def _lookup(self, key):
+        """ Return the table position and the slot of a key
+        The slot is _NIL when the key is missing, and the position is
+        then the empty one where it would be inserted.
+        """
+        hashed = hash(key)
+        table = self._table
+        mask = self._mask
+        position = self._home(hashed)
+        slot = table[position]
+        while slot != _NIL:
+            if self._hashes[slot] == hashed:
+                found = self._keys[slot]
+                if found is key or found == key:
+                    return position, slot
+            position = (position + 1) & mask
+            slot = table[position]
+        return position, _NIL
+
+    def _unlink(self, slot):
+        """ Remove a slot from the recency list """
+        prev = self._prev[slot]
+        following = self._next[slot]
+        if prev == _NIL:
+            self._head = following
+        else:
+            self._next[prev] = following
+        if following == _NIL:
+            self._tail = prev
+        else:
+            self._prev[following] = prev
+
+    def _append(self, slot):
+        """ Add a slot at the newest end of the recency list """
+        self._prev[slot] = self._tail
+        self._next[slot] = _NIL
+        if self._tail == _NIL:
+            self._head = slot
+        else:
+            self._next[self._tail] = slot
+        self._tail = slot
+
+    def _remove_position(self, position):
+        """ Empty a table position, shifting back the following entries
+        of the probe sequence so that lookups never stop early
+        """
+        table = self._table
+        mask = self._mask
+        hashes = self._hashes
+        hole = position
+        position = (position + 1) & mask
+        slot = table[position]
+        while slot != _NIL:
+            home = self._home(hashes[slot])
+            if (position - home) & mask >= (position - hole) & mask:
+                table[hole] = slot
+                hole = position
+            position = (position + 1) & mask
+            slot = table[position]
+        table[hole] = _NIL
+
+    def __getitem__(self, key):
+        """ Return the item of a key """
+        slot = self._lookup(key)[1]
+        if slot == _NIL:
+            raise KeyError(key)
+        return self._items[slot]
+
+    def __setitem__(self, key, item):
+        """ Set the item of a key, adding it at the newest end if new """
+        position, slot = self._lookup(key)
+        if slot != _NIL:
+            self._items[slot] = item
+            return
+        if self._free == _NIL:
+            self._grow()
+            self[key] = item
+            return
+        slot = self._free
+        self._free = self._next[slot]
+        self._table[position] = slot
+        self._keys[slot] = key
+        self._items[slot] = item
+        self._hashes[slot] = hash(key)
+        self._append(slot)
+        self._count += 1
+
+    def __delitem__(self, key):
+        """ Remove a key """
+        position, slot = self._lookup(key)
+        if slot == _NIL:
+            raise KeyError(key)
+        self._remove_position(position)
+        self._unlink(slot)
+        self._keys[slot] = None
+        self._items[slot] = None
+        self._next[slot] = self._free
+        self._free = slot
+        self._count -= 1
+
+    def __contains__(self, key):
+        """ Tell whether a key is present """
+        return self._lookup(key)[1] != _NIL
+
+    def __iter__(self):
+        """ Iterate over the keys from the oldest to the newest """
+        slot = self._head
+        while slot != _NIL:
+            following = self._next[slot]
+            yield self._keys[slot]
+            slot = following
+
+    def __len__(self):
+        """ Return the number of keys """
+        return self._count
+
+    def pop(self, key, *default):
+        """ Remove a key and return its item """
+        slot = self._lookup(key)[1]
+        if slot == _NIL:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        item = self._items[slot]
+        del self[key]
+        return item
+
+    def clear(self):
+        """ Remove every key, keeping the allocated slots """
+        self._allocate(len(self._keys))
+
+    def move_to_end(self, key, last=True):
+        """ Move a key to the newest end, or the oldest if last is False """
+        slot = self._lookup(key)[1]
+        if slot == _NIL:
+            raise KeyError(key)
+        self._unlink(slot)
+        if last:
+            self._append(slot)
+        else:
+            self._prev[slot] = _NIL
+            self._next[slot] = self._head
+            if self._head == _NIL:
+                self._tail = slot
+            else:
+                self._prev[self._head] = slot
+            self._head = slot
+
+    def __repr__(self):
+        """ Return the representation of the mapping """
+        return "{}({!r})".format(type(self).__name__, list(self.items()))
+
+
+class CompactLRUCache(LRUCache):
+    """ LRU Caching system stored in a CompactOrderedDict """
+
+    def __init__(self, *args, **kwargs):
+        """ Initialize the compact LRU cache
+        The slots are preallocated for max_items entries
+        """
+        super().__init__(*args, **kwargs)
+        self.cache_data = CompactOrderedDict(self.max_items or 8)
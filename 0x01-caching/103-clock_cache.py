@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+""" CLOCK Caching module
+
+ClockCache approximates LRU with the CLOCK algorithm. Keys sit in a ring
+in insertion order and a hit only adds its key to the set of referenced
+keys; nothing is reordered. On eviction the hand walks the ring from the
+oldest key, giving every referenced key a second chance by clearing its
+bit and moving it behind the hand, and evicts the first key without one.
+
+A get without a ttl is a dict lookup and a set add, both atomic under the
+GIL, so readers need no lock even while a writer holding a lock puts and
+evicts. The hit and miss counters may then lose some increments.
+"""
+
+from collections import OrderedDict
+from base_caching import BaseCaching
+
+
+class ClockCache(BaseCaching):
+    """ CLOCK Caching system """
+
+    def __init__(self, *args, **kwargs):
+        """ Initialize the CLOCK cache """
+        super().__init__(*args, **kwargs)
+        self.ring = OrderedDict()
+        self.referenced = set()
+
+    def put(self, key, item, ttl=None):
+        """ Add an item in the cache
+        Args:
+            key: the key for the cache item
+            item: the value for the cache item
+            ttl: the time-to-live of the item, the cache default if None
+        """
+        if key is None or item is None:
+            return
+
+        size = self._size_of(key, item)
+        updated = key in self.cache_data
+        if updated:
+            self._discard(key)
+            self.updates += 1
+        else:
+            self.inserts += 1
+        if self._too_large(size):
+            return
+
+        self._make_room(size)
+        self._store(key, item, size, ttl)
+        self.ring[key] = None
+        if updated:
+            self.referenced.add(key)
+
+    def get(self, key):
+        """ Get an item by key, only marking it as referenced
+        Args:
+            key: the key to retrieve from the cache
+        Returns:
+            The value of the key if it exists, otherwise None
+        """
+        item = self.cache_data.get(key) if key is not None else None
+        if item is None:
+            self.misses += 1
+            return None
+        if self.expires and self._expire(key):
+            self.misses += 1
+            return None
+        self.hits += 1
+
+        self.referenced.add(key)
+        return item
+
+    def _pop_victim(self):
+        """ Return the first key past the hand that was not referenced """
+        ring = self.ring
+        referenced = self.referenced
+        # Lock-free readers may mark keys evicted meanwhile, drop them
+        if len(referenced) > len(ring) + 64:
+            referenced.intersection_update(ring)
+        while True:
+            key = next(iter(ring))
+            if key not in referenced:
+                del ring[key]
+                return key
+            referenced.discard(key)
+            ring.move_to_end(key)
+
+    def _snapshot_order(self):
+        """ Return the keys of the ring from the hand """
+        return iter(self.ring)
+
+    def _snapshot_meta(self, key):
+        """ Return True for the referenced keys """
+        return True if key in self.referenced else None
+
+    def _restore_meta(self, key, meta):
+        """ Mark a key as referenced """
+        self.referenced.add(key)
+
+    def _peek_victim(self):
+        """ Return the key the hand would evict, without clearing bits """
+        for key in self.ring:
+            if key not in self.referenced:
+                return key
+        return next(iter(self.ring), None)
+
+    def _unlink(self, key):
+        """ Remove a key from the ring """
+        del self.ring[key]
+        self.referenced.discard(key)
@@ -6,53 +6,121 @@ It inherits from the BaseCaching class and provides a caching mechanism that dis
 recently added item when the cache reaches its maximum capacity.
 """
 
+from collections import OrderedDict
 from base_caching import BaseCaching
 
 
 class LIFOCache(BaseCaching):
     """ LIFO Caching system
 
-    This class provides a caching system that follows the Last In, First Out (LIFO) algorithm. 
-    When the cache exceeds the maximum number of items allowed, the most recently added item 
-    is discarded. It uses an internal list to keep track of the order in which items were added.
+    This class provides a caching system that follows the Last In, First Out
+    (LIFO) algorithm. When the cache exceeds the maximum number of items
+    allowed, the most recently added item is discarded. It uses an internal
+    OrderedDict to keep track of the order in which items were added, so
+    reinserting and discarding a key are both O(1).
     """
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """ Initialize the LIFO cache
 
-        Sets up the cache and initializes an empty list to keep track of the order of items.
-        Calls the parent class's initializer to set up the cache_data dictionary.
+        Sets up the cache and initializes an empty OrderedDict to keep track of
+        the order of items. Calls the parent class's initializer to set up the
+        cache_data dictionary.
         """
-        super().__init__()
-        self.order = []
+        super().__init__(*args, **kwargs)
+        self.order = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """ Add an item to the cache
 
         Args:
             key: The key for the cache item.
             item: The value for the cache item.
+            ttl: The time-to-live of the item, the cache default if None.
 
-        This method adds an item to the cache. If the cache exceeds the maximum number of items 
-        allowed (BaseCaching.MAX_ITEMS), the most recently added item is discarded according to 
-        the LIFO principle. If the item already exists, its value is updated and the key is moved 
-        to the end of the order list.
+        This method adds an item to the cache. While the cache would exceed the
+        maximum number of items or bytes allowed (max_items, max_bytes), the
+        most recently added item is discarded according to the LIFO principle.
+        Items larger than max_bytes are not cached. If the item already exists,
+        its value is updated and the key is moved to the end of the order.
         """
         if key is None or item is None:
             return
-        
+
+        size = self._size_of(key, item)
         if key in self.cache_data:
-            self.cache_data[key] = item
-            self.order.remove(key)
+            self._discard(key)
+            self.updates += 1
         else:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-                discard = self.order.pop()
-                del self.cache_data[discard]
-                print(f"DISCARD: {discard}")
+            self.inserts += 1
+        if self._too_large(size):
+            return
 
-            self.cache_data[key] = item
+        self._make_room(size)
+        self._store(key, item, size, ttl)
+        self.order[key] = None
 
-        self.order.append(key)
+    def get_many(self, keys):
+        """ Get several items in one pass, same as calling get for each key
+        Return:
+            The list of the values, None for missing keys
+        """
+        if self.expires:
+            return super().get_many(keys)
+        data = self.cache_data
+        values = []
+        misses = 0
+        for key in keys:
+            if key in data:
+                values.append(data[key])
+            else:
+                values.append(None)
+                misses += 1
+        self.hits += len(values) - misses
+        self.misses += misses
+        return values
+
+    def put_many(self, mapping, ttl=None):
+        """ Add several items in one pass, same as calling put for each
+        """
+        if not self._plain(ttl):
+            return super().put_many(mapping, ttl)
+        data = self.cache_data
+        order = self.order
+        if self._bulk(mapping):
+            data.update(mapping)
+            order.update(dict.fromkeys(mapping).items())
+            self.inserts += len(mapping)
+            return
+        for key, item in mapping.items():
+            if key is None or item is None:
+                continue
+            if key in data:
+                self.updates += 1
+                data[key] = item
+                order.move_to_end(key)
+                continue
+            self.inserts += 1
+            if len(data) >= self.max_items:
+                self._make_room()
+            data[key] = item
+            order[key] = None
+
+    def _pop_victim(self):
+        """ Remove the last added key from the order and return it """
+        return self.order.popitem(last=True)[0]
+
+    def _peek_victim(self):
+        """ Return the last added key """
+        return next(reversed(self.order), None)
+
+    def _snapshot_order(self):
+        """ Return the keys from the first added to the last added """
+        return iter(self.order)
+
+    def _unlink(self, key):
+        """ Remove a key from the order """
+        del self.order[key]
 
     def get(self, key):
         """ Retrieve an item from the cache
@@ -67,6 +135,11 @@ class LIFOCache(BaseCaching):
         exist or is None, it returns None.
         """
         if key is None or key not in self.cache_data:
+            self.misses += 1
+            return None
+        if self.expires and self._expire(key):
+            self.misses += 1
             return None
+        self.hits += 1
         
         return self.cache_data[key]
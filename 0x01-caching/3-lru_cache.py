@@ -9,28 +9,32 @@ from base_caching import BaseCaching
 class LRUCache(BaseCaching):
     """ LRU Caching system """
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """ Initialize the LRU cache """
-        super().__init__()
+        super().__init__(*args, **kwargs)
         self.cache_data = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """ Add an item in the cache
         Args:
             key: the key for the cache item
             item: the value for the cache item
+            ttl: the time-to-live of the item, the cache default if None
         """
         if key is None or item is None:
             return
 
+        size = self._size_of(key, item)
         if key in self.cache_data:
-            self.cache_data.move_to_end(key)
-        self.cache_data[key] = item
+            self._discard(key)
+            self.updates += 1
+        else:
+            self.inserts += 1
+        if self._too_large(size):
+            return
 
-        if len(self.cache_data) > BaseCaching.MAX_ITEMS:
-            discard = next(iter(self.cache_data))
-            self.cache_data.pop(discard)
-            print(f"DISCARD: {discard}")
+        self._make_room(size)
+        self._store(key, item, size, ttl)
 
     def get(self, key):
         """ Get an item by key
@@ -40,7 +44,69 @@ class LRUCache(BaseCaching):
             The value of the key if it exists, otherwise None
         """
         if key is None or key not in self.cache_data:
+            self.misses += 1
+            return None
+        if self.expires and self._expire(key):
+            self.misses += 1
             return None
+        self.hits += 1
 
         self.cache_data.move_to_end(key)
         return self.cache_data[key]
+
+    def get_many(self, keys):
+        """ Get several items in one pass, same as calling get for each key
+        Return:
+            The list of the values, None for missing keys
+        """
+        if self.expires:
+            return super().get_many(keys)
+        data = self.cache_data
+        move = data.move_to_end
+        values = []
+        misses = 0
+        for key in keys:
+            if key in data:
+                move(key)
+                values.append(data[key])
+            else:
+                values.append(None)
+                misses += 1
+        self.hits += len(values) - misses
+        self.misses += misses
+        return values
+
+    def put_many(self, mapping, ttl=None):
+        """ Add several items in one pass, same as calling put for each
+        """
+        if not self._plain(ttl):
+            return super().put_many(mapping, ttl)
+        data = self.cache_data
+        if self._bulk(mapping):
+            data.update(mapping.items())
+            self.inserts += len(mapping)
+            return
+        move = data.move_to_end
+        for key, item in mapping.items():
+            if key is None or item is None:
+                continue
+            if key in data:
+                self.updates += 1
+                data[key] = item
+                move(key)
+                continue
+            self.inserts += 1
+            if len(data) >= self.max_items:
+                self._make_room()
+            data[key] = item
+
+    def _pop_victim(self):
+        """ Return the least recently used key """
+        return next(iter(self.cache_data))
+
+    def _peek_victim(self):
+        """ Return the least recently used key """
+        return next(iter(self.cache_data), None)
+
+    def _unlink(self, key):
+        """ The order is kept by cache_data itself """
@@ -9,35 +9,102 @@ from base_caching import BaseCaching
 class MRUCache(BaseCaching):
     """ MRU Caching implemenmtation. """
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """ Initializing the MRU cache. """
-        super().__init__()
+        super().__init__(*args, **kwargs)
         self.recency = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """ Add an item in the cache. """
         if key is None or item is None:
             return
-        
+
+        size = self._size_of(key, item)
         if key in self.cache_data:
-            self.cache_data[key] = item
-            self.recency.move_to_end(key)
+            self._discard(key)
+            self.updates += 1
         else:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-                """Discard the most recently used item""" 
-                discard = next(reversed(self.recency))
-                del self.cache_data[discard]
-                self.recency.pop(discard)
-                print(f"DISCARD: {discard}")
+            self.inserts += 1
+        if self._too_large(size):
+            return
 
-            self.cache_data[key] = item
-            self.recency[key] = None
+        self._make_room(size)
+        self._store(key, item, size, ttl)
+        self.recency[key] = None
 
     def get(self, key):
         """ Get an item by key. """
         if key is None or key not in self.cache_data:
+            self.misses += 1
             return None
+        if self.expires and self._expire(key):
+            self.misses += 1
+            return None
+        self.hits += 1
         
         self.recency.move_to_end(key)
         return self.cache_data[key]
 
+    def get_many(self, keys):
+        """ Get several items in one pass, same as calling get for each key
+        Return:
+            The list of the values, None for missing keys
+        """
+        if self.expires:
+            return super().get_many(keys)
+        data = self.cache_data
+        move = self.recency.move_to_end
+        values = []
+        misses = 0
+        for key in keys:
+            if key in data:
+                move(key)
+                values.append(data[key])
+            else:
+                values.append(None)
+                misses += 1
+        self.hits += len(values) - misses
+        self.misses += misses
+        return values
+
+    def put_many(self, mapping, ttl=None):
+        """ Add several items in one pass, same as calling put for each
+        """
+        if not self._plain(ttl):
+            return super().put_many(mapping, ttl)
+        data = self.cache_data
+        recency = self.recency
+        if self._bulk(mapping):
+            data.update(mapping)
+            recency.update(dict.fromkeys(mapping).items())
+            self.inserts += len(mapping)
+            return
+        for key, item in mapping.items():
+            if key is None or item is None:
+                continue
+            if key in data:
+                self.updates += 1
+                data[key] = item
+                recency.move_to_end(key)
+                continue
+            self.inserts += 1
+            if len(data) >= self.max_items:
+                self._make_room()
+            data[key] = item
+            recency[key] = None
+
+    def _pop_victim(self):
+        """ Remove the most recently used key and return it. """
+        return self.recency.popitem(last=True)[0]
+
+    def _peek_victim(self):
+        """ Return the most recently used key. """
+        return next(reversed(self.recency), None)
+
+    def _snapshot_order(self):
+        """ Return the keys from the least to the most recently used. """
+        return iter(self.recency)
+
+    def _unlink(self, key):
+        """ Remove a key from the recency order. """
+        del self.recency[key]
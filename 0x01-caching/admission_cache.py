@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+""" Admission caching module
+
+AdmissionCache puts a TinyLFU admission filter in front of any BaseCaching
+policy. Every get records its key in a CountMinSketch. When a new key
+would evict an entry, it is only admitted if the sketch estimates it was
+requested more often than the victim the policy would pick, so keys seen
+once do not push out popular ones. The policy must tell its victim in
+advance through _peek_victim: those that cannot, like BasicCache and
+ARCCache, are rejected, since the filter would admit every key.
+
+The sketch keeps `depth` rows of one byte saturating counters and
+estimates a frequency as the minimum of the counters of a key. After a
+number of recorded accesses, every counter is halved so that old
+popularity fades.
+"""
+
+BaseCaching = __import__('base_caching').BaseCaching
+LRUCache = __import__('3-lru_cache').LRUCache
+
+_WORD = 0xFFFFFFFFFFFFFFFF
+_SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9,
+          0xD6E8FEB86659FD93)
+_HALF = bytes(count >> 1 for count in range(256))
+
+
+class CountMinSketch():
+    """ Approximate frequencies of keys in constant memory """
+
+    def __init__(self, width=1024, depth=4, sample=None, maximum=15):
+        """ Initialize the sketch
+        Args:
+            width: the number of counters per row, rounded up to a power
+                of two
+            depth: the number of rows, at most 4
+            sample: the number of recorded accesses after which the
+                counters are halved, 10 * width by default
+            maximum: the value at which counters saturate, below 256
+        """
+        bits = 1
+        while (1 << bits) < width:
+            bits += 1
+        self.width = 1 << bits
+        self.shift = 64 - bits
+        self.seeds = _SEEDS[:depth]
+        self.table = bytearray(self.width * len(self.seeds))
+        self.sample = sample or 10 * self.width
+        self.maximum = maximum
+        self.additions = 0
+
+    def _indexes(self, key):
+        """ Return the position of the counter of a key in every row """
+        hashed = hash(key)
+        return [row * self.width + (((hashed * seed) & _WORD) >> self.shift)
+                for row, seed in enumerate(self.seeds)]
+
+    def add(self, key):
+        """ Record an access to a key """
+        table = self.table
+        for index in self._indexes(key):
+            if table[index] < self.maximum:
+                table[index] += 1
+        self.additions += 1
+        if self.additions >= self.sample:
+            self.age()
+
+    def estimate(self, key):
+        """ Return the estimated number of recent accesses to a key """
+        table = self.table
+        return min(table[index] for index in self._indexes(key))
+
+    def age(self):
+        """ Halve every counter """
+        self.table = self.table.translate(_HALF)
+        self.additions //= 2
+
+    def memory(self):
+        """ Return the number of bytes of the counters """
+        return len(self.table)
+
+
+class AdmissionCache():
+    """ TinyLFU admission filter in front of a cache policy """
+
+    def __init__(self, policy=LRUCache, width=None, **kwargs):
+        """ Initialize the cache
+        Args:
+            policy: the BaseCaching subclass storing the items
+            width: the number of counters per row of the sketch, the
+                item limit of the policy by default
+            kwargs: the limits passed to the policy
+        """
+        if policy._peek_victim is BaseCaching._peek_victim:
+            raise ValueError("{} cannot tell its victim in advance".format(
+                policy.__name__))
+        self.cache = policy(**kwargs)
+        self.sketch = CountMinSketch(width or self.cache.max_items or 1024)
+        self.rejections = 0
+
+    def _admit(self, key, item):
+        """ Tell whether a new key may evict the victim of the policy """
+        cache = self.cache
+        if key in cache.cache_data or \
+                not cache._is_full(cache._size_of(key, item)):
+            return True
+        victim = cache._peek_victim()
+        if victim is None:
+            return True
+        return self.sketch.estimate(key) > self.sketch.estimate(victim)
+
+    def put(self, key, item, ttl=None):
+        """ Add an item in the cache if it is admitted
+        Args:
+            key: the key for the cache item
+            item: the value for the cache item
+            ttl: the time-to-live of the item, the cache default if None
+        """
+        if key is None or item is None:
+            return
+        if not self._admit(key, item):
+            self.rejections += 1
+            return
+        self.cache.put(key, item, ttl)
+
+    def get(self, key):
+        """ Get an item by key, recording the access in the sketch
+        Args:
+            key: the key to retrieve from the cache
+        Returns:
+            The value of the key if it exists, otherwise None
+        """
+        if key is not None:
+            self.sketch.add(key)
+        return self.cache.get(key)
+
+    def get_many(self, keys):
+        """ Get several items
+        Return:
+            The list of the values, None for missing keys
+        """
+        return [self.get(key) for key in keys]
+
+    def put_many(self, mapping, ttl=None):
+        """ Add several items, each one if it is admitted
+        """
+        for key, item in mapping.items():
+            self.put(key, item, ttl)
+
+    def add_listener(self, listener):
+        """ Call listener(key, item) on every eviction """
+        self.cache.add_listener(listener)
+
+    def remove_listener(self, listener):
+        """ Stop calling a listener on evictions """
+        self.cache.remove_listener(listener)
+
+    @property
+    def cache_data(self):
+        """ Return the items of the policy """
+        return self.cache.cache_data
+
+    def stats(self):
+        """ Return the counters of the policy, the rejected puts and the
+        size of the sketch
+        """
+        snapshot = self.cache.stats()
+        snapshot["rejections"] = self.rejections
+        snapshot["sketch_bytes"] = self.sketch.memory()
+        return snapshot
+
+    def print_cache(self):
+        """ Print the cache """
+        self.cache.print_cache()
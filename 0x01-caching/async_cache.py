@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+""" Asyncio caching module
+
+AsyncCache puts an asyncio facade over any BaseCaching policy:
+`await cache.get_or_load(key, loader)` returns the cached value of a key,
+or awaits loader(key) on a miss and caches its result. Coroutines missing
+the same key at the same time share one load instead of each calling the
+backend.
+
+With a ttl, a value is fresh for ttl seconds. With stale seconds on top
+of it, an expired value is still served during that window while a
+single background load refreshes it, so a burst of requests never waits
+on a slow backend. Values older than ttl + stale are dropped by the
+policy and loaded again in the foreground.
+"""
+
+import asyncio
+import inspect
+import time
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+class AsyncCache():
+    """ Asyncio facade with single-flight loading over a cache policy """
+
+    def __init__(self, policy=LRUCache, ttl=None, stale=0, **kwargs):
+        """ Initialize the cache
+        Args:
+            policy: the BaseCaching subclass storing the values
+            ttl: the number of seconds a value stays fresh, forever if None
+            stale: the number of seconds an expired value is still served
+                while it is refreshed in the background
+            kwargs: the limits passed to the policy
+        """
+        self.ttl = ttl
+        self.stale = stale
+        self.cache = policy(
+            ttl=None if ttl is None else ttl + stale, **kwargs)
+        self.loading = {}
+        self.loads = 0
+        self.joined = 0
+        self.stale_hits = 0
+        self.refresh_errors = 0
+
+    def get(self, key):
+        """ Get a cached value by key, without loading it
+        Args:
+            key: the key to retrieve from the cache
+        Returns:
+            The value of the key if it is cached, otherwise None
+        """
+        entry = self.cache.get(key)
+        return None if entry is None else entry[0]
+
+    def put(self, key, value):
+        """ Cache a value
+        Args:
+            key: the key for the cache item
+            value: the value, None included
+        """
+        self.cache.put(key, (value, time.monotonic()))
+
+    async def _load(self, key, loader):
+        """ Call the loader and cache its result """
+        try:
+            value = loader(key)
+            if inspect.isawaitable(value):
+                value = await value
+            self.loads += 1
+            self.put(key, value)
+            return value
+        finally:
+            del self.loading[key]
+
+    def _start(self, key, loader):
+        """ Return the task loading a key, starting it if needed """
+        task = self.loading.get(key)
+        if task is None:
+            task = self.loading[key] = asyncio.ensure_future(
+                self._load(key, loader))
+        else:
+            self.joined += 1
+        return task
+
+    def _refreshed(self, task):
+        """ Collect the outcome of a background refresh
+        A failed refresh keeps the stale value until it is dropped.
+        """
+        if not task.cancelled() and task.exception() is not None:
+            self.refresh_errors += 1
+
+    async def get_or_load(self, key, loader):
+        """ Get the value of a key, loading it on a miss
+        Args:
+            key: the key to retrieve
+            loader: callable returning the value of a key, or an awaitable
+                of it, called as loader(key)
+        Returns:
+            The cached or loaded value. Errors of a foreground load are
+            raised to every coroutine waiting on it and nothing is cached.
+        """
+        entry = self.cache.get(key)
+        if entry is not None:
+            value, loaded = entry
+            if self.ttl is None or time.monotonic() - loaded < self.ttl:
+                return value
+            self.stale_hits += 1
+            if key not in self.loading:
+                self._start(key, loader).add_done_callback(self._refreshed)
+            return value
+        # Shielded so that a cancelled waiter does not cancel the others
+        return await asyncio.shield(self._start(key, loader))
+
+    def stats(self):
+        """ Return the counters of the policy and of the loads """
+        snapshot = self.cache.stats()
+        snapshot["loads"] = self.loads
+        snapshot["joined"] = self.joined
+        snapshot["stale_hits"] = self.stale_hits
+        snapshot["refresh_errors"] = self.refresh_errors
+        return snapshot
+
+    def print_cache(self):
+        """ Print the cache
+        """
+        cache_data = self.cache.cache_data
+        print("Current cache:")
+        for key in sorted(cache_data.keys()):
+            print("{}: {}".format(key, cache_data.get(key)[0]))
@@ -1,18 +1,69 @@
 #!/usr/bin/python3
 """ BaseCaching module
 """
+import heapq
+import sys
+from threading import Event, Thread
+from time import monotonic
+
+
+def default_sizer(key, item):
+    """ Estimate the number of bytes used by a cache entry
+    """
+    return sys.getsizeof(key) + sys.getsizeof(item)
+
+
+def print_discard(key, item):
+    """ Eviction listener printing the discarded key
+    """
+    print(f"DISCARD: {key}")
+
 
 class BaseCaching():
     """ BaseCaching defines:
       - constants of your caching system
       - where your data are stored (in a dictionary)
+      - the limits of each cache: a maximum number of items, a maximum
+        number of bytes, or both. Whichever limit is hit first triggers
+        an eviction.
+      - the time-to-live of entries: expired entries are dropped lazily
+        by get, and incrementally by reap or a background reaper
+      - the counters reported by stats, and the listeners called with
+        (key, item) on every eviction
     """
     MAX_ITEMS = 4
 
-    def __init__(self):
+    def __init__(self, max_items=None, max_bytes=None, sizer=None,
+                 ttl=None):
         """ Initiliaze
+        Args:
+            max_items: maximum number of items, MAX_ITEMS by default.
+                Unlimited when only max_bytes is given.
+            max_bytes: maximum number of bytes, unlimited by default
+            sizer: callable(key, item) returning the size of an entry
+                in bytes, default_sizer by default
+            ttl: default time-to-live of entries in seconds, entries
+                never expire by default
         """
+        if max_items is None and max_bytes is None:
+            max_items = self.MAX_ITEMS
         self.cache_data = {}
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizer = sizer or default_sizer
+        self.sizes = {}
+        self.current_bytes = 0
+        self.ttl = ttl
+        self.expires = {}
+        self.expiry_heap = []
+        self.reaper = None
+        self.listeners = []
+        self.hits = 0
+        self.misses = 0
+        self.inserts = 0
+        self.updates = 0
+        self.evictions = 0
+        self.expirations = 0
 
     def print_cache(self):
         """ Print the cache
@@ -21,7 +72,41 @@ class BaseCaching():
         for key in sorted(self.cache_data.keys()):
             print("{}: {}".format(key, self.cache_data.get(key)))
 
-    def put(self, key, item):
+    def add_listener(self, listener):
+        """ Call listener(key, item) on every eviction
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """ Stop calling a listener on evictions
+        """
+        self.listeners.remove(listener)
+
+    def stats(self):
+        """ Return a snapshot of the cache counters
+        The size in bytes is only tracked when max_bytes is set, otherwise
+        it is computed here with the sizer, in O(n).
+        """
+        if self.max_bytes is None:
+            sizer = self.sizer
+            nbytes = sum(sizer(key, item)
+                         for key, item in self.cache_data.items())
+        else:
+            nbytes = self.current_bytes
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "inserts": self.inserts,
+            "updates": self.updates,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self.cache_data),
+            "bytes": nbytes,
+        }
+
+    def put(self, key, item, ttl=None):
         """ Add an item in the cache
         """
         raise NotImplementedError("put must be implemented in your cache class")
@@ -30,3 +115,226 @@ class BaseCaching():
         """ Get an item by key
         """
         raise NotImplementedError("get must be implemented in your cache class")
+
+    def get_many(self, keys):
+        """ Get several items, same as calling get for each key
+        Return:
+            The list of the values, None for missing keys
+        """
+        return [self.get(key) for key in keys]
+
+    def put_many(self, mapping, ttl=None):
+        """ Add several items, same as calling put for each of them
+        """
+        for key, item in mapping.items():
+            self.put(key, item, ttl)
+
+    def _plain(self, ttl=None):
+        """ Tell whether puts can skip the byte and expiry bookkeeping,
+        which lets the batch methods take their fast path
+        """
+        return self.max_bytes is None and ttl is None and \
+            self.ttl is None and not self.expires
+
+    def _bulk(self, mapping):
+        """ Tell whether a batch only adds new keys that all fit without
+        any eviction, so that it can be stored with dict updates
+        OrderedDict.update is much faster given items() than a dict.
+        """
+        # id() avoids comparing the items with None through their __eq__
+        return bool(mapping) and self.max_items is not None and \
+            len(self.cache_data) + len(mapping) <= self.max_items and \
+            None not in mapping and \
+            id(None) not in map(id, mapping.values()) and \
+            self.cache_data.keys().isdisjoint(mapping)
+
+    def _pop_victim(self):
+        """ Remove the next key to evict from the policy bookkeeping
+        and return it
+        """
+        raise NotImplementedError(
+            "_pop_victim must be implemented in your cache class")
+
+    def _peek_victim(self):
+        """ Return the next key to evict without removing it, or None when
+        the policy cannot tell in advance
+        """
+        return None
+
+    def _unlink(self, key):
+        """ Remove a key from the policy bookkeeping
+        """
+        raise NotImplementedError(
+            "_unlink must be implemented in your cache class")
+
+    def _snapshot_order(self):
+        """ Return an iterator over the keys in the order that rebuilds the
+        policy bookkeeping when they are put again into an empty cache
+        """
+        return iter(self.cache_data)
+
+    def _snapshot_meta(self, key):
+        """ Return the bookkeeping of a key that putting it again does not
+        rebuild, or None if it does. Policies overriding it also override
+        _restore_meta.
+        """
+        return None
+
+    def _restore_meta(self, key, meta):
+        """ Restore the bookkeeping returned by _snapshot_meta for a key
+        that was just put again
+        """
+
+    def _snapshot_state(self):
+        """ Return the bookkeeping of the policy that is not tied to the
+        cached keys
+        """
+        return {}
+
+    def _restore_state(self, state):
+        """ Restore the bookkeeping returned by _snapshot_state """
+
+    def _size_of(self, key, item):
+        """ Return the size of an entry, 0 when bytes are not limited
+        """
+        if self.max_bytes is None:
+            return 0
+        return self.sizer(key, item)
+
+    def _too_large(self, size):
+        """ Tell whether an entry can never fit in the cache
+        """
+        return self.max_bytes is not None and size > self.max_bytes
+
+    def _is_full(self, size=0):
+        """ Tell whether adding an entry of the given size would exceed
+        one of the limits
+        """
+        if self.max_items is not None and \
+                len(self.cache_data) >= self.max_items:
+            return True
+        return self.max_bytes is not None and \
+            self.current_bytes + size > self.max_bytes
+
+    def _store(self, key, item, size=0, ttl=None):
+        """ Store an entry, account for its size and schedule its expiry
+        """
+        self.cache_data[key] = item
+        if size:
+            self.sizes[key] = size
+            self.current_bytes += size
+        if ttl is None:
+            ttl = self.ttl
+        if ttl is not None:
+            deadline = monotonic() + ttl
+            self.expires[key] = deadline
+            heapq.heappush(self.expiry_heap, (deadline, id(key), key))
+            self._prune_heap()
+
+    def _prune_heap(self, limit=2):
+        """ Pop up to limit stale expiries, those of keys dropped or put
+        again since, from the top of the heap, so that it shrinks a little
+        on every put instead of being rebuilt at once
+        """
+        heap = self.expiry_heap
+        expires = self.expires
+        while limit and heap and expires.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+            limit -= 1
+
+    def _drop(self, key):
+        """ Remove an entry, its size and its expiry from the storage
+        Return:
+            The item of the entry
+        """
+        item = self.cache_data.pop(key)
+        self.current_bytes -= self.sizes.pop(key, 0)
+        if self.expires:
+            self.expires.pop(key, None)
+        return item
+
+    def _expire(self, key):
+        """ Discard an entry if its time-to-live has elapsed
+        Return:
+            True if the entry was expired
+        """
+        deadline = self.expires.get(key)
+        if deadline is None or deadline > monotonic():
+            return False
+        self._discard(key)
+        self.expirations += 1
+        return True
+
+    def reap(self, sample=20):
+        """ Discard expired entries, looking at no more than sample
+        scheduled expiries so that a call never takes long
+        Return:
+            The number of discarded entries
+        """
+        reaped = 0
+        now = monotonic()
+        heap = self.expiry_heap
+        for _ in range(sample):
+            if not heap or heap[0][0] > now:
+                break
+            deadline, _, key = heapq.heappop(heap)
+            if self.expires.get(key) == deadline:
+                self._discard(key)
+                reaped += 1
+        self.expirations += reaped
+        return reaped
+
+    def start_reaper(self, interval=1.0, sample=20, lock=None):
+        """ Call reap from a daemon thread every interval seconds
+        Args:
+            interval: the number of seconds between two ticks
+            sample: the maximum number of expiries looked at per tick
+            lock: the lock guarding this cache, required: the reaper
+                holds it during each tick, and every other caller of the
+                cache must hold it too, since reap changes the cache
+        """
+        if lock is None:
+            raise ValueError("start_reaper needs the lock guarding the cache")
+        if self.reaper is not None:
+            return
+        stop = Event()
+
+        def tick():
+            """ Reap until stopped """
+            while not stop.wait(interval):
+                with lock:
+                    self.reap(sample)
+
+        thread = Thread(target=tick, daemon=True)
+        self.reaper = (thread, stop)
+        thread.start()
+
+    def stop_reaper(self):
+        """ Stop the background reaper
+        """
+        if self.reaper is None:
+            return
+        thread, stop = self.reaper
+        stop.set()
+        thread.join()
+        self.reaper = None
+
+    def _discard(self, key):
+        """ Remove an entry from both the policy and the storage
+        Return:
+            The item of the entry
+        """
+        self._unlink(key)
+        return self._drop(key)
+
+    def _make_room(self, size=0):
+        """ Evict entries until one of the given size fits
+        """
+        while self.cache_data and self._is_full(size):
+            discard = self._pop_victim()
+            item = self._drop(discard)
+            self.evictions += 1
+            for listener in self.listeners:
+                listener(discard, item)
+        if self.expiry_heap:
+            self._prune_heap()
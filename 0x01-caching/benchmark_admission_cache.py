@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+""" TinyLFU admission benchmark
+
+Replays skewed traces against LRUCache and FIFOCache, alone and behind an
+AdmissionCache, and reports the hit ratios and the memory of the sketch.
+Every miss is followed by a put of the key, like a read-through cache.
+The traces are Zipf traces over 100k keys, and one where every other
+access is a key never seen before, like the one-hit wonders of a crawler.
+
+Usage: ./benchmark_admission_cache.py [accesses]
+"""
+
+import itertools
+import sys
+
+LRUCache = __import__('3-lru_cache').LRUCache
+FIFOCache = __import__('1-fifo_cache').FIFOCache
+AdmissionCache = __import__('admission_cache').AdmissionCache
+zipf_trace = __import__('trace_replay').zipf_trace
+
+KEYS = 100000
+CAPACITY = 1000
+
+
+def hit_ratio(cache, trace):
+    """ Return the hit ratio of a read-through replay """
+    hits = 0
+    for key in trace:
+        if cache.get(key) is None:
+            cache.put(key, key)
+        else:
+            hits += 1
+    return hits / len(trace)
+
+
+def one_hit_wonders(length, alpha):
+    """ Return a Zipf trace with a new key between two accesses """
+    fresh = itertools.count(KEYS)
+    trace = []
+    for key in zipf_trace(length // 2, KEYS, alpha):
+        trace.append(key)
+        trace.append(next(fresh))
+    return trace
+
+
+if __name__ == "__main__":
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    traces = [("zipf 0.8", list(zipf_trace(length, KEYS, 0.8))),
+              ("zipf 1.0", list(zipf_trace(length, KEYS, 1.0))),
+              ("wonders 1.0", one_hit_wonders(length, 1.0))]
+    print("{:>12} {:>10} {:>9} {:>9} {:>7}".format(
+        "trace", "policy", "alone", "tinylfu", "gain"))
+    for name, trace in traces:
+        for policy in (LRUCache, FIFOCache):
+            alone = hit_ratio(policy(max_items=CAPACITY), trace)
+            admitted = AdmissionCache(policy, max_items=CAPACITY)
+            filtered = hit_ratio(admitted, trace)
+            print("{:>12} {:>10} {:>9.4f} {:>9.4f} {:>+7.4f}".format(
+                name, policy.__name__, alone, filtered, filtered - alone))
+    print("sketch bytes for {} items: {}".format(
+        CAPACITY, admitted.stats()["sketch_bytes"]))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+""" ARC cache hit ratio benchmark
+
+Replays synthetic traces against every policy and prints the hit ratio.
+Each trace is a Zipf distributed stream of hot keys, interrupted at regular
+intervals by a sequential scan of keys outside of the hot set, like paging
+through the whole baby names dataset. Every miss is followed by a put.
+
+Usage: ./benchmark_arc_cache.py [length]
+"""
+
+import itertools
+import random
+import sys
+
+POLICIES = (
+    ('1-fifo_cache', 'FIFOCache'),
+    ('2-lifo_cache', 'LIFOCache'),
+    ('3-lru_cache', 'LRUCache'),
+    ('4-mru_cache', 'MRUCache'),
+    ('100-lfu_cache', 'LFUCache'),
+    ('101-arc_cache', 'ARCCache'),
+)
+KEYS = 10000
+CAPACITY = 1000
+
+
+def zipf_scan_trace(length, alpha, scan_every, scan_length, seed=0):
+    """ Return a Zipf trace interrupted by sequential scans
+    Args:
+        length: the number of Zipf accesses
+        alpha: the skew of the Zipf distribution
+        scan_every: the number of Zipf accesses between two scans
+        scan_length: the number of keys of each scan
+        seed: the seed of the random generator
+    """
+    rng = random.Random(seed)
+    weights = list(itertools.accumulate(
+        1 / (rank ** alpha) for rank in range(1, KEYS + 1)))
+    hot = rng.choices(range(KEYS), cum_weights=weights, k=length)
+    trace = []
+    scanned = KEYS
+    for start in range(0, length, scan_every):
+        trace.extend(hot[start:start + scan_every])
+        if scan_length:
+            trace.extend(range(scanned, scanned + scan_length))
+            scanned += scan_length
+    return trace
+
+
+def hit_ratio(cache_class, trace):
+    """ Return the hit ratio of a policy on a trace """
+    cache = cache_class(max_items=CAPACITY)
+    hits = 0
+    for key in trace:
+        if cache.get(key) is None:
+            cache.put(key, key)
+        else:
+            hits += 1
+    return hits / len(trace)
+
+
+if __name__ == "__main__":
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    workloads = (
+        ("zipf 0.8", zipf_scan_trace(length, 0.8, length, 0)),
+        ("zipf 0.8 + scans", zipf_scan_trace(length, 0.8, 5000, 2000)),
+        ("zipf 1.0 + scans", zipf_scan_trace(length, 1.0, 5000, 2000)),
+        ("zipf 1.2 + scans", zipf_scan_trace(length, 1.2, 2000, 5000)),
+    )
+    policies = [getattr(__import__(module), name)
+                for module, name in POLICIES]
+    print("{:>18}".format("workload") +
+          "".join("{:>11}".format(name) for _, name in POLICIES))
+    for label, trace in workloads:
+        print("{:>18}".format(label) +
+              "".join("{:>11.4f}".format(hit_ratio(policy, trace))
+                      for policy in policies))
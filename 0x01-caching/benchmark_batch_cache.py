@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+""" Batch API benchmark
+
+Compares the per-key cost of get/put called in a loop with the cost of
+get_many/put_many for every policy, on batches of 100 keys against a full
+cache of 10000 items.
+
+Usage: ./benchmark_batch_cache.py [batches]
+"""
+
+import random
+import sys
+import time
+
+POLICIES = (
+    ('0-basic_cache', 'BasicCache'),
+    ('1-fifo_cache', 'FIFOCache'),
+    ('2-lifo_cache', 'LIFOCache'),
+    ('3-lru_cache', 'LRUCache'),
+    ('4-mru_cache', 'MRUCache'),
+    ('100-lfu_cache', 'LFUCache'),
+)
+CAPACITY = 10000
+BATCH = 100
+
+
+def run(cache, batches, batched):
+    """ Return the time in nanoseconds spent per key
+    Args:
+        cache: the cache to exercise
+        batches: the list of key batches
+        batched: whether to use get_many/put_many
+    """
+    start = time.perf_counter()
+    if batched:
+        for keys in batches:
+            cache.put_many(dict.fromkeys(keys, 1))
+            cache.get_many(keys)
+    else:
+        for keys in batches:
+            for key in dict.fromkeys(keys, 1):
+                cache.put(key, 1)
+            for key in keys:
+                cache.get(key)
+    elapsed = time.perf_counter() - start
+    return elapsed / (2 * BATCH * len(batches)) * 1e9
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rng = random.Random(0)
+    batches = [[rng.randrange(2 * CAPACITY) for _ in range(BATCH)]
+               for _ in range(count)]
+    print("{:>12} {:>12} {:>12} {:>9}".format(
+        "policy", "loop ns/key", "batch ns/key", "speedup"))
+    for module, name in POLICIES:
+        cache_class = getattr(__import__(module), name)
+        timings = []
+        for batched in (False, True):
+            cache = cache_class(max_items=CAPACITY)
+            cache.put_many({key: 0 for key in range(CAPACITY)})
+            timings.append(run(cache, batches, batched))
+        print("{:>12} {:>12.0f} {:>12.0f} {:>8.2f}x".format(
+            name, timings[0], timings[1], timings[0] / timings[1]))
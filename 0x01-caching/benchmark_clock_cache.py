@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+""" CLOCK cache benchmark
+
+Compares ClockCache with LRUCache on two measures:
+- the hit ratio of read-through replays of Zipf and loop traces, at a
+  capacity of a tenth of the keys;
+- the read throughput of 1 to 8 threads running gets while one writer
+  thread keeps putting new keys. The writer holds a lock for every put.
+  LRUCache readers must take that lock too since a hit reorders the
+  cache, while ClockCache readers do not take it.
+
+Usage: ./benchmark_clock_cache.py [reads_per_thread]
+"""
+
+import random
+import sys
+import time
+from threading import Event, Lock, Thread
+
+LRUCache = __import__('3-lru_cache').LRUCache
+ClockCache = __import__('103-clock_cache').ClockCache
+trace_replay = __import__('trace_replay')
+
+KEYS = 100000
+CAPACITY = 10000
+
+
+def reader(cache, lock, keys):
+    """ Run gets, under the lock if one is given """
+    if lock is None:
+        for key in keys:
+            cache.get(key)
+    else:
+        for key in keys:
+            with lock:
+                cache.get(key)
+
+
+def writer(cache, lock, stop):
+    """ Put new keys until stopped """
+    key = KEYS
+    while not stop.is_set():
+        with lock:
+            cache.put(key, key)
+        key += 1
+        time.sleep(0)
+
+
+def read_throughput(cache_class, threads, reads, locked_reads):
+    """ Return the gets/sec of reader threads beside one writer """
+    cache = cache_class(max_items=CAPACITY)
+    cache.put_many({key: key for key in range(CAPACITY)})
+    lock = Lock()
+    stop = Event()
+    rng = random.Random(threads)
+    workloads = [[rng.randrange(2 * CAPACITY) for _ in range(reads)]
+                 for _ in range(threads)]
+    readers = [Thread(target=reader,
+                      args=(cache, lock if locked_reads else None, keys))
+               for keys in workloads]
+    background = Thread(target=writer, args=(cache, lock, stop))
+    background.start()
+    start = time.perf_counter()
+    for thread in readers:
+        thread.start()
+    for thread in readers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    background.join()
+    return threads * reads / elapsed
+
+
+if __name__ == "__main__":
+    reads = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print("{:>8} {:>10} {:>10}".format("trace", "LRU hits", "CLOCK hits"))
+    for name in ("zipf", "loop"):
+        trace = trace_replay.make_trace(name, 200000, KEYS)
+        ratios = [trace_replay.replay(cache_class, trace, CAPACITY,
+                                      False)["hit_ratio"]
+                  for cache_class in (LRUCache, ClockCache)]
+        print("{:>8} {:>10.4f} {:>10.4f}".format(name, *ratios))
+    print()
+    print("{:>8} {:>16} {:>16}".format("threads", "LRU reads/s",
+                                       "CLOCK reads/s"))
+    for threads in (1, 2, 4, 8):
+        print("{:>8} {:>16.0f} {:>16.0f}".format(
+            threads, read_throughput(LRUCache, threads, reads, True),
+            read_throughput(ClockCache, threads, reads, False)))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+""" Compact LRU cache memory benchmark
+
+Fills an LRUCache and a CompactLRUCache with the same entries and reports
+the memory they allocate according to tracemalloc, then the throughput of
+a mix of gets and puts on the full caches. Keys and items are created
+before tracing starts, so only the cache structures are counted.
+
+Usage: ./benchmark_compact_lru_cache.py [entries]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+LRUCache = __import__('3-lru_cache').LRUCache
+CompactLRUCache = __import__('102-compact_lru_cache').CompactLRUCache
+
+
+def measure(cache_class, keys):
+    """ Return the cache filled with keys and the bytes it allocated """
+    tracemalloc.start()
+    cache = cache_class(max_items=len(keys))
+    cache.put_many(dict.fromkeys(keys, 0))
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return cache, allocated
+
+
+def throughput(cache, keys, ops):
+    """ Return the ops/sec of a mix of gets and puts """
+    rng = random.Random(0)
+    sample = [rng.choice(keys) for _ in range(ops)]
+    start = time.perf_counter()
+    for i, key in enumerate(sample):
+        if i & 3:
+            cache.get(key)
+        else:
+            cache.put(key, i)
+    return ops / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    keys = list(range(entries))
+    print("{:>16} {:>14} {:>12} {:>12}".format(
+        "cache", "bytes", "bytes/entry", "ops/s"))
+    for cache_class in (LRUCache, CompactLRUCache):
+        cache, allocated = measure(cache_class, keys)
+        print("{:>16} {:>14} {:>12.1f} {:>12.0f}".format(
+            cache_class.__name__, allocated, allocated / entries,
+            throughput(cache, keys, 200000)))
+        del cache
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+""" FIFO/LIFO cache throughput benchmark
+
+Compares the OrderedDict based FIFOCache and LIFOCache with the previous
+list based implementations, kept below for reference. Each cache is filled
+to capacity, then timed on a mix of updates of existing keys and inserts
+of new keys at 1k, 100k and 1M keys.
+
+Usage: ./benchmark_fifo_lifo_cache.py [ops]
+"""
+
+import random
+import sys
+import time
+
+from base_caching import BaseCaching
+FIFOCache = __import__('1-fifo_cache').FIFOCache
+LIFOCache = __import__('2-lifo_cache').LIFOCache
+
+
+class ListFIFOCache(BaseCaching):
+    """ Previous FIFO cache keeping insertion order in a list """
+
+    def __init__(self, *args, **kwargs):
+        """ Initialize the cache """
+        super().__init__(*args, **kwargs)
+        self.order = []
+
+    def put(self, key, item):
+        """ Add an item in the cache """
+        if key is None or item is None:
+            return
+        if key in self.cache_data:
+            self.cache_data[key] = item
+            self.order.remove(key)
+        else:
+            if len(self.cache_data) >= self.max_items:
+                discard = self.order.pop(0)
+                del self.cache_data[discard]
+            self.cache_data[key] = item
+        self.order.append(key)
+
+    def get(self, key):
+        """ Get an item by key """
+        if key is None or key not in self.cache_data:
+            return None
+        return self.cache_data[key]
+
+
+class ListLIFOCache(ListFIFOCache):
+    """ Previous LIFO cache keeping insertion order in a list """
+
+    def put(self, key, item):
+        """ Add an item in the cache """
+        if key is None or item is None:
+            return
+        if key in self.cache_data:
+            self.cache_data[key] = item
+            self.order.remove(key)
+        else:
+            if len(self.cache_data) >= self.max_items:
+                discard = self.order.pop()
+                del self.cache_data[discard]
+            self.cache_data[key] = item
+        self.order.append(key)
+
+
+def bench(cache_class, capacity, ops):
+    """ Return the number of puts per second on a full cache
+    Args:
+        cache_class: the cache implementation to measure
+        capacity: number of items the cache holds
+        ops: number of puts to time
+    """
+    cache = cache_class(max_items=capacity)
+    for key in range(capacity):
+        cache.put(key, key)
+
+    rng = random.Random(capacity)
+    keys = [rng.randrange(2 * capacity) for _ in range(ops)]
+    start = time.perf_counter()
+    for i, key in enumerate(keys):
+        cache.put(key, i)
+    elapsed = time.perf_counter() - start
+    return ops / elapsed
+
+
+if __name__ == "__main__":
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    pairs = (("FIFO", ListFIFOCache, FIFOCache),
+             ("LIFO", ListLIFOCache, LIFOCache))
+    print("{:>6} {:>10} {:>14} {:>14} {:>9}".format(
+        "policy", "keys", "list ops/s", "odict ops/s", "speedup"))
+    for name, old, new in pairs:
+        for capacity in (1000, 100000, 1000000):
+            before = bench(old, capacity, ops)
+            after = bench(new, capacity, ops)
+            print("{:>6} {:>10} {:>14.0f} {:>14.0f} {:>8.1f}x".format(
+                name, capacity, before, after, after / before))
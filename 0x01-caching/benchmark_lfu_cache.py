@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+""" LFU cache benchmark
+
+Fills an LFUCache to capacity, then measures the average latency of a
+mixed workload of gets and evicting puts at capacities from 10^3 to 10^6.
+A constant-time eviction engine shows a flat per-op latency across sizes.
+
+Usage: ./benchmark_lfu_cache.py [ops]
+"""
+
+import random
+import sys
+import time
+
+LFUCache = __import__('100-lfu_cache').LFUCache
+
+
+def bench(capacity, ops):
+    """ Return the average latency in microseconds of one operation
+    Args:
+        capacity: number of items the cache can hold
+        ops: number of operations to time
+    """
+    cache = LFUCache(max_items=capacity)
+    for key in range(capacity):
+        cache.put(key, key)
+
+    rng = random.Random(capacity)
+    keys = [rng.randrange(2 * capacity) for _ in range(ops)]
+    start = time.perf_counter()
+    for i, key in enumerate(keys):
+        if i & 1:
+            cache.get(key)
+        else:
+            cache.put(key, i)
+    elapsed = time.perf_counter() - start
+    return elapsed / ops * 1e6
+
+
+if __name__ == "__main__":
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print("{:>10} {:>12}".format("capacity", "us/op"))
+    for exponent in range(3, 7):
+        capacity = 10 ** exponent
+        print("{:>10} {:>12.3f}".format(capacity, bench(capacity, ops)))
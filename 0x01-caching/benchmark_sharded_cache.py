@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+""" Sharded cache multi-threaded benchmark
+
+Measures the ops/sec of a ShardedCache of LRUCache shards against a single
+LRUCache behind one global lock, from 1 to 16 threads. Every thread runs
+the same number of operations, a mix of 80% gets and 20% puts.
+
+Usage: ./benchmark_sharded_cache.py [ops_per_thread]
+"""
+
+import random
+import sys
+import time
+from threading import Lock, Thread
+
+LRUCache = __import__('3-lru_cache').LRUCache
+ShardedCache = __import__('sharded_cache').ShardedCache
+
+CAPACITY = 10000
+
+
+class LockedCache():
+    """ A single cache guarded by one global lock """
+
+    def __init__(self, cache):
+        """ Wrap a cache instance """
+        self.cache = cache
+        self.lock = Lock()
+
+    def put(self, key, item):
+        """ Add an item in the cache """
+        with self.lock:
+            self.cache.put(key, item)
+
+    def get(self, key):
+        """ Get an item by key """
+        with self.lock:
+            return self.cache.get(key)
+
+
+def worker(cache, keys):
+    """ Run a mix of gets and puts on a cache """
+    for i, key in enumerate(keys):
+        if i % 5:
+            cache.get(key)
+        else:
+            cache.put(key, i)
+
+
+def bench(cache, threads, ops):
+    """ Return the ops/sec of a number of threads sharing a cache
+    Args:
+        cache: the cache to share
+        threads: the number of threads
+        ops: the number of operations per thread
+    """
+    rng = random.Random(threads)
+    workloads = [[rng.randrange(2 * CAPACITY) for _ in range(ops)]
+                 for _ in range(threads)]
+    pool = [Thread(target=worker, args=(cache, keys)) for keys in workloads]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return threads * ops / elapsed
+
+
+if __name__ == "__main__":
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print("{:>8} {:>16} {:>16}".format("threads", "locked ops/s",
+                                       "sharded ops/s"))
+    for threads in (1, 2, 4, 8, 16):
+        locked = LockedCache(LRUCache(max_items=CAPACITY))
+        sharded = ShardedCache(LRUCache, shards=16, max_items=CAPACITY)
+        print("{:>8} {:>16.0f} {:>16.0f}".format(
+            threads, bench(locked, threads, ops),
+            bench(sharded, threads, ops)))
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+""" Shared memory cache multi-process benchmark
+
+Runs 8 forked worker processes, like the workers of a pre-fork server,
+each replaying its own Zipf trace over a common key space as a
+read-through cache. Either all of them share one SharedMemoryCache, or each
+holds a private LRUCache with an eighth of the same capacity, so both
+setups use the same total memory. Reports the aggregate hit ratio and
+throughput.
+
+Usage: ./benchmark_shared_memory_cache.py [accesses_per_worker]
+"""
+
+import multiprocessing
+import sys
+import time
+
+LRUCache = __import__('3-lru_cache').LRUCache
+SharedMemoryCache = __import__('shared_memory_cache').SharedMemoryCache
+zipf_trace = __import__('trace_replay').zipf_trace
+
+WORKERS = 8
+KEYS = 100000
+CAPACITY = 16000
+
+
+def work(cache, seed, accesses, results):
+    """ Replay a trace and send back the number of hits """
+    if cache is None:
+        cache = LRUCache(max_items=CAPACITY // WORKERS)
+    hits = 0
+    for key in zipf_trace(accesses, KEYS, 0.9, seed):
+        if cache.get(key) is None:
+            cache.put(key, key)
+        else:
+            hits += 1
+    results.put(hits)
+
+
+def run(cache, accesses):
+    """ Return the hit ratio and the ops/sec of the workers """
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=work,
+                                       args=(cache, seed, accesses, results))
+               for seed in range(WORKERS)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    hits = sum(results.get() for _ in workers)
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    total = WORKERS * accesses
+    return hits / total, total / elapsed
+
+
+if __name__ == "__main__":
+    multiprocessing.set_start_method('fork')
+    accesses = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print("{:>24} {:>10} {:>12}".format("cache", "hit ratio", "ops/s"))
+    hit_ratio, ops = run(None, accesses)
+    print("{:>24} {:>10.4f} {:>12.0f}".format(
+        "{} private LRUCache".format(WORKERS), hit_ratio, ops))
+    shared = SharedMemoryCache(capacity=CAPACITY, entry_size=64)
+    try:
+        hit_ratio, ops = run(shared, accesses)
+    finally:
+        shared.close()
+    print("{:>24} {:>10.4f} {:>12.0f}".format(
+        "1 SharedMemoryCache", hit_ratio, ops))
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+""" Cache snapshot benchmark
+
+Fills caches of several policies with int keys and short str items, then
+reports the time to dump each one to a file and to load it back, with both
+codecs, and the size of the file.
+
+Usage: ./benchmark_snapshot.py [entries]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+LRUCache = __import__('3-lru_cache').LRUCache
+FIFOCache = __import__('1-fifo_cache').FIFOCache
+LFUCache = __import__('100-lfu_cache').LFUCache
+snapshot = __import__('snapshot')
+
+
+if __name__ == "__main__":
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    handle, path = tempfile.mkstemp(suffix=".snapshot")
+    os.close(handle)
+    print("{:>10} {:>8} {:>10} {:>10} {:>12}".format(
+        "policy", "codec", "dump s", "load s", "bytes"))
+    try:
+        for policy in (LRUCache, FIFOCache, LFUCache):
+            cache = policy(max_items=entries)
+            cache.put_many({key: str(key) for key in range(entries)})
+            for codec in ("marshal", "pickle"):
+                start = time.perf_counter()
+                with open(path, "wb") as f:
+                    snapshot.dump(cache, f, codec)
+                dumped = time.perf_counter() - start
+                start = time.perf_counter()
+                with open(path, "rb") as f:
+                    snapshot.load(f)
+                loaded = time.perf_counter() - start
+                print("{:>10} {:>8} {:>10.3f} {:>10.3f} {:>12}".format(
+                    policy.__name__, codec, dumped, loaded,
+                    os.path.getsize(path)))
+            del cache
+    finally:
+        os.remove(path)
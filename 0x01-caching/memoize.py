@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+""" Memoization module
+
+The cached decorator stores the results of a function in any BaseCaching
+policy. Concurrent callers of the same missing key share a single call
+of the function.
+
+On a method, every instance gets its own cache, kept in a
+WeakKeyDictionary: the caches never hold the instances, which are freed
+as usual, and the results of one instance never evict those of another.
+"""
+
+from concurrent.futures import Future
+from functools import update_wrapper
+from threading import Lock
+from types import MethodType
+from weakref import WeakKeyDictionary
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+_KWARGS_MARK = object()
+
+
+def make_key(args, kwargs):
+    """ Build a hashable key from the arguments of a call
+    Args:
+        args: the positional arguments
+        kwargs: the keyword arguments
+    Returns:
+        A tuple usable as a cache key
+    """
+    if not kwargs:
+        return args
+    return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+
+
+class Memo():
+    """ Results of a function, or of a method for one instance """
+
+    def __init__(self, function, factory, key=None, method=False):
+        """ Initialize the memo
+        Args:
+            function: the function whose results are kept
+            factory: callable returning an empty cache
+            key: callable building the cache key from the arguments of a
+                call, make_key by default
+            method: whether calls start with the instance, which default
+                keys leave out
+        """
+        self.function = function
+        self.factory = factory
+        self.key = key
+        self.method = method
+        self.lock = Lock()
+        self.loading = {}
+        self.cache = factory()
+
+    def __call__(self, *args, **kwargs):
+        """ Return the cached result or call the function once """
+        if self.key:
+            name = self.key(*args, **kwargs)
+        else:
+            name = make_key(args[1:] if self.method else args, kwargs)
+        with self.lock:
+            hit = self.cache.get(name)
+            if hit is not None:
+                return hit[0]
+            flight = self.loading.get(name)
+            leader = flight is None
+            if leader:
+                flight = self.loading[name] = Future()
+        if not leader:
+            return flight.result()
+
+        try:
+            value = self.function(*args, **kwargs)
+        except BaseException as error:
+            with self.lock:
+                del self.loading[name]
+            flight.set_exception(error)
+            raise
+        with self.lock:
+            # Results are wrapped so that None can be cached too
+            self.cache.put(name, (value,))
+            del self.loading[name]
+        flight.set_result(value)
+        return value
+
+    def cache_clear(self):
+        """ Drop every cached result """
+        with self.lock:
+            self.cache = self.factory()
+
+    def stats(self):
+        """ Return the counters of the cache """
+        with self.lock:
+            return self.cache.stats()
+
+
+class CachedFunction(Memo):
+    """ Memo of a function, giving each instance its own Memo when the
+    function is a method
+    """
+
+    def __init__(self, function, factory, key=None):
+        """ Wrap the function """
+        super().__init__(function, factory, key)
+        self.instances = WeakKeyDictionary()
+        self.instances_lock = Lock()
+        update_wrapper(self, function)
+
+    def __get__(self, instance, owner=None):
+        """ Return the method bound to the Memo of an instance """
+        if instance is None:
+            return self
+        memo = self.instances.get(instance)
+        if memo is None:
+            with self.instances_lock:
+                memo = self.instances.get(instance)
+                if memo is None:
+                    memo = self.instances[instance] = Memo(
+                        self.function, self.factory, self.key, True)
+        return MethodType(memo, instance)
+
+    def cache_clear(self):
+        """ Drop every cached result, of every instance too """
+        super().cache_clear()
+        with self.instances_lock:
+            memos = list(self.instances.values())
+        for memo in memos:
+            memo.cache_clear()
+
+
+def cached(policy=LRUCache, capacity=128, ttl=None, max_bytes=None,
+           key=None):
+    """ Memoize a function in a cache of the given policy
+    Args:
+        policy: the BaseCaching subclass storing the results
+        capacity: the maximum number of results kept, per instance for a
+            method
+        ttl: the time-to-live of the results in seconds
+        max_bytes: the maximum number of bytes of the results
+        key: callable building the cache key from the arguments of a call,
+            the instance included for a method, make_key of the other
+            arguments by default
+    Returns:
+        The decorator. The decorated function exposes its cache as
+        .cache, the cache counters as .stats() and empties the cache
+        with .cache_clear(). On an instance, a decorated method exposes
+        those of the instance.
+    """
+    def decorator(function):
+        """ Wrap the function """
+        def factory():
+            """ Return an empty cache """
+            return policy(max_items=capacity, max_bytes=max_bytes, ttl=ttl)
+
+        return CachedFunction(function, factory, key)
+
+    return decorator
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+""" Memory-mapped caching module
+
+MmapStore is a fixed-size hash table kept in a memory-mapped file, so its
+content survives restarts and is shared by every process mapping the same
+file. TieredCache puts an in-memory policy in front of it: evictions from
+memory spill to the file and memory misses are read back from it.
+
+The file starts with a header followed by `slots` slots of `slot_size`
+bytes. Each slot holds a small header, the pickled key and the value.
+The slot header keeps the wall-clock deadline of entries that expire, so
+that the time-to-live of entries holds across tiers, processes and
+restarts; expired entries read as missing. Bytes values are stored raw
+and read back by MmapStore as a zero-copy memoryview of the map; other
+values are pickled. Keys are placed by a stable hash of their
+pickled form and probed linearly over a few slots. When all of them are
+taken, the home slot is overwritten: the store is a lossy cache tier.
+Writers take an exclusive flock on the file and readers a shared one.
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import time
+from time import monotonic
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+MAGIC = b'BCMM'
+VERSION = 2
+FILE_HEADER = struct.Struct('<4sIII')
+SLOT_HEADER = struct.Struct('<BBHIQd')
+EMPTY, USED, DELETED = 0, 1, 2
+RAW, PICKLED = 0, 1
+MAX_PROBE = 8
+
+
+def key_bytes(key):
+    """ Return the stable serialized form of a key """
+    return pickle.dumps(key, protocol=4)
+
+
+def key_hash(data):
+    """ Return a hash of serialized key that is the same in every process
+    """
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(),
+                          'little')
+
+
+class MmapStore():
+    """ Fixed-size hash table in a memory-mapped file """
+
+    def __init__(self, path, slots=65536, slot_size=1024):
+        """ Open or create the store
+        Args:
+            path: the path of the file
+            slots: the number of slots of a new file
+            slot_size: the size in bytes of each slot of a new file
+        An existing file keeps its own geometry.
+        """
+        if slot_size <= SLOT_HEADER.size:
+            raise ValueError("slot_size must be greater than {}".format(
+                SLOT_HEADER.size))
+        self.path = path
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(self.fd, FILE_HEADER.size, 0)
+            if len(header) == FILE_HEADER.size:
+                magic, version, old_slots, old_slot_size = \
+                    FILE_HEADER.unpack(header)
+            if len(header) < FILE_HEADER.size or magic != MAGIC or \
+                    version != VERSION:
+                os.ftruncate(self.fd, 0)
+                os.ftruncate(self.fd, FILE_HEADER.size + slots * slot_size)
+                os.pwrite(self.fd, FILE_HEADER.pack(MAGIC, VERSION, slots,
+                                                    slot_size), 0)
+            else:
+                slots, slot_size = old_slots, old_slot_size
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.slots = slots
+        self.slot_size = slot_size
+        self.map = mmap.mmap(self.fd, FILE_HEADER.size + slots * slot_size)
+        self.view = memoryview(self.map)
+
+    def _offset(self, slot):
+        """ Return the offset of a slot in the file """
+        return FILE_HEADER.size + slot * self.slot_size
+
+    def _find(self, data, hashed):
+        """ Return the slot holding a key, or None, and the first free slot
+        of its probe sequence, or None
+        """
+        free = None
+        home = hashed % self.slots
+        for step in range(MAX_PROBE):
+            slot = (home + step) % self.slots
+            offset = self._offset(slot)
+            state, _, key_size, _, found, _ = SLOT_HEADER.unpack_from(
+                self.map, offset)
+            if state == USED and found == hashed:
+                start = offset + SLOT_HEADER.size
+                if self.view[start:start + key_size] == data:
+                    return slot, free
+            elif state != USED and free is None:
+                free = slot
+            if state == EMPTY:
+                break
+        return None, free
+
+    def put(self, key, item, deadline=None):
+        """ Store an item
+        Args:
+            key: the key of the item, any picklable value
+            item: the item, bytes are stored raw, anything else pickled
+            deadline: the time.time() at which the item expires, never
+                by default
+        Returns:
+            True if the entry fits in a slot and was stored
+        """
+        if key is None or item is None:
+            return False
+        data = key_bytes(key)
+        if isinstance(item, (bytes, bytearray, memoryview)):
+            flags, value = RAW, item
+        else:
+            flags, value = PICKLED, pickle.dumps(item, protocol=4)
+        size = SLOT_HEADER.size + len(data) + len(value)
+        if size > self.slot_size or len(data) > 0xFFFF:
+            return False
+        hashed = key_hash(data)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            slot, free = self._find(data, hashed)
+            if slot is None:
+                slot = free if free is not None else hashed % self.slots
+            offset = self._offset(slot)
+            start = offset + SLOT_HEADER.size
+            self.map[start:start + len(data)] = data
+            start += len(data)
+            self.map[start:start + len(value)] = value
+            SLOT_HEADER.pack_into(self.map, offset, USED, flags, len(data),
+                                  len(value), hashed, deadline or 0.0)
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        return True
+
+    def get(self, key):
+        """ Return the item of a key, or None if it is missing or expired
+        Bytes items are returned as a memoryview of the map, without any
+        copy. The view shows whatever a later put writes in the same slot,
+        so copy it with bytes() to keep it.
+        """
+        return self.get_entry(key)[0]
+
+    def get_entry(self, key):
+        """ Return the item of a key and its deadline, or (None, None) if
+        it is missing or expired
+        """
+        if key is None:
+            return None, None
+        data = key_bytes(key)
+        hashed = key_hash(data)
+        fcntl.flock(self.fd, fcntl.LOCK_SH)
+        try:
+            slot = self._find(data, hashed)[0]
+            if slot is None:
+                return None, None
+            offset = self._offset(slot)
+            _, flags, key_size, value_size, _, deadline = \
+                SLOT_HEADER.unpack_from(self.map, offset)
+            if deadline and deadline <= time.time():
+                return None, None
+            start = offset + SLOT_HEADER.size + key_size
+            value = self.view[start:start + value_size]
+            if flags == PICKLED:
+                value = pickle.loads(value)
+            return value, deadline or None
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    def delete(self, key):
+        """ Remove a key
+        Returns:
+            True if the key was present
+        """
+        data = key_bytes(key)
+        hashed = key_hash(data)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            slot = self._find(data, hashed)[0]
+            if slot is None:
+                return False
+            SLOT_HEADER.pack_into(self.map, self._offset(slot), DELETED,
+                                  0, 0, 0, 0, 0.0)
+            return True
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    def flush(self):
+        """ Write the changes of the map to the file """
+        self.map.flush()
+
+    def close(self):
+        """ Flush and unmap the file
+        Every memoryview returned by get must have been released.
+        """
+        self.view.release()
+        self.map.flush()
+        self.map.close()
+        os.close(self.fd)
+
+
+class TieredCache():
+    """ In-memory cache policy backed by an MmapStore """
+
+    def __init__(self, path, policy=LRUCache, slots=65536, slot_size=1024,
+                 write_through=False, promote=True, **kwargs):
+        """ Initialize the tiered cache
+        Args:
+            path: the path of the MmapStore file
+            policy: the BaseCaching subclass of the memory tier
+            slots: the number of slots of a new file
+            slot_size: the size in bytes of each slot of a new file
+            write_through: whether puts also write to the file at once,
+                else entries reach it when evicted or flushed
+            promote: whether items read from the file are copied into the
+                memory tier, else bytes items are returned as zero-copy
+                views of the map, like MmapStore.get does
+            kwargs: the limits passed to the policy
+        """
+        self.memory = policy(**kwargs)
+        self.disk = MmapStore(path, slots, slot_size)
+        self.write_through = write_through
+        self.promote = promote
+        self.disk_hits = 0
+        # Wall-clock deadlines of the memory entries that expire, which
+        # evictions no longer know when they spill them. Those of expired
+        # entries stay until their older copy in the file is deleted.
+        self.deadlines = {}
+        self.memory.add_listener(self._spill)
+
+    def _spill(self, key, item):
+        """ Write an evicted entry to the file with its deadline """
+        deadline = self.deadlines.pop(key, None)
+        if deadline is not None and deadline <= time.time():
+            self.disk.delete(key)
+            return
+        self.disk.put(key, item, deadline)
+
+    def _schedule(self, key, ttl):
+        """ Record the deadline of an entry put in the memory tier
+        Returns:
+            The deadline, None if the entry never expires
+        """
+        if ttl is None:
+            ttl = self.memory.ttl
+        if ttl is None:
+            self.deadlines.pop(key, None)
+            return None
+        deadline = self.deadlines[key] = time.time() + ttl
+        if len(self.deadlines) > 2 * len(self.memory.cache_data) + 64:
+            data = self.memory.cache_data
+            for name in [name for name in self.deadlines
+                         if name not in data]:
+                del self.deadlines[name]
+                self.disk.delete(name)
+        return deadline
+
+    def put(self, key, item, ttl=None):
+        """ Add an item in the memory tier
+        Args:
+            key: the key for the cache item
+            item: the value for the cache item
+            ttl: the time-to-live of the item, in memory and in the file
+        """
+        if key is None or item is None:
+            return
+        deadline = self._schedule(key, ttl)
+        self.memory.put(key, item, ttl)
+        if self.write_through:
+            self.disk.put(key, item, deadline)
+
+    def get(self, key):
+        """ Get an item from memory, or from the file on a memory miss
+        Items read from the file are copied into the memory tier with
+        their remaining time-to-live, unless promote is False.
+        """
+        item = self.memory.get(key)
+        if item is not None or key is None:
+            return item
+        if key in self.deadlines:
+            # Expired in memory: the file may hold an older copy
+            del self.deadlines[key]
+            self.disk.delete(key)
+            return None
+        item, deadline = self.disk.get_entry(key)
+        if item is None:
+            return None
+        self.disk_hits += 1
+        if not self.promote:
+            return item
+        if isinstance(item, memoryview):
+            item = bytes(item)
+        ttl = None if deadline is None else deadline - time.time()
+        self._schedule(key, ttl)
+        self.memory.put(key, item, ttl)
+        return item
+
+    def flush(self):
+        """ Write every live entry of the memory tier to the file """
+        now = monotonic()
+        expires = self.memory.expires
+        for key, item in list(self.memory.cache_data.items()):
+            if expires.get(key, now + 1) <= now:
+                self.disk.delete(key)
+            else:
+                self.disk.put(key, item, self.deadlines.get(key))
+        self.disk.flush()
+
+    def close(self):
+        """ Flush the memory tier and close the file """
+        self.flush()
+        self.disk.close()
+
+    def stats(self):
+        """ Return the counters of the memory tier and the file hits """
+        snapshot = self.memory.stats()
+        snapshot["disk_hits"] = self.disk_hits
+        return snapshot
+
+    def print_cache(self):
+        """ Print the memory tier """
+        self.memory.print_cache()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+""" Sharded caching module
+
+ShardedCache spreads keys over several instances of any BaseCaching
+policy. Each shard has its own lock, so threads working on different
+shards never wait for each other.
+"""
+
+from threading import Lock
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+class ShardedCache():
+    """ Thread-safe cache made of independently locked policy instances """
+
+    def __init__(self, policy=LRUCache, shards=16, max_items=None,
+                 max_bytes=None, sizer=None, ttl=None):
+        """ Initialize the sharded cache
+        Args:
+            policy: the BaseCaching subclass used for every shard
+            shards: the number of shards
+            max_items: total maximum number of items, split between shards
+            max_bytes: total maximum number of bytes, split between shards.
+                One of the two limits is required: the MAX_ITEMS default
+                of a policy is meant for a single cache.
+            sizer: callable(key, item) returning the size of an entry
+            ttl: default time-to-live of entries in seconds
+        """
+        if shards < 1:
+            raise ValueError("shards must be greater than 0")
+        if max_items is None and max_bytes is None:
+            raise ValueError("max_items or max_bytes is required")
+        if max_items is not None:
+            max_items = -(-max_items // shards)
+        if max_bytes is not None:
+            max_bytes = -(-max_bytes // shards)
+        self.shards = [policy(max_items=max_items, max_bytes=max_bytes,
+                              sizer=sizer, ttl=ttl) for _ in range(shards)]
+        self.locks = [Lock() for _ in range(shards)]
+
+    def _index(self, key):
+        """ Return the index of the shard owning a key """
+        return hash(key) % len(self.shards)
+
+    def put(self, key, item, ttl=None):
+        """ Add an item in the shard owning the key
+        Args:
+            key: the key for the cache item
+            item: the value for the cache item
+            ttl: the time-to-live of the item, the cache default if None
+        """
+        if key is None or item is None:
+            return
+        index = self._index(key)
+        with self.locks[index]:
+            self.shards[index].put(key, item, ttl)
+
+    def get(self, key):
+        """ Get an item by key from the shard owning it
+        Args:
+            key: the key to retrieve from the cache
+        Returns:
+            The value of the key if it exists, otherwise None
+        """
+        if key is None:
+            return None
+        index = self._index(key)
+        with self.locks[index]:
+            return self.shards[index].get(key)
+
+    def get_many(self, keys):
+        """ Get several items, locking each shard once
+        Args:
+            keys: the keys to retrieve from the cache
+        Returns:
+            The list of the values, None for missing keys
+        """
+        keys = list(keys)
+        groups = {}
+        for position, key in enumerate(keys):
+            if key is not None:
+                groups.setdefault(self._index(key), []).append(position)
+        values = [None] * len(keys)
+        for index, positions in groups.items():
+            with self.locks[index]:
+                found = self.shards[index].get_many(
+                    [keys[position] for position in positions])
+            for position, value in zip(positions, found):
+                values[position] = value
+        return values
+
+    def put_many(self, mapping, ttl=None):
+        """ Add several items, locking each shard once
+        Args:
+            mapping: the keys and items to add
+            ttl: the time-to-live of the items, the cache default if None
+        """
+        groups = {}
+        for key, item in mapping.items():
+            if key is not None and item is not None:
+                groups.setdefault(self._index(key), {})[key] = item
+        for index, group in groups.items():
+            with self.locks[index]:
+                self.shards[index].put_many(group, ttl)
+
+    def add_listener(self, listener):
+        """ Call listener(key, item) on every eviction in any shard """
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                shard.add_listener(listener)
+
+    def remove_listener(self, listener):
+        """ Stop calling a listener on evictions """
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                shard.remove_listener(listener)
+
+    def stats(self):
+        """ Return the sum of the counters of every shard """
+        total = {}
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                snapshot = shard.stats()
+            for name, value in snapshot.items():
+                total[name] = total.get(name, 0) + value
+        lookups = total["hits"] + total["misses"]
+        total["hit_ratio"] = total["hits"] / lookups if lookups else 0.0
+        return total
+
+    def reap(self, sample=20):
+        """ Discard expired entries, looking at no more than sample
+        scheduled expiries in each shard
+        Return:
+            The number of discarded entries
+        """
+        reaped = 0
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                reaped += shard.reap(sample)
+        return reaped
+
+    def start_reaper(self, interval=1.0, sample=20):
+        """ Start a background reaper on every shard, holding the shard
+        lock during each tick
+        Args:
+            interval: the number of seconds between two ticks
+            sample: the maximum number of expiries looked at per tick
+        """
+        for shard, lock in zip(self.shards, self.locks):
+            shard.start_reaper(interval, sample, lock)
+
+    def stop_reaper(self):
+        """ Stop the background reapers """
+        for shard in self.shards:
+            shard.stop_reaper()
+
+    @property
+    def cache_data(self):
+        """ Return a merged copy of the content of every shard """
+        data = {}
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                data.update(shard.cache_data)
+        return data
+
+    def print_cache(self):
+        """ Print the cache
+        """
+        cache_data = self.cache_data
+        print("Current cache:")
+        for key in sorted(cache_data.keys()):
+            print("{}: {}".format(key, cache_data.get(key)))
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+""" Shared memory caching module
+
+SharedMemoryCache keeps its entries in a multiprocessing.shared_memory
+segment, so the processes of a pre-fork server share one cache instead of
+holding one private copy each. It has the put/get interface of the
+BaseCaching policies.
+
+The segment holds a metadata block with the shared counters, an open
+addressing index table of entry numbers and `capacity` fixed-size entries.
+Each entry stores the pickled key and the value, raw for bytes and pickled
+otherwise. Eviction follows the CLOCK algorithm: a hit only sets the
+reference bit of its entry, and the hand clears bits until it finds an
+entry that was not referenced since its last pass. Every operation holds
+a lock shared by the processes, a multiprocessing.Lock by default, which
+forked workers inherit.
+"""
+
+import multiprocessing
+import os
+import pickle
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+key_bytes = __import__('mmap_cache').key_bytes
+key_hash = __import__('mmap_cache').key_hash
+
+MAGIC = b'BCSM'
+META_FIELDS = 16
+CAPACITY, ENTRY_SIZE, TABLE_SIZE, COUNT, HAND, FREE, HIGH = range(7)
+HITS, MISSES, INSERTS, UPDATES, EVICTIONS, EXPIRATIONS = range(7, 13)
+ENTRY = struct.Struct('<BBBxIIdQ')
+FREE_ENTRY, USED = 0, 1
+RAW, PICKLED = 0, 1
+_NIL = -1
+
+
+class SharedMemoryCache():
+    """ CLOCK cache stored in shared memory """
+
+    def __init__(self, name=None, capacity=1024, entry_size=256, lock=None,
+                 create=True):
+        """ Create or attach to a shared cache
+        Args:
+            name: the name of the shared memory segment, generated when
+                creating a cache without a name
+            capacity: the maximum number of entries of a new cache
+            entry_size: the size in bytes of each entry of a new cache,
+                larger entries are not cached
+            lock: the lock shared by the processes, a new
+                multiprocessing.Lock by default. Processes that attach by
+                name rather than by fork must be given the creator's lock.
+            create: whether to create the segment or attach to it
+        """
+        if create:
+            if entry_size <= ENTRY.size:
+                raise ValueError("entry_size must be greater than {}".format(
+                    ENTRY.size))
+            table_size = 2
+            while table_size < 2 * capacity:
+                table_size *= 2
+            size = len(MAGIC) + 8 * META_FIELDS + 4 * table_size + \
+                4 * capacity + capacity * entry_size
+            self.shm = shared_memory.SharedMemory(name, True, size)
+        else:
+            # The creator owns the segment, do not unlink it at exit
+            try:
+                self.shm = shared_memory.SharedMemory(name, track=False)
+            except TypeError:
+                self.shm = shared_memory.SharedMemory(name)
+                resource_tracker.unregister(self.shm._name, 'shared_memory')
+        self.owner = os.getpid() if create else None
+        self.lock = lock or multiprocessing.Lock()
+        self.listeners = []
+        self._map(create, capacity, entry_size)
+
+    def _map(self, create, capacity, entry_size):
+        """ Build the views of the metadata, table, links and entries """
+        buf = self.shm.buf
+        if create:
+            buf[:len(MAGIC)] = MAGIC
+        elif bytes(buf[:len(MAGIC)]) != MAGIC:
+            raise ValueError("{} is not a shared cache".format(self.shm.name))
+        start = len(MAGIC)
+        self.meta = buf[start:start + 8 * META_FIELDS].cast('q')
+        if create:
+            table_size = 2
+            while table_size < 2 * capacity:
+                table_size *= 2
+            self.meta[CAPACITY] = capacity
+            self.meta[ENTRY_SIZE] = entry_size
+            self.meta[TABLE_SIZE] = table_size
+            self.meta[FREE] = _NIL
+        self.capacity = self.meta[CAPACITY]
+        self.entry_size = self.meta[ENTRY_SIZE]
+        table_size = self.meta[TABLE_SIZE]
+        self.mask = table_size - 1
+        start += 8 * META_FIELDS
+        self.table = buf[start:start + 4 * table_size].cast('i')
+        if create:
+            for position in range(table_size):
+                self.table[position] = _NIL
+        start += 4 * table_size
+        self.links = buf[start:start + 4 * self.capacity].cast('i')
+        self.base = start + 4 * self.capacity
+        self.buf = buf
+
+    @property
+    def name(self):
+        """ Return the name of the shared memory segment """
+        return self.shm.name
+
+    def _offset(self, entry):
+        """ Return the offset of an entry in the segment """
+        return self.base + entry * self.entry_size
+
+    def _key_of(self, entry):
+        """ Return the serialized key of an entry """
+        offset = self._offset(entry)
+        key_size = ENTRY.unpack_from(self.buf, offset)[3]
+        start = offset + ENTRY.size
+        return self.buf[start:start + key_size]
+
+    def _lookup(self, data, hashed):
+        """ Return the table position and the entry of a key
+        The entry is _NIL when the key is missing, and the position is
+        then the empty one where it would be inserted.
+        """
+        table = self.table
+        mask = self.mask
+        position = hashed & mask
+        entry = table[position]
+        while entry != _NIL:
+            found = ENTRY.unpack_from(self.buf, self._offset(entry))[6]
+            if found == hashed and self._key_of(entry) == data:
+                return position, entry
+            position = (position + 1) & mask
+            entry = table[position]
+        return position, _NIL
+
+    def _remove_position(self, position):
+        """ Empty a table position, shifting back the following entries
+        of the probe sequence so that lookups never stop early
+        """
+        table = self.table
+        mask = self.mask
+        hole = position
+        position = (position + 1) & mask
+        entry = table[position]
+        while entry != _NIL:
+            home = ENTRY.unpack_from(self.buf, self._offset(entry))[6] & mask
+            if (position - home) & mask >= (position - hole) & mask:
+                table[hole] = entry
+                hole = position
+            position = (position + 1) & mask
+            entry = table[position]
+        table[hole] = _NIL
+
+    def _read(self, entry):
+        """ Return the key and the item of an entry """
+        offset = self._offset(entry)
+        _, _, flags, key_size, value_size, _, _ = ENTRY.unpack_from(
+            self.buf, offset)
+        start = offset + ENTRY.size
+        key = pickle.loads(self.buf[start:start + key_size])
+        value = bytes(self.buf[start + key_size:
+                               start + key_size + value_size])
+        if flags == PICKLED:
+            value = pickle.loads(value)
+        return key, value
+
+    def _free(self, position, entry):
+        """ Remove an entry from the table and add it to the free list """
+        self._remove_position(position)
+        offset = self._offset(entry)
+        self.buf[offset] = FREE_ENTRY
+        self.links[entry] = self.meta[FREE]
+        self.meta[FREE] = entry
+        self.meta[COUNT] -= 1
+
+    def _evict(self):
+        """ Free the first entry found by the CLOCK hand without its
+        reference bit, clearing the bits it passes
+        """
+        hand = self.meta[HAND]
+        while True:
+            offset = self._offset(hand)
+            if self.buf[offset] == USED:
+                if not self.buf[offset + 1]:
+                    break
+                self.buf[offset + 1] = 0
+            hand = (hand + 1) % self.capacity
+        self.meta[HAND] = (hand + 1) % self.capacity
+        hashed = ENTRY.unpack_from(self.buf, offset)[6]
+        data = bytes(self._key_of(hand))
+        position = self._lookup(data, hashed)[0]
+        if self.listeners:
+            key, item = self._read(hand)
+        self._free(position, hand)
+        self.meta[EVICTIONS] += 1
+        if self.listeners:
+            for listener in self.listeners:
+                listener(key, item)
+
+    def _allocate(self):
+        """ Return a free entry, evicting one when the cache is full """
+        if self.meta[FREE] == _NIL and self.meta[HIGH] == self.capacity:
+            self._evict()
+        entry = self.meta[FREE]
+        if entry != _NIL:
+            self.meta[FREE] = self.links[entry]
+        else:
+            entry = self.meta[HIGH]
+            self.meta[HIGH] += 1
+        return entry
+
+    def _put(self, key, item, ttl):
+        """ Add an item, the lock being held """
+        data = key_bytes(key)
+        if isinstance(item, (bytes, bytearray, memoryview)):
+            flags, value = RAW, item
+        else:
+            flags, value = PICKLED, pickle.dumps(item, protocol=4)
+        hashed = key_hash(data)
+        position, entry = self._lookup(data, hashed)
+        if ENTRY.size + len(data) + len(value) > self.entry_size:
+            # Like the policies, drop the previous item of a key whose new
+            # item is too large rather than keep serving it
+            if entry != _NIL:
+                self.meta[UPDATES] += 1
+                self._free(position, entry)
+            return
+        expires = time.time() + ttl if ttl is not None else 0.0
+        if entry != _NIL:
+            self.meta[UPDATES] += 1
+        else:
+            self.meta[INSERTS] += 1
+            entry = self._allocate()
+            position = self._lookup(data, hashed)[0]
+            self.table[position] = entry
+            self.meta[COUNT] += 1
+        offset = self._offset(entry)
+        ENTRY.pack_into(self.buf, offset, USED, 1, flags, len(data),
+                        len(value), expires, hashed)
+        start = offset + ENTRY.size
+        self.buf[start:start + len(data)] = data
+        start += len(data)
+        self.buf[start:start + len(value)] = value
+
+    def _get(self, key):
+        """ Return the item of a key or None, the lock being held """
+        data = key_bytes(key)
+        position, entry = self._lookup(data, key_hash(data))
+        if entry == _NIL:
+            self.meta[MISSES] += 1
+            return None
+        offset = self._offset(entry)
+        expires = ENTRY.unpack_from(self.buf, offset)[5]
+        if expires and expires <= time.time():
+            self._free(position, entry)
+            self.meta[EXPIRATIONS] += 1
+            self.meta[MISSES] += 1
+            return None
+        self.meta[HITS] += 1
+        self.buf[offset + 1] = 1
+        return self._read(entry)[1]
+
+    def put(self, key, item, ttl=None):
+        """ Add an item in the cache
+        Args:
+            key: the key for the cache item, any picklable value
+            item: the value for the cache item, any picklable value
+            ttl: the time-to-live of the item in seconds
+        """
+        if key is None or item is None:
+            return
+        with self.lock:
+            self._put(key, item, ttl)
+
+    def get(self, key):
+        """ Get an item by key
+        Args:
+            key: the key to retrieve from the cache
+        Returns:
+            A copy of the value of the key if it exists, otherwise None
+        """
+        if key is None:
+            with self.lock:
+                self.meta[MISSES] += 1
+            return None
+        with self.lock:
+            return self._get(key)
+
+    def get_many(self, keys):
+        """ Get several items, holding the lock once
+        Return:
+            The list of the values, None for missing keys
+        """
+        keys = list(keys)
+        with self.lock:
+            values = []
+            for key in keys:
+                if key is None:
+                    self.meta[MISSES] += 1
+                    values.append(None)
+                else:
+                    values.append(self._get(key))
+            return values
+
+    def put_many(self, mapping, ttl=None):
+        """ Add several items, holding the lock once
+        """
+        with self.lock:
+            for key, item in mapping.items():
+                if key is not None and item is not None:
+                    self._put(key, item, ttl)
+
+    def add_listener(self, listener):
+        """ Call listener(key, item) on every eviction made by this process
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """ Stop calling a listener on evictions """
+        self.listeners.remove(listener)
+
+    @property
+    def cache_data(self):
+        """ Return a copy of the content of the cache """
+        data = {}
+        with self.lock:
+            for entry in range(self.meta[HIGH]):
+                if self.buf[self._offset(entry)] == USED:
+                    key, item = self._read(entry)
+                    data[key] = item
+        return data
+
+    def stats(self):
+        """ Return a snapshot of the counters shared by every process """
+        with self.lock:
+            meta = list(self.meta)
+        lookups = meta[HITS] + meta[MISSES]
+        return {
+            "hits": meta[HITS],
+            "misses": meta[MISSES],
+            "hit_ratio": meta[HITS] / lookups if lookups else 0.0,
+            "inserts": meta[INSERTS],
+            "updates": meta[UPDATES],
+            "evictions": meta[EVICTIONS],
+            "expirations": meta[EXPIRATIONS],
+            "size": meta[COUNT],
+            "bytes": meta[COUNT] * meta[ENTRY_SIZE],
+        }
+
+    def print_cache(self):
+        """ Print the cache
+        """
+        cache_data = self.cache_data
+        print("Current cache:")
+        for key in sorted(cache_data.keys()):
+            print("{}: {}".format(key, cache_data.get(key)))
+
+    def close(self):
+        """ Detach from the segment, removing it if this process created it
+        Forked workers only detach.
+        """
+        self.meta.release()
+        self.table.release()
+        self.links.release()
+        self.buf = None
+        self.shm.close()
+        if self.owner == os.getpid():
+            self.shm.unlink()
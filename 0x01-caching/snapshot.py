@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+""" Cache snapshot module
+
+dump writes a BaseCaching instance to a binary file, with the bookkeeping
+of its policy: the order of FIFO, LIFO, LRU and MRU caches, the
+frequencies of LFU, the T1/T2 split, target size and ghosts of ARC and the
+reference bits of CLOCK. load rebuilds the cache from it, so a restarted
+process starts warm.
+
+The file starts with a fixed header and the length-prefixed encoded
+description of the cache, followed by length-prefixed chunks of at most
+chunk_size entries and a zero length. Each chunk holds the lists of the
+keys, the items and the remaining time-to-live of its entries, and the
+policy bookkeeping of the keys that need it, encoded with pickle or, for
+builtin types only, with the faster marshal. Neither the dump nor the
+load holds more than one chunk in memory. Only load files from trusted
+sources: pickle runs code while decoding.
+"""
+
+import itertools
+import marshal
+import pickle
+import struct
+import time
+from base_caching import BaseCaching
+
+MAGIC = b'BCSS'
+VERSION = 1
+HEADER = struct.Struct('<4sBBI')
+LENGTH = struct.Struct('<I')
+CODECS = {'pickle': 0, 'marshal': 1}
+
+
+def _encode(codec, value):
+    """ Encode a value with the codec of the given id """
+    if codec == CODECS['marshal']:
+        return marshal.dumps(value)
+    return pickle.dumps(value, protocol=4)
+
+
+def _decode(codec, data):
+    """ Decode a value with the codec of the given id """
+    if codec == CODECS['marshal']:
+        return marshal.loads(data)
+    return pickle.loads(data)
+
+
+def _read(file, size):
+    """ Read exactly size bytes from a file """
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError("truncated snapshot")
+    return data
+
+
+def dump(cache, file, codec='pickle', chunk_size=65536):
+    """ Write a snapshot of a cache
+    Args:
+        cache: the BaseCaching instance, which must not change meanwhile
+        file: a binary file open for writing
+        codec: pickle, or marshal when all keys and items are builtins
+        chunk_size: the number of entries per chunk
+    Returns:
+        The number of entries written
+    """
+    if codec not in CODECS:
+        raise ValueError("unknown codec {}".format(codec))
+    codec = CODECS[codec]
+    policy = type(cache)
+    description = {
+        "policy": "{}:{}".format(policy.__module__, policy.__name__),
+        "max_items": cache.max_items,
+        "max_bytes": cache.max_bytes,
+        "ttl": cache.ttl,
+        "time": time.time(),
+        "state": cache._snapshot_state(),
+    }
+    data = _encode(codec, description)
+    file.write(HEADER.pack(MAGIC, VERSION, codec, len(data)))
+    file.write(data)
+
+    has_meta = policy._snapshot_meta is not BaseCaching._snapshot_meta
+    now = time.monotonic()
+    order = cache._snapshot_order()
+    written = 0
+    while True:
+        keys = list(itertools.islice(order, chunk_size))
+        if not keys:
+            break
+        items = [cache.cache_data[key] for key in keys]
+        metas = None
+        if has_meta:
+            metas = {}
+            for key in keys:
+                meta = cache._snapshot_meta(key)
+                if meta is not None:
+                    metas[key] = meta
+        ttls = None
+        if cache.expires:
+            ttls = [None if key not in cache.expires
+                    else cache.expires[key] - now for key in keys]
+        data = _encode(codec, (keys, items, metas, ttls))
+        file.write(LENGTH.pack(len(data)))
+        file.write(data)
+        written += len(keys)
+    file.write(LENGTH.pack(0))
+    return written
+
+
+def load(file, cache=None):
+    """ Rebuild a cache from a snapshot
+    Args:
+        file: a binary file open for reading
+        cache: an empty cache to fill, else a new cache of the saved
+            policy and limits is created, with the default sizer
+    Returns:
+        The cache. Entries whose time-to-live elapsed since the dump are
+        skipped.
+    """
+    magic, version, codec, size = HEADER.unpack(_read(file, HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a cache snapshot")
+    description = _decode(codec, _read(file, size))
+    if cache is None:
+        module, name = description["policy"].split(":")
+        cache = getattr(__import__(module), name)(
+            max_items=description["max_items"],
+            max_bytes=description["max_bytes"], ttl=description["ttl"])
+    elapsed = max(time.time() - description["time"], 0)
+
+    restore = cache._restore_meta
+    while True:
+        size = LENGTH.unpack(_read(file, LENGTH.size))[0]
+        if not size:
+            break
+        keys, items, metas, ttls = _decode(codec, _read(file, size))
+        if ttls is None:
+            cache.put_many(dict(zip(keys, items)))
+        else:
+            for key, item, ttl in zip(keys, items, ttls):
+                if ttl is None:
+                    cache.put(key, item)
+                elif ttl > elapsed:
+                    cache.put(key, item, ttl - elapsed)
+        if metas is not None:
+            data = cache.cache_data
+            for key, meta in metas.items():
+                if key in data:
+                    restore(key, meta)
+    cache._restore_state(description["state"])
+    return cache
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+""" Admission cache tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+AdmissionCache = __import__('admission_cache').AdmissionCache
+BasicCache = __import__('0-basic_cache').BasicCache
+LRUCache = __import__('3-lru_cache').LRUCache
+ARCCache = __import__('101-arc_cache').ARCCache
+
+
+class TestAdmissionCache(unittest.TestCase):
+    """ The filter only wraps policies it can compare victims of """
+
+    def test_policies_without_victim_are_rejected(self):
+        """ A policy that cannot peek its victim would admit every key """
+        for policy in (BasicCache, ARCCache):
+            with self.subTest(policy=policy.__name__):
+                with self.assertRaises(ValueError):
+                    AdmissionCache(policy, max_items=2)
+
+    def test_cold_key_is_rejected(self):
+        """ A key never read does not evict a popular one """
+        cache = AdmissionCache(LRUCache, max_items=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        for _ in range(3):
+            cache.get('a')
+            cache.get('b')
+        cache.put('c', 3)
+        self.assertEqual(sorted(cache.cache_data), ['a', 'b'])
+        self.assertEqual(cache.stats()["rejections"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
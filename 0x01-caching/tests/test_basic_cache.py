@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+""" Basic cache tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+BasicCache = __import__('0-basic_cache').BasicCache
+
+
+def sizer(key, item):
+    """ Count the characters of the item """
+    return len(item)
+
+
+class TestBasicCache(unittest.TestCase):
+    """ The byte limit holds without evictions """
+
+    def test_bytes_are_accounted(self):
+        """ stats reports the size of the entries """
+        cache = BasicCache(max_bytes=10, sizer=sizer)
+        cache.put('a', 'xxx')
+        cache.put('b', 'yyyy')
+        self.assertEqual(cache.stats()["bytes"], 7)
+        cache.put('a', 'x')
+        self.assertEqual(cache.stats()["bytes"], 5)
+
+    def test_byte_limit_is_enforced(self):
+        """ Items that would exceed max_bytes are not cached """
+        cache = BasicCache(max_bytes=10, sizer=sizer)
+        cache.put('a', 'x' * 6)
+        cache.put('b', 'y' * 6)
+        self.assertEqual(list(cache.cache_data), ['a'])
+        cache.put('a', 'x' * 20)
+        self.assertEqual(cache.cache_data, {})
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+    def test_items_are_unlimited(self):
+        """ Without max_bytes a basic cache keeps every item """
+        cache = BasicCache()
+        for key in range(10):
+            cache.put(key, key)
+        self.assertEqual(len(cache.cache_data), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
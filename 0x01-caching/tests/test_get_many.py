@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+""" Batch get tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+POLICIES = [
+    __import__('1-fifo_cache').FIFOCache,
+    __import__('2-lifo_cache').LIFOCache,
+    __import__('3-lru_cache').LRUCache,
+    __import__('4-mru_cache').MRUCache,
+    __import__('100-lfu_cache').LFUCache,
+]
+
+
+class Opaque():
+    """ Value that cannot be compared, like a numpy array """
+
+    def __eq__(self, other):
+        raise ValueError("ambiguous comparison")
+
+    __hash__ = object.__hash__
+
+
+class TestGetMany(unittest.TestCase):
+    """ get_many never compares the cached values """
+
+    def test_values_are_not_compared(self):
+        """ Values whose __eq__ raises are returned like get does """
+        for policy in POLICIES:
+            with self.subTest(policy=policy.__name__):
+                cache = policy(max_items=4)
+                value = Opaque()
+                cache.put('a', value)
+                found = cache.get_many(['a', 'b'])
+                self.assertIs(found[0], value)
+                self.assertIsNone(found[1])
+                stats = cache.stats()
+                self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
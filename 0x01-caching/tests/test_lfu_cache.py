@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+""" LFU cache eviction tests
+"""
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+LFUCache = __import__('100-lfu_cache').LFUCache
+
+
+class ReferenceLFU():
+    """ Naive LFU picking the victim by a full scan """
+
+    def __init__(self, max_bytes):
+        """ Initialize an empty cache limited in bytes """
+        self.max_bytes = max_bytes
+        self.entries = {}
+        self.tick = 0
+
+    def put(self, key, item):
+        """ Add an item, returning the evicted keys """
+        self.tick += 1
+        freq = 0
+        if key in self.entries:
+            freq = self.entries.pop(key)[0]
+        if len(item) > self.max_bytes:
+            return []
+        evicted = []
+        while self.entries and sum(len(entry[2]) for entry in
+                                   self.entries.values()) + len(item) > \
+                self.max_bytes:
+            victim = min(self.entries, key=lambda name: self.entries[name][:2])
+            del self.entries[victim]
+            evicted.append(victim)
+        self.entries[key] = (freq + 1, self.tick, item)
+        return evicted
+
+    def get(self, key):
+        """ Get an item, counting the access """
+        self.tick += 1
+        if key not in self.entries:
+            return None
+        freq, _, item = self.entries[key]
+        self.entries[key] = (freq + 1, self.tick, item)
+        return item
+
+
+class TestLFUCache(unittest.TestCase):
+    """ Eviction order of LFUCache """
+
+    def test_oversized_update_keeps_lowest_frequency(self):
+        """ Dropping the only key of the lowest bucket with an oversized
+        update must not make a touch raise the lowest frequency """
+        cache = LFUCache(max_bytes=100, sizer=lambda key, item: len(item))
+        evicted = []
+        cache.add_listener(lambda key, item: evicted.append(key))
+        cache.put('a', 'x')
+        cache.put('b', 'x' * 5)
+        for _ in range(2):
+            cache.get('b')
+        cache.put('c', 'x' * 5)
+        for _ in range(3):
+            cache.get('c')
+        cache.put('a', 'x' * 200)
+        cache.get('c')
+        cache.put('d', 'x' * 95)
+        self.assertEqual(evicted, ['b'])
+
+    def test_byte_limited_fuzz(self):
+        """ Victims match a naive LFU under random byte-limited traffic """
+        for seed in range(300):
+            rand = random.Random(seed)
+            cache = LFUCache(max_bytes=100,
+                             sizer=lambda key, item: len(item))
+            reference = ReferenceLFU(100)
+            evicted = []
+            cache.add_listener(lambda key, item: evicted.append(key))
+            for _ in range(200):
+                key = rand.choice('abcdefgh')
+                if rand.random() < 0.5:
+                    self.assertEqual(cache.get(key), reference.get(key))
+                    continue
+                item = 'x' * rand.choice((1, 10, 30, 60, 150))
+                del evicted[:]
+                expected = reference.put(key, item)
+                cache.put(key, item)
+                self.assertEqual(evicted, expected, seed)
+            self.assertEqual(set(cache.cache_data), set(reference.entries))
+
+
+if __name__ == "__main__":
+    unittest.main()
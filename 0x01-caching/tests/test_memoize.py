@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+""" Memoization tests
+"""
+import gc
+import os
+import sys
+import unittest
+import weakref
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+cached = __import__('memoize').cached
+
+
+class Counter():
+    """ Instance whose method results are memoized """
+
+    def __init__(self, offset):
+        """ Count the calls """
+        self.offset = offset
+        self.calls = 0
+
+    @cached(capacity=2)
+    def add(self, value):
+        """ Return value plus offset """
+        self.calls += 1
+        return value + self.offset
+
+
+class TestMemoize(unittest.TestCase):
+    """ Functions and methods keep their results """
+
+    def test_function_results_are_cached(self):
+        """ A function is called once per key, None included """
+        calls = []
+
+        @cached(capacity=4)
+        def lookup(key):
+            """ Return nothing """
+            calls.append(key)
+            return None
+
+        self.assertIsNone(lookup(1))
+        self.assertIsNone(lookup(1))
+        self.assertEqual(calls, [1])
+        lookup.cache_clear()
+        lookup(1)
+        self.assertEqual(calls, [1, 1])
+
+    def test_instances_have_their_own_cache(self):
+        """ Instances neither share nor evict each other's results """
+        first, second = Counter(10), Counter(20)
+        self.assertEqual(first.add(1), 11)
+        self.assertEqual(second.add(1), 21)
+        second.add(2)
+        second.add(3)
+        self.assertEqual(first.add(1), 11)
+        self.assertEqual(first.calls, 1)
+        self.assertEqual(first.add.stats()["hits"], 1)
+
+    def test_dropped_instance_is_collected(self):
+        """ The caches do not keep their instance alive """
+        counter = Counter(0)
+        counter.add(1)
+        reference = weakref.ref(counter)
+        del counter
+        gc.collect()
+        self.assertIsNone(reference())
+        self.assertEqual(len(Counter.add.instances), 0)
+
+    def test_cache_clear_reaches_instances(self):
+        """ Clearing the decorated method clears every instance """
+        counter = Counter(0)
+        counter.add(1)
+        Counter.add.cache_clear()
+        counter.add(1)
+        self.assertEqual(counter.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
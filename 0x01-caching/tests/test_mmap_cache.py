@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+""" Tiered cache tests
+"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+mmap_cache = __import__('mmap_cache')
+
+
+class TestTieredCache(unittest.TestCase):
+    """ Time-to-live holds in the file tier too """
+
+    def setUp(self):
+        """ Create a tiered cache of two entries in memory """
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+        self.cache = mmap_cache.TieredCache(self.path, slots=64,
+                                            slot_size=256, max_items=2)
+
+    def tearDown(self):
+        """ Close and remove the file """
+        self.cache.disk.close()
+        os.remove(self.path)
+
+    def test_evicted_entry_expires(self):
+        """ An entry spilled by an eviction keeps its deadline """
+        self.cache.put('a', 'v', ttl=0.2)
+        self.cache.put('b', 'w')
+        self.cache.put('c', 'x')
+        self.assertNotIn('a', self.cache.memory.cache_data)
+        self.assertEqual(self.cache.disk.get('a'), 'v')
+        time.sleep(0.3)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertIsNone(self.cache.disk.get('a'))
+
+    def test_flushed_entry_expires(self):
+        """ An entry written by flush keeps its deadline """
+        self.cache.put('a', 'v', ttl=0.2)
+        self.cache.flush()
+        time.sleep(0.3)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertIsNone(self.cache.disk.get('a'))
+
+    def test_expired_entry_hides_older_copy(self):
+        """ An entry expiring in memory does not bring back the file copy """
+        self.cache.put('a', 'old')
+        self.cache.flush()
+        self.cache.put('a', 'new', ttl=0.2)
+        time.sleep(0.3)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertIsNone(self.cache.disk.get('a'))
+
+    def test_promoted_entry_keeps_ttl(self):
+        """ An entry read back from the file expires when it would have """
+        self.cache.put('a', 'v', ttl=0.3)
+        self.cache.put('b', 'w')
+        self.cache.put('c', 'x')
+        self.assertEqual(self.cache.get('a'), 'v')
+        self.assertIn('a', self.cache.memory.expires)
+        time.sleep(0.4)
+        self.assertIsNone(self.cache.get('a'))
+
+    def test_zero_copy_without_promotion(self):
+        """ Bytes read from the file are a view of the map """
+        self.cache.put('a', b'payload')
+        self.cache.close()
+        self.cache = mmap_cache.TieredCache(self.path, promote=False,
+                                            max_items=2)
+        item = self.cache.get('a')
+        self.assertIsInstance(item, memoryview)
+        self.assertEqual(bytes(item), b'payload')
+        self.assertNotIn('a', self.cache.memory.cache_data)
+        item.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+""" Background reaper tests
+"""
+import os
+import sys
+import time
+import unittest
+from threading import Lock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+LRUCache = __import__('3-lru_cache').LRUCache
+LFUCache = __import__('100-lfu_cache').LFUCache
+
+
+class TestReaper(unittest.TestCase):
+    """ start_reaper shares the lock of the callers of the cache """
+
+    def test_lock_is_required(self):
+        """ A reaper without the lock of the cache would race its users """
+        cache = LRUCache(ttl=1)
+        with self.assertRaises(ValueError):
+            cache.start_reaper()
+        self.assertIsNone(cache.reaper)
+
+    def test_reaper_under_load(self):
+        """ The reaper keeps expiring entries while the cache is busy """
+        for policy in (LRUCache, LFUCache):
+            cache = policy(max_items=50, ttl=0.01)
+            lock = Lock()
+            cache.start_reaper(0.001, 50, lock)
+            deadline = time.monotonic() + 0.3
+            step = 0
+            while time.monotonic() < deadline:
+                with lock:
+                    cache.put(step % 80, step)
+                    cache.get((step * 7) % 80)
+                step += 1
+            thread, _ = cache.reaper
+            self.assertTrue(thread.is_alive())
+            time.sleep(0.05)
+            with lock:
+                self.assertEqual(cache.cache_data, {})
+            cache.stop_reaper()
+
+    def test_stale_expiries_are_pruned(self):
+        """ Puts pop the stale expiries of evicted keys as they reach the
+        top of the heap, without rebuilding it
+        """
+        cache = LRUCache(max_items=100, ttl=60)
+        for step in range(10000):
+            cache.put(step % 500, step)
+        self.assertEqual(len(cache.expires), 100)
+        self.assertLessEqual(len(cache.expiry_heap), 2 * 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
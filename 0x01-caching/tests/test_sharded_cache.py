@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+""" Sharded cache tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+ShardedCache = __import__('sharded_cache').ShardedCache
+
+
+class TestShardedCache(unittest.TestCase):
+    """ The capacity is split between the shards """
+
+    def test_capacity_is_required(self):
+        """ Shards would each fall back to MAX_ITEMS without a limit """
+        with self.assertRaises(ValueError):
+            ShardedCache(shards=16)
+
+    def test_capacity_is_split(self):
+        """ The shards hold about max_items together """
+        cache = ShardedCache(shards=4, max_items=100)
+        self.assertEqual([shard.max_items for shard in cache.shards],
+                         [25] * 4)
+        cache = ShardedCache(shards=4, max_bytes=1000)
+        self.assertEqual([shard.max_bytes for shard in cache.shards],
+                         [250] * 4)
+        self.assertEqual([shard.max_items for shard in cache.shards],
+                         [None] * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+""" Shared memory cache tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+SharedMemoryCache = __import__('shared_memory_cache').SharedMemoryCache
+
+
+class TestSharedMemoryCache(unittest.TestCase):
+    """ Updates behave like those of the BaseCaching policies """
+
+    def setUp(self):
+        """ Create a small cache """
+        self.cache = SharedMemoryCache(capacity=4, entry_size=128)
+
+    def tearDown(self):
+        """ Remove the segment """
+        self.cache.close()
+
+    def test_oversized_update_drops_previous_item(self):
+        """ An item too large for an entry does not leave the old one """
+        self.cache.put('k', 'small')
+        self.cache.put('k', 'x' * 500)
+        self.assertIsNone(self.cache.get('k'))
+        stats = self.cache.stats()
+        self.assertEqual(stats["size"], 0)
+        self.assertEqual(stats["updates"], 1)
+        self.cache.put('k', 'again')
+        self.assertEqual(self.cache.get('k'), 'again')
+
+    def test_oversized_insert_is_ignored(self):
+        """ An item too large for an entry is not cached """
+        self.cache.put('k', 'x' * 500)
+        self.assertIsNone(self.cache.get('k'))
+        self.assertEqual(self.cache.stats()["inserts"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
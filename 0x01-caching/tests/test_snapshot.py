@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+""" Cache snapshot round-trip tests
+"""
+import io
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+snapshot = __import__('snapshot')
+LFUCache = __import__('100-lfu_cache').LFUCache
+
+POLICIES = [
+    ('1-fifo_cache', 'FIFOCache'),
+    ('2-lifo_cache', 'LIFOCache'),
+    ('3-lru_cache', 'LRUCache'),
+    ('4-mru_cache', 'MRUCache'),
+    ('100-lfu_cache', 'LFUCache'),
+    ('101-arc_cache', 'ARCCache'),
+    ('102-compact_lru_cache', 'CompactLRUCache'),
+    ('103-clock_cache', 'ClockCache'),
+]
+
+
+def round_trip(cache, codec='pickle'):
+    """ Dump a cache and load it back """
+    file = io.BytesIO()
+    snapshot.dump(cache, file, codec, chunk_size=7)
+    file.seek(0)
+    return snapshot.load(file)
+
+
+class TestSnapshot(unittest.TestCase):
+    """ Restored caches evict like the original ones """
+
+    def test_lfu_restores_lowest_frequency(self):
+        """ The key of the lowest frequency is evicted after a restore """
+        cache = LFUCache(max_items=3)
+        for key, accesses in (('a', 1), ('b', 4), ('c', 2)):
+            cache.put(key, key)
+            for _ in range(accesses):
+                cache.get(key)
+        restored = round_trip(cache)
+        restored.put('z', 'z')
+        self.assertEqual(sorted(restored.cache_data), ['b', 'c', 'z'])
+
+    def test_round_trip_fuzz(self):
+        """ Original and restored caches evict the same keys afterwards """
+        for module, name in POLICIES:
+            policy = getattr(__import__(module), name)
+            for seed in range(30):
+                rand = random.Random(seed)
+                cache = policy(max_items=rand.choice((3, 8, 20)))
+                for step in range(rand.randrange(300)):
+                    key = rand.randrange(30)
+                    if rand.random() < 0.5:
+                        cache.put(key, step)
+                    else:
+                        cache.get(key)
+                codec = rand.choice(('pickle', 'marshal'))
+                restored = round_trip(cache, codec)
+                self.assertIs(type(restored), policy)
+                self.assertEqual(restored.cache_data, cache.cache_data)
+                evicted, replayed = [], []
+                cache.add_listener(lambda key, item: evicted.append(key))
+                restored.add_listener(
+                    lambda key, item: replayed.append(key))
+                for step in range(300):
+                    key = rand.randrange(30)
+                    if rand.random() < 0.5:
+                        cache.put(key, step)
+                        restored.put(key, step)
+                    else:
+                        self.assertEqual(cache.get(key), restored.get(key))
+                self.assertEqual(evicted, replayed, (name, seed))
+                self.assertEqual(restored.cache_data, cache.cache_data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+""" Trace replay module
+
+Replays a key access trace against cache policies at several capacities
+and reports, for each run, the hit ratio, the throughput, the p50/p99
+latency of one operation and the peak memory of the cache. Every miss is
+followed by a put of the key, like a read-through cache.
+
+Traces come from a file with one key per line, such as a recorded
+production log, or from one of the generators: zipf, uniform or loop.
+
+Usage examples:
+    ./trace_replay.py --trace zipf --alpha 1.1 --capacities 100,1000
+    ./trace_replay.py --trace access.log --policies LRUCache,ARCCache \\
+        --json results.json
+"""
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+POLICIES = {
+    'BasicCache': '0-basic_cache',
+    'FIFOCache': '1-fifo_cache',
+    'LIFOCache': '2-lifo_cache',
+    'LRUCache': '3-lru_cache',
+    'MRUCache': '4-mru_cache',
+    'LFUCache': '100-lfu_cache',
+    'ARCCache': '101-arc_cache',
+    'ClockCache': '103-clock_cache',
+}
+
+
+def load_policy(name):
+    """ Return a cache class from its name
+    Args:
+        name: a class name of POLICIES, or module:Class for any other
+            BaseCaching subclass
+    """
+    if ':' in name:
+        module, name = name.split(':', 1)
+    elif name in POLICIES:
+        module = POLICIES[name]
+    else:
+        raise ValueError("unknown policy {}".format(name))
+    return getattr(__import__(module), name)
+
+
+def zipf_trace(length, keys, alpha=1.0, seed=0):
+    """ Yield keys drawn from a Zipf distribution
+    Args:
+        length: the number of accesses
+        keys: the number of distinct keys
+        alpha: the skew, higher values concentrate on fewer keys
+        seed: the seed of the random generator
+    """
+    rng = random.Random(seed)
+    weights = list(itertools.accumulate(
+        1 / (rank ** alpha) for rank in range(1, keys + 1)))
+    total = weights[-1]
+    for _ in range(length):
+        yield _bisect(weights, rng.random() * total)
+
+
+def _bisect(weights, value):
+    """ Return the index of the first cumulative weight above value """
+    low, high = 0, len(weights)
+    while low < high:
+        middle = (low + high) // 2
+        if weights[middle] <= value:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def uniform_trace(length, keys, seed=0):
+    """ Yield keys drawn uniformly
+    Args:
+        length: the number of accesses
+        keys: the number of distinct keys
+        seed: the seed of the random generator
+    """
+    rng = random.Random(seed)
+    for _ in range(length):
+        yield rng.randrange(keys)
+
+
+def loop_trace(length, keys):
+    """ Yield keys of a sequential scan repeated in a loop
+    Args:
+        length: the number of accesses
+        keys: the number of keys of the scan
+    """
+    for index in range(length):
+        yield index % keys
+
+
+def file_trace(path):
+    """ Yield the keys of a trace file, one key per line
+    Args:
+        path: the path of the file
+    """
+    with open(path) as f:
+        for line in f:
+            key = line.strip()
+            if key:
+                yield key
+
+
+def make_trace(name, length, keys, alpha=1.0, seed=0):
+    """ Return the list of keys of a generated or recorded trace
+    Args:
+        name: zipf, uniform, loop, or the path of a trace file
+        length: the number of accesses of generated traces
+        keys: the number of distinct keys of generated traces
+        alpha: the skew of the zipf trace
+        seed: the seed of the random traces
+    """
+    if name == 'zipf':
+        return list(zipf_trace(length, keys, alpha, seed))
+    if name == 'uniform':
+        return list(uniform_trace(length, keys, seed))
+    if name == 'loop':
+        return list(loop_trace(length, keys))
+    return list(file_trace(name))
+
+
+def _percentile(ordered, fraction):
+    """ Return a percentile of sorted values """
+    if not ordered:
+        return 0
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def replay(cache_class, trace, capacity, memory=True):
+    """ Replay a trace against a new cache
+    Args:
+        cache_class: the BaseCaching subclass to measure
+        trace: the list of keys
+        capacity: the maximum number of items of the cache
+        memory: whether to measure the peak memory, which needs a second
+            replay under tracemalloc
+    Returns:
+        A dictionary of the measures of the run
+    """
+    cache = cache_class(max_items=capacity)
+    clock = time.perf_counter_ns
+    latencies = []
+    record = latencies.append
+    hits = 0
+    start = clock()
+    for key in trace:
+        before = clock()
+        if cache.get(key) is None:
+            cache.put(key, key)
+        else:
+            hits += 1
+        record(clock() - before)
+    elapsed = (clock() - start) / 1e9
+    latencies.sort()
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        cache = cache_class(max_items=capacity)
+        for key in trace:
+            if cache.get(key) is None:
+                cache.put(key, key)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "policy": cache_class.__name__,
+        "capacity": capacity,
+        "accesses": len(trace),
+        "hit_ratio": hits / len(trace) if trace else 0.0,
+        "ops_per_sec": len(trace) / elapsed if elapsed else 0.0,
+        "p50_ns": _percentile(latencies, 0.50),
+        "p99_ns": _percentile(latencies, 0.99),
+        "peak_bytes": peak,
+    }
+
+
+def format_table(results):
+    """ Return the results as a text table """
+    header = "{:>12} {:>10} {:>9} {:>12} {:>8} {:>8} {:>12}".format(
+        "policy", "capacity", "hit ratio", "ops/s", "p50 ns", "p99 ns",
+        "peak bytes")
+    lines = [header]
+    for result in results:
+        peak = result["peak_bytes"]
+        lines.append("{:>12} {:>10} {:>9.4f} {:>12.0f} {:>8} {:>8} {:>12}"
+                     .format(result["policy"], result["capacity"],
+                             result["hit_ratio"], result["ops_per_sec"],
+                             result["p50_ns"], result["p99_ns"],
+                             "-" if peak is None else peak))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """ Parse the command line and print the results """
+    parser = argparse.ArgumentParser(
+        description="Replay a key trace against cache policies")
+    parser.add_argument("--trace", default="zipf",
+                        help="zipf, uniform, loop or the path of a trace "
+                             "file with one key per line")
+    parser.add_argument("--length", type=int, default=100000,
+                        help="number of accesses of generated traces")
+    parser.add_argument("--keys", type=int, default=10000,
+                        help="number of distinct keys of generated traces")
+    parser.add_argument("--alpha", type=float, default=1.0,
+                        help="skew of the zipf trace")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policies", default=",".join(
+        name for name in POLICIES if name != 'BasicCache'),
+        help="comma separated class names, or module:Class")
+    parser.add_argument("--capacities", default="100,1000,10000",
+                        help="comma separated item limits")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc replay")
+    parser.add_argument("--json", metavar="PATH",
+                        help="also write the results as JSON, - for stdout")
+    args = parser.parse_args(argv)
+
+    trace = make_trace(args.trace, args.length, args.keys, args.alpha,
+                       args.seed)
+    results = []
+    for name in args.policies.split(","):
+        cache_class = load_policy(name.strip())
+        for capacity in args.capacities.split(","):
+            results.append(replay(cache_class, trace, int(capacity),
+                                  not args.no_memory))
+
+    print(format_table(results))
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,12 @@ from flask import Flask, render_template, request, g
 import pytz
 from pytz.exceptions import UnknownTimeZoneError
 from datetime import datetime
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             os.pardir, "0x01-caching"))
+cached = __import__('memoize').cached
 
 class Config:
     """Represents a Flask Babel configuration."""
@@ -32,7 +38,17 @@ def get_user():
         return users.get(user_id)
     return None
 
+def locale_key():
+    """Return the request inputs the locale selector depends on."""
+    return (request.args.get('locale'), request.args.get('login_as'),
+            request.headers.get('Accept-Language'))
+
+def timezone_key():
+    """Return the request inputs the timezone selector depends on."""
+    return request.args.get('timezone'), request.args.get('login_as')
+
 @babel.localeselector
+@cached(capacity=1024, key=locale_key)
 def get_locale():
     """Determine the best match for supported languages."""
     locale = request.args.get('locale')
@@ -46,6 +62,7 @@ def get_locale():
     return request.accept_languages.best_match(Config.LANGUAGES)
 
 @babel.timezoneselector
+@cached(capacity=1024, key=timezone_key)
 def get_timezone():
     """Determine the best match for supported timezones."""
     timezone = request.args.get('timezone')